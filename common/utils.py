@@ -1,15 +1,38 @@
+from itertools import islice
+from typing import Iterable
+
 from django.core.mail import EmailMessage
+from django.core.mail import get_connection
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from users.common.outbox import enqueue_email
 from users.models import CustomUser
 from users.tokens import account_activation_token
 
 
 def send_email(mail_subject: str, message: str, addressee: str) -> None:
-    email = EmailMessage(mail_subject, message, to=[addressee])
-    email.send()
+    """
+    Enqueues email in the outbox, from which it is sent by `process_outgoing_emails` command.
+    """
+    enqueue_email(EmailMessage(mail_subject, message, to=[addressee]))
+
+
+def send_emails_in_batches(messages: Iterable[EmailMessage], batch_size: int) -> int:
+    """
+    Sends messages through single mail backend connection, which is reused by all batches.
+    Returns number of sent messages.
+    """
+    messages_iterator = iter(messages)
+    sent_messages_number = 0
+    with get_connection() as connection:
+        while True:
+            batch = list(islice(messages_iterator, batch_size))
+            if not batch:
+                break
+            sent_messages_number += connection.send_messages(batch) or 0
+    return sent_messages_number
 
 
 def render_confirmation_email(user: CustomUser, domain: str) -> str:
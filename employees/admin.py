@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from employees.models import ExportJob
 from employees.models import Report
 from employees.models import TaskActivityType
 
@@ -11,3 +12,11 @@ class TaskActivities(admin.ModelAdmin):
 
 
 admin.site.register(TaskActivityType, TaskActivities)
+
+
+class ExportJobs(admin.ModelAdmin):
+    list_display = ("pk", "kind", "file_format", "status", "requested_by", "created_at", "finished_at", "expires_at")
+    list_filter = ("status", "kind")
+
+
+admin.site.register(ExportJob, ExportJobs)
@@ -0,0 +1,93 @@
+import datetime
+import functools
+import hashlib
+import os
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+from django.contrib import messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.template import engines
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
+
+from employees.common.task_activities_cache import get_task_activities_version
+
+
+@functools.lru_cache(maxsize=None)
+def get_templates_version() -> float:
+    """
+    Returns modification time of the most recently changed template, so pages rendered by previously deployed
+    templates are not reused. It is computed once per process.
+    """
+    return max(
+        (
+            os.path.getmtime(os.path.join(directory, file_name))
+            for engine in engines.all()
+            for template_directory in engine.template_dirs
+            for (directory, _, file_names) in os.walk(template_directory)
+            for file_name in file_names
+        ),
+        default=0.0,
+    )
+
+
+def get_etag(parts: Iterable[Any]) -> str:
+    """
+    Returns ETag computed from all given parts. Last-Modified is not used, as no single timestamp reflects
+    deleted reports or other parts, e.g. current date.
+    """
+    return hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def get_page_etag(request: HttpRequest, reports: QuerySet, *parts: Any) -> Optional[str]:
+    """
+    Returns ETag of month page displaying given reports to the requesting user or None if the page should
+    always be rendered. Besides data, the page depends on the user, current date, CSRF token embedded in forms
+    and on templates themselves.
+    """
+    if len(messages.get_messages(request)) > 0:
+        # Flash messages are displayed only once, so the page has to be rendered.
+        return None
+    user = request.user
+    return get_etag(
+        (
+            request.get_full_path(),
+            user.pk,
+            user.user_type,
+            user.updated_at,
+            datetime.date.today(),
+            request.META.get("CSRF_COOKIE"),
+            translation.get_language(),
+            get_templates_version(),
+            get_task_activities_version(),
+            *reports.get_version_values().values(),
+            *parts,
+        )
+    )
+
+
+def get_conditional_or_rendered_response(
+    request: HttpRequest, etag: Optional[str], render: Callable[[], HttpResponse]
+) -> HttpResponse:
+    """
+    Returns 304 Not Modified response if given ETag matches the one sent by the client or otherwise renders
+    response and sets ETag on it. Clients are asked to revalidate the response on every use.
+    """
+    if etag is None:
+        response = render()
+    else:
+        etag = quote_etag(etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
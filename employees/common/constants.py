@@ -22,6 +22,28 @@ class TaskActivityTypeConstans(Enum):
     TASK_ACTIVITIES_MAX_LENGTH = 30
 
 
+class TaskActivitiesCacheConstants(Enum):
+    CACHE_ALIAS = "task_activities"
+    VERSION_CACHE_KEY = "task-activities-version"
+
+
+class DailyWorkHoursConstants(Enum):
+    REBUILD_BATCH_SIZE = 2000
+
+
+class ExportJobConstants(Enum):
+    CHOICE_MAX_LENGTH = 32
+    DEDUPLICATION_KEY_MAX_LENGTH = 255
+    UPLOAD_DIRECTORY = "exports/"
+    RESULT_LIFETIME = timedelta(hours=24)
+    # Jobs running longer are assumed to be abandoned by a worker which has been stopped in the meantime.
+    RUNNING_TIMEOUT = timedelta(hours=1)
+    WORKER_POLL_INTERVAL_SECONDS = 2
+    CACHE_ALIAS = "exports"
+    CACHE_KEY_PREFIX = "export"
+    CACHE_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
 class ColumnSettings(NamedTuple):
     position: int
     width: int
@@ -38,6 +60,7 @@ class ExcelGeneratorSettingsConstants(Enum):
     FIRST_ROW_FOR_DATA = 3
     DEFAULT_ROW_HEIGHT = 15
     MAX_DESCRIPTION_WIDTH = 100
+    STREAMING_CHUNK_SIZE = 2000
 
     DATE_HEADER_STR = "Date"
     PROJECT_HEADER_STR = "Project"
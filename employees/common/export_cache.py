@@ -0,0 +1,61 @@
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+from employees.common.constants import ExportJobConstants
+from employees.common.export_jobs import get_deduplication_key
+from employees.models import ExportJob
+
+
+def get_export_cache() -> BaseCache:
+    return caches[ExportJobConstants.CACHE_ALIAS.value]
+
+
+def get_export_cache_key(job: ExportJob) -> str:
+    """
+    Returns key of the export described by given job. Key contains version stamp of exported reports,
+    so any change of them makes previously cached export unreachable.
+    """
+    if not job.deduplication_key:
+        job.deduplication_key = get_deduplication_key(job)
+    return f"{ExportJobConstants.CACHE_KEY_PREFIX.value}:{job.deduplication_key}"
+
+
+def get_cached_export(job: ExportJob) -> Optional[bytes]:
+    return get_export_cache().get(get_export_cache_key(job))
+
+
+def cache_export_file(job: ExportJob, export_file: IO[bytes]) -> Optional[bytes]:
+    """
+    Caches content of given export file if it is not too big and returns it. Returns None for files which are
+    too big to be cached, leaving file position at its beginning.
+    """
+    if export_file.seek(0, 2) > ExportJobConstants.CACHE_MAX_FILE_SIZE.value:
+        export_file.seek(0)
+        return None
+    export_file.seek(0)
+    content = export_file.read()
+    get_export_cache().set(get_export_cache_key(job), content)
+    return content
+
+
+def cache_streamed_export(job: ExportJob, lines: Iterable[str]) -> Iterator[bytes]:
+    """
+    Yields encoded lines of streamed export and caches whole content once streaming is finished,
+    unless it turns out to be too big to be cached.
+    """
+    cache_key = get_export_cache_key(job)
+    content = bytearray()  # type: Optional[bytearray]
+    for line in lines:
+        chunk = line.encode()
+        if content is not None:
+            content += chunk
+            if len(content) > ExportJobConstants.CACHE_MAX_FILE_SIZE.value:
+                content = None
+        yield chunk
+    if content is not None:
+        get_export_cache().set(cache_key, bytes(content))
@@ -0,0 +1,221 @@
+import logging
+import time
+from datetime import datetime
+from tempfile import TemporaryFile
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from django.core.files import File
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from employees.common.constants import ExportJobConstants
+from employees.common.exports import generate_csv_rows_for_project
+from employees.common.exports import generate_csv_rows_for_single_user
+from employees.common.exports import generate_xlsx_for_single_user
+from employees.common.exports import stream_csv_rows
+from employees.common.exports import stream_xlsx_for_project
+from employees.common.task_activities_cache import get_task_activities_version
+from employees.models import ExportJob
+from sheetstorm.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Sources of generated exports, used as label of export metrics.
+VIEW_EXPORT_SOURCE = "view"
+JOB_EXPORT_SOURCE = "job"
+
+STALE_EXPORT_JOB_ERROR = "Export job has not been finished in time, its worker has probably been stopped"
+
+EXPORT_DURATION = registry.histogram(
+    "sheetstorm_export_duration_seconds",
+    "Time of generating export files",
+    ["format", "source"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+EXPORT_SIZE = registry.histogram(
+    "sheetstorm_export_size_bytes",
+    "Size of generated export files",
+    ["format", "source"],
+    buckets=(16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024),
+)
+
+
+def count_pending_export_jobs() -> int:
+    return ExportJob.objects.filter(status=ExportJob.Status.PENDING.name).count()
+
+
+registry.gauge(
+    "sheetstorm_export_jobs_pending", "Number of export jobs waiting for a worker", count_pending_export_jobs
+)
+
+
+def get_reports_version(job: ExportJob) -> str:
+    """
+    Returns stamp which changes whenever any report exported by given job, or its project or author,
+    is created, updated or deleted.
+    """
+    return "/".join(
+        value.isoformat() if isinstance(value, datetime) else str(value if value is not None else "")
+        for value in job.get_reports().get_version_values().values()
+    )
+
+
+def get_deduplication_key(job: ExportJob) -> str:
+    return ":".join(
+        str(value)
+        for value in (
+            job.kind,
+            job.file_format,
+            job.project_id,
+            job.author_id,
+            job.year,
+            job.month,
+            get_reports_version(job),
+            # Names of task activities are exported with reports.
+            get_task_activities_version(),
+        )
+    )
+
+
+def enqueue_export_job(job: ExportJob) -> ExportJob:
+    """
+    Saves given, not yet saved export job as pending or returns already existing one which exports the same,
+    unchanged reports.
+    """
+    if not job.deduplication_key:
+        job.deduplication_key = get_deduplication_key(job)
+
+    # Otherwise stale running job for the same export would prevent saving the new one.
+    fail_stale_export_jobs(ExportJob.objects.filter(deduplication_key=job.deduplication_key))
+    reusable_job = ExportJob.objects.get_reusable(job.deduplication_key)
+    if reusable_job is not None:
+        return reusable_job
+
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        # The same export has been requested concurrently and is already waiting for a worker.
+        return ExportJob.objects.unfinished().get(deduplication_key=job.deduplication_key)
+    logger.info(f"Export job {job.pk} has been enqueued")
+    return job
+
+
+def claim_next_export_job() -> Optional[ExportJob]:
+    """
+    Marks the oldest pending export job as running and returns it. Jobs locked by other workers are skipped.
+    """
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportJob.Status.PENDING.name)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.Status.RUNNING.name
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def generate_export_csv_rows(job: ExportJob) -> Iterator[list]:
+    if job.kind == ExportJob.Kind.USER_REPORTS.name:
+        return generate_csv_rows_for_single_user(job.author, job.get_reports())
+    return generate_csv_rows_for_project(job.project, job.get_reports())
+
+
+def generate_export_xlsx_file(job: ExportJob) -> IO[bytes]:
+    if job.kind == ExportJob.Kind.USER_REPORTS.name:
+        output = TemporaryFile()
+        generate_xlsx_for_single_user(job.author, job.get_reports()).save(output)
+        output.seek(0)
+        return output
+    return stream_xlsx_for_project(job.project, job.get_reports())
+
+
+def generate_export_job_file(job: ExportJob) -> IO[bytes]:
+    if job.file_format == ExportJob.Format.XLSX.name:
+        return generate_export_xlsx_file(job)
+
+    output = TemporaryFile()
+    for line in stream_csv_rows(generate_export_csv_rows(job)):
+        output.write(line.encode())
+    output.seek(0)
+    return output
+
+
+def get_file_size(file: IO[bytes]) -> int:
+    size = file.seek(0, 2)
+    file.seek(0)
+    return size
+
+
+def record_generated_export(job: ExportJob, source: str, duration: float, size: int) -> None:
+    EXPORT_DURATION.observe(duration, format=job.file_format.lower(), source=source)
+    EXPORT_SIZE.observe(size, format=job.file_format.lower(), source=source)
+
+
+def measure_streamed_export(job: ExportJob, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Yields chunks of export streamed by export view and records its duration and size once streaming is finished.
+    """
+    start = time.perf_counter()
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        yield chunk
+    record_generated_export(job, VIEW_EXPORT_SOURCE, time.perf_counter() - start, size)
+
+
+def run_export_job(job: ExportJob) -> None:
+    start = time.perf_counter()
+    try:
+        with generate_export_job_file(job) as export_file:
+            duration = time.perf_counter() - start
+            size = get_file_size(export_file)
+            job.file.save(f"{job.pk}.{job.file_format.lower()}", File(export_file), save=False)
+    except Exception as exception:  # pylint: disable=broad-except
+        logger.exception(f"Export job {job.pk} has failed")
+        job.status = ExportJob.Status.FAILED.name
+        job.error = str(exception)
+    else:
+        job.status = ExportJob.Status.DONE.name
+        record_generated_export(job, JOB_EXPORT_SOURCE, duration, size)
+        logger.info(f"Export job {job.pk} has been finished")
+    job.finished_at = timezone.now()
+    # Failed jobs expire as well, so they are eventually deleted by `delete_expired_export_jobs`.
+    job.expires_at = job.finished_at + ExportJobConstants.RESULT_LIFETIME.value
+    job.save()
+
+
+def fail_stale_export_jobs(jobs: Optional[QuerySet] = None) -> int:
+    """
+    Marks as failed export jobs which have been running for too long, e.g. because their worker has been killed
+    in the middle of an export, so the same export can be requested again.
+    """
+    now = timezone.now()
+    return (
+        (jobs if jobs is not None else ExportJob.objects.all())
+        .stale()
+        .update(
+            status=ExportJob.Status.FAILED.name,
+            error=STALE_EXPORT_JOB_ERROR,
+            finished_at=now,
+            expires_at=now + ExportJobConstants.RESULT_LIFETIME.value,
+        )
+    )
+
+
+def delete_expired_export_jobs() -> int:
+    expired_jobs = ExportJob.objects.expired()
+    for job in expired_jobs:
+        job.file.delete(save=False)
+    deleted_jobs_number, _ = expired_jobs.delete()
+    return deleted_jobs_number
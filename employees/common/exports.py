@@ -1,83 +1,194 @@
+import csv
 import re
 from datetime import timedelta
+from itertools import chain
+from itertools import groupby
+from operator import itemgetter
+from tempfile import TemporaryFile
+from typing import IO
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 
+from django.db.models import Case
+from django.db.models import IntegerField
+from django.db.models import QuerySet
+from django.db.models import Value
+from django.db.models import When
 from django.utils.datetime_safe import datetime
 from openpyxl import Workbook
 from openpyxl.cell import Cell
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment
 from openpyxl.styles import Border
 from openpyxl.styles import Font
 from openpyxl.utils import get_column_letter
 from openpyxl.workbook import _writer
+from openpyxl.worksheet.cell_range import CellRange
 
 from common.convert import timedelta_to_string
 from employees.common.constants import ColumnSettings
 from employees.common.constants import ExcelGeneratorSettingsConstants as constants
-from employees.models import Report
-from employees.models import ReportQuerySet
 from managers.models import Project
 from users.models import CustomUser
 
+# Styles are created once and shared by all cells. openpyxl stores each distinct style only once in the workbook,
+# so building new style objects for every cell is pure overhead.
+MAIN_CELL_FONT = Font(name=constants.FONT.value, bold=True)
+MAIN_CELL_ALIGNMENT = Alignment(horizontal=constants.CENTER_ALINGMENT.value)
+HEADER_CELL_BORDER = Border(
+    bottom=constants.BORDER_STYLE.value,
+    top=constants.BORDER_STYLE.value,
+    right=constants.BORDER_STYLE.value,
+    left=constants.BORDER_STYLE.value,
+)
+TOTAL_CELL_BORDER = Border(top=constants.BORDER_STYLE.value)
+WRAPPED_TEXT_ALIGNMENT = Alignment(vertical=constants.VERCTICAL_TOP.value, wrap_text=True)
+HOURS_CELL_ALIGNMENT = Alignment(vertical=constants.VERCTICAL_TOP.value, horizontal=constants.CENTER_ALINGMENT.value)
+BETWEEN_COLUMNS_BORDER = Border(left=constants.BORDER_STYLE.value, right=constants.BORDER_STYLE.value)
+DAYS_SEPARATOR_BORDER = Border(
+    left=constants.BORDER_STYLE.value, right=constants.BORDER_STYLE.value, top=constants.BORDER_STYLE.value
+)
+
 
 def set_format_styles_for_main_cells(cell: Cell, is_header: bool) -> None:
-    cell.font = Font(name=constants.FONT.value, bold=True)
-    cell.alignment = Alignment(horizontal=constants.CENTER_ALINGMENT.value)
-    cell.border = (
-        Border(
-            bottom=constants.BORDER_STYLE.value,
-            top=constants.BORDER_STYLE.value,
-            right=constants.BORDER_STYLE.value,
-            left=constants.BORDER_STYLE.value,
-        )
-        if is_header
-        else Border(top=constants.BORDER_STYLE.value)
-    )
+    cell.font = MAIN_CELL_FONT
+    cell.alignment = MAIN_CELL_ALIGNMENT
+    cell.border = HEADER_CELL_BORDER if is_header else TOTAL_CELL_BORDER
 
 
 def set_and_fill_cell(cell: Cell, cell_value: str) -> None:
-    wrapped_alignment = Alignment(vertical=constants.VERCTICAL_TOP.value, wrap_text=True)
-    cell.alignment = wrapped_alignment
+    cell.alignment = WRAPPED_TEXT_ALIGNMENT
     cell.value = cell_value
     set_borders_between_columns(cell)
 
 
 def set_and_fill_hours_cell(cell: Cell, cell_value: str) -> None:
-    if cell_value is not None:
-        cell.value = cell_value
-    else:
-        cell.value = cell_value
-    alignment = Alignment(vertical=constants.VERCTICAL_TOP.value, horizontal=constants.CENTER_ALINGMENT.value)
-    cell.alignment = alignment
+    cell.value = cell_value
+    cell.alignment = HOURS_CELL_ALIGNMENT
     cell.number_format = constants.HOURS_FORMAT.value
     set_borders_between_columns(cell)
 
 
 def set_borders_between_columns(cell: Cell) -> None:
-    cell.border = Border(left=constants.BORDER_STYLE.value, right=constants.BORDER_STYLE.value)
+    cell.border = BETWEEN_COLUMNS_BORDER
 
 
 def separate_days(cell: Cell) -> None:
-    cell.border = Border(
-        left=constants.BORDER_STYLE.value, right=constants.BORDER_STYLE.value, top=constants.BORDER_STYLE.value
-    )
+    cell.border = DAYS_SEPARATOR_BORDER
+
+
+def get_row_height(description: str) -> int:
+    """
+    If the description contains a new line ( "\n" character) or text exceeds 100 characters row height is automatically resized.
+    """
+
+    new_lines_in_description = description.count("\n")
+    splitted_description = description.split("\n")
+    rows_in_xlsx = 0
+
+    for row in splitted_description:
+        rows_in_xlsx += int(len(row) / constants.MAX_DESCRIPTION_WIDTH.value)
+
+    return constants.DEFAULT_ROW_HEIGHT.value * (1 + new_lines_in_description + rows_in_xlsx)
 
 
 def get_employee_name(author: CustomUser) -> str:
-    if author.last_name and author.first_name:
-        return f"{author.first_name} {author.last_name[0]}."
+    return format_employee_name(author.first_name, author.last_name, author.email)
+
+
+def format_employee_name(first_name: str, last_name: str, email: str) -> str:
+    if last_name and first_name:
+        return f"{first_name} {last_name[0]}."
     else:
-        return f"{author.email}"
+        return f"{email}"
+
+
+def get_employee_name_from_report_values(report: dict) -> str:
+    return format_employee_name(report["author__first_name"], report["author__last_name"], report["author__email"])
+
+
+def get_project_reports_for_export(project: Project, reports: Optional[QuerySet] = None) -> QuerySet:
+    """
+    Returns values of given project reports (all reports of the project by default) as a single query
+    ordered by author and date, so reports can be grouped into per-author sheets in one pass.
+    Reports of users who are no longer members of the project are not exported.
+    """
+    if reports is None:
+        reports = project.report_set.all()
+    return (
+        reports.filter(project=project, author__projects=project)
+        .order_by("author_id", "date", "creation_date")
+        .get_export_values()
+    )
+
+
+def order_reports_by_employee_name(reports: QuerySet) -> QuerySet:
+    """
+    Orders reports the same way as sheets are ordered in XLSX exports, i.e. by employee name and then by date.
+    Employee names are computed in Python, so one extra query for distinct authors is made.
+    """
+    authors = (
+        reports.order_by().values_list("author", "author__first_name", "author__last_name", "author__email").distinct()
+    )
+    sorted_authors_ids = [
+        author[0]
+        for author in sorted(authors, key=lambda author: (str.lower(format_employee_name(*author[1:])), author[0]))
+    ]
+    if len(sorted_authors_ids) == 0:
+        return reports
+    return reports.order_by(
+        Case(
+            *[When(author=author_id, then=Value(position)) for position, author_id in enumerate(sorted_authors_ids)],
+            output_field=IntegerField(),
+        ),
+        "date",
+        "creation_date",
+    )
+
+
+def get_single_user_reports_for_export(author: CustomUser, reports: Optional[QuerySet] = None) -> QuerySet:
+    if reports is None:
+        reports = author.get_reports_created()
+    return reports.filter(author=author).order_by("date", "project__name").get_export_values()
+
 
+def generate_xlsx_for_single_user(author: CustomUser, reports: Optional[QuerySet] = None) -> Workbook:
+    return ReportExtractor().generate_xlsx_for_single_user(author, reports)
 
-def generate_xlsx_for_single_user(author: CustomUser) -> Workbook:
-    return ReportExtractor().generate_xlsx_for_single_user(author)
 
+def generate_xlsx_for_project(project: Project, reports: Optional[QuerySet] = None) -> Workbook:
+    return ReportExtractor().generate_xlsx_for_project(project, reports)
 
-def generate_xlsx_for_project(project: Project) -> Workbook:
-    return ReportExtractor().generate_xlsx_for_project(project)
+
+def stream_xlsx_for_project(project: Project, reports: Optional[QuerySet] = None) -> IO[bytes]:
+    return StreamingReportExtractor().generate_xlsx_for_project(project, reports)
+
+
+def generate_csv_rows_for_single_user(author: CustomUser, reports: Optional[QuerySet] = None) -> Iterator[list]:
+    return CSVReportExtractor().generate_csv_rows_for_single_user(author, reports)
+
+
+def generate_csv_rows_for_project(project: Project, reports: Optional[QuerySet] = None) -> Iterator[list]:
+    return CSVReportExtractor().generate_csv_rows_for_project(project, reports)
+
+
+class EchoBuffer:
+    """
+    File-like object which returns written value instead of storing it. Allows `csv.writer` to produce
+    formatted lines one by one, so they can be passed to `StreamingHttpResponse`.
+    """
+
+    def write(self, value: str) -> str:  # pylint: disable=no-self-use
+        return value
+
+
+def stream_csv_rows(rows: Iterable[list]) -> Iterator[str]:
+    writer = csv.writer(EchoBuffer())
+    return (writer.writerow(row) for row in rows)
 
 
 class ReportExtractor:
@@ -93,24 +204,20 @@ class ReportExtractor:
         self._active_worksheet = None  # type: Workbook
         self._headers_settings = {}  # type: Dict
 
-    def generate_xlsx_for_project(self, project: Project) -> Workbook:
-        authors = project.members.all()
+    def generate_xlsx_for_project(self, project: Project, reports: Optional[QuerySet] = None) -> Workbook:
         self._workbook = Workbook()
         self._set_xlsx_settings_for_project_report()
-        for author in authors:
-            employee_name = get_employee_name(author)
-            reports = project.report_set.filter(author=author.pk).order_by("date")
-            if not reports:
-                continue
-
-            self._fill_report_for_single_user(employee_name, reports)
+        for employee_name, author_reports in self._group_reports_by_author(
+            get_project_reports_for_export(project, reports)
+        ):
+            self._fill_report_for_single_user(employee_name, author_reports)
             self._set_printing_settings_for_current_sheet()
 
-        self._workbook._sheets.sort(key=lambda w: str.lower(w.title))
+        self._sort_worksheets()
         return self._workbook
 
-    def generate_xlsx_for_single_user(self, author: CustomUser) -> Workbook:
-        reports = author.get_reports_created().order_by("date", "project__name")  # type: ReportQuerySet
+    def generate_xlsx_for_single_user(self, author: CustomUser, reports: Optional[QuerySet] = None) -> Workbook:
+        reports = get_single_user_reports_for_export(author, reports)
         self._workbook = Workbook()
         self._set_xlsx_settings_for_user_report()
         employee_name = get_employee_name(author)
@@ -119,23 +226,37 @@ class ReportExtractor:
         self._set_printing_settings_for_current_sheet()
         return self._workbook
 
-    def _fill_report_for_single_user(self, employee_name: str, reports: ReportQuerySet) -> None:
+    @staticmethod
+    def _group_reports_by_author(reports: Iterable[dict]) -> Iterator[Tuple[str, Iterator[dict]]]:
+        """
+        Splits reports ordered by author into groups of reports belonging to a single author.
+        Only authors with at least one report are yielded.
+        """
+        for _author, author_reports in groupby(reports, key=itemgetter("author")):
+            first_report = next(author_reports)
+            yield get_employee_name_from_report_values(first_report), chain([first_report], author_reports)
+
+    def _sort_worksheets(self) -> None:
+        self._workbook._sheets.sort(key=lambda w: str.lower(w.title))
+
+    def _fill_report_for_single_user(self, employee_name: str, reports: Iterable[dict]) -> None:
         self._prepare_worksheet(employee_name)
         for report in reports:
             self._fill_single_report(report)
 
         self._summarize_user_reports()
 
-    def _fill_single_report(self, report: Report) -> None:
-        report_date = self._get_report_date(report)
-        report_description = self.delete_illigal_characters(report.description)
-        storage_data = {
-            constants.DATE_HEADER_STR.value: report_date,
-            constants.PROJECT_HEADER_STR.value: report.project.name,
-            constants.TASK_ACTIVITY_HEADER_STR.value: report.task_activities.name,
-            constants.HOURS_HEADER_STR.value: report.work_hours,
-            constants.DESCRIPTION_HEADER_STR.value: report_description,
+    def _get_report_storage_data(self, report: dict) -> dict:
+        return {
+            constants.DATE_HEADER_STR.value: self._get_report_date(report),
+            constants.PROJECT_HEADER_STR.value: report["project__name"],
+            constants.TASK_ACTIVITY_HEADER_STR.value: report["task_activities__name"],
+            constants.HOURS_HEADER_STR.value: report["work_hours"],
+            constants.DESCRIPTION_HEADER_STR.value: self.delete_illigal_characters(report["description"]),
         }
+
+    def _fill_single_report(self, report: dict) -> None:
+        storage_data = self._get_report_storage_data(report)
         self._fill_current_report_data(storage_data)
         self._set_row_height(str(storage_data[constants.DESCRIPTION_HEADER_STR.value]))
         self._current_row += 1
@@ -229,8 +350,8 @@ class ReportExtractor:
         total_hours_cell.number_format = constants.TOTAL_HOURS_FORMAT.value
         set_format_styles_for_main_cells(total_hours_cell, is_header=False)
 
-    def _get_report_date(self, current_report: Report) -> Optional[datetime]:
-        date = current_report.date
+    def _get_report_date(self, current_report: dict) -> Optional[datetime]:
+        date = current_report["date"]
         if self._last_date == date:
             report_date = None
         else:
@@ -239,19 +360,7 @@ class ReportExtractor:
         return report_date
 
     def _set_row_height(self, description: str) -> None:
-        """
-        If the description contains a new line ( "\n" character) or text exceeds 100 characters row height is automatically resized.
-        """
-
-        new_lines_in_description = description.count("\n")
-        splitted_description = description.split("\n")
-        rows_in_xlsx = 0
-
-        for row in splitted_description:
-            rows_in_xlsx += int(len(row) / constants.MAX_DESCRIPTION_WIDTH.value)
-
-        row_height = constants.DEFAULT_ROW_HEIGHT.value * (1 + new_lines_in_description + rows_in_xlsx)
-        self._active_worksheet.row_dimensions[self._current_row].height = row_height
+        self._active_worksheet.row_dimensions[self._current_row].height = get_row_height(description)
 
     def _set_printing_settings_for_current_sheet(self) -> None:
         self._active_worksheet.set_printer_settings(paper_size=9, orientation="landscape")
@@ -262,6 +371,154 @@ class ReportExtractor:
         return re.sub(r"[\000-\010]|[\013-\014]|[\016-\037]", "", description)
 
 
+class StreamingReportExtractor(ReportExtractor):
+    """
+    Write-only variant of `ReportExtractor`. Reports are read through a server-side cursor and every row is handed
+    to openpyxl's write-only worksheet as soon as it is built, so the workbook is never kept in memory as a whole.
+    The finished file is assembled in a temporary file which is meant to be streamed to the client.
+    """
+
+    def generate_xlsx_for_project(self, project: Project, reports: Optional[QuerySet] = None) -> IO[bytes]:
+        self._workbook = Workbook(write_only=True)
+        self._set_xlsx_settings_for_project_report()
+        project_reports = get_project_reports_for_export(project, reports).iterator(
+            chunk_size=constants.STREAMING_CHUNK_SIZE.value
+        )
+        for employee_name, author_reports in self._group_reports_by_author(project_reports):
+            self._fill_report_for_single_user(employee_name, author_reports)
+
+        # Sheets of a write-only workbook are stored in temporary files until the workbook is saved,
+        # so only the order in which they are put into the archive changes here.
+        self._sort_worksheets()
+        output = TemporaryFile()
+        self._workbook.save(output)
+        output.seek(0)
+        return output
+
+    def _prepare_worksheet(self, employee_name: str) -> None:
+        self._reset_per_sheet_settings()
+        self._active_worksheet = self._workbook.create_sheet(title=employee_name)
+        self._set_printing_settings_for_current_sheet()
+        self._fill_headers(employee_name)
+
+    def _fill_headers(self, employee_name: str) -> None:
+        # Merged cells and column widths of a write-only worksheet have to be set before any row is written.
+        self._active_worksheet.merged_cells.add(
+            CellRange(
+                min_row=constants.EMPLOYEE_NAME_ROW.value,
+                max_row=constants.EMPLOYEE_NAME_ROW.value,
+                min_col=constants.EMPLOYEE_NAME_START_COLUMN.value,
+                max_col=constants.EMPLOYEE_NAME_END_COLUMN.value,
+            )
+        )
+        header_cells = []
+        for col_num, column_name in enumerate(self._headers, start=1):
+            self._set_column_width(col_num, column_name)
+            header_cells.append(self._create_main_cell(column_name, is_header=True))
+
+        self._active_worksheet.append([constants.EMPLOYEE_NAME.value.format(employee_name)])
+        self._active_worksheet.append(header_cells)
+
+    def _fill_single_report(self, report: dict) -> None:
+        storage_data = self._get_report_storage_data(report)
+        # Row height has to be known before the row is sent to the writer.
+        self._active_worksheet.row_dimensions[self._current_row].height = get_row_height(
+            storage_data[constants.DESCRIPTION_HEADER_STR.value]
+        )
+        self._active_worksheet.append(self._create_report_row(storage_data))
+        self._current_row += 1
+
+    def _create_report_row(self, storage_data: dict) -> List[WriteOnlyCell]:
+        is_next_day = storage_data[constants.DATE_HEADER_STR.value] is not None
+        row = [None] * len(self._headers)  # type: List
+
+        for column_name, cell_value in storage_data.items():
+            if self._headers_settings.get(column_name) is None:
+                continue
+            cell = WriteOnlyCell(self._active_worksheet, value=cell_value)
+            if column_name == constants.HOURS_HEADER_STR.value:
+                cell.alignment = HOURS_CELL_ALIGNMENT
+                cell.number_format = constants.HOURS_FORMAT.value
+                self._sum_hours = self._sum_hours + cell_value if self._sum_hours is not None else cell_value
+            else:
+                cell.alignment = WRAPPED_TEXT_ALIGNMENT
+            cell.border = DAYS_SEPARATOR_BORDER if is_next_day else BETWEEN_COLUMNS_BORDER
+            row[self._headers_settings[column_name].position - 1] = cell
+
+        return row
+
+    def _summarize_user_reports(self) -> None:
+        total_row = [self._create_main_cell(None, is_header=False) for _ in self._headers]
+        total_row[constants.TOTAL_COLUMN.value - 1].value = constants.TOTAL.value
+
+        total_hours_cell = total_row[self._headers_settings[constants.HOURS_HEADER_STR.value].position - 1]
+        total_hours_cell.value = self._sum_hours
+        total_hours_cell.number_format = constants.TOTAL_HOURS_FORMAT.value
+        self._active_worksheet.append(total_row)
+
+    def _create_main_cell(self, cell_value: Optional[str], is_header: bool) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self._active_worksheet, value=cell_value)
+        set_format_styles_for_main_cells(cell, is_header)
+        return cell
+
+    def _set_printing_settings_for_current_sheet(self) -> None:
+        self._active_worksheet.page_setup.paperSize = 9
+        self._active_worksheet.page_setup.orientation = "landscape"
+        self._active_worksheet.sheet_properties.pageSetUpPr.fitToPage = True
+        self._active_worksheet.page_setup.fitToHeight = False
+
+
+class CSVReportExtractor(ReportExtractor):
+    """
+    Produces CSV export rows directly from report values, without building a workbook. Rows are the same as rows
+    written by `save_work_book_as_csv` for the corresponding workbook, one block of rows per employee.
+    """
+
+    def generate_csv_rows_for_project(self, project: Project, reports: Optional[QuerySet] = None) -> Iterator[list]:
+        self._set_xlsx_settings_for_project_report()
+        project_reports = order_reports_by_employee_name(get_project_reports_for_export(project, reports)).iterator(
+            chunk_size=constants.STREAMING_CHUNK_SIZE.value
+        )
+        for employee_name, author_reports in self._group_reports_by_author(project_reports):
+            yield from self._generate_rows_for_single_user(employee_name, author_reports)
+
+    def generate_csv_rows_for_single_user(
+        self, author: CustomUser, reports: Optional[QuerySet] = None
+    ) -> Iterator[list]:
+        self._set_xlsx_settings_for_user_report()
+        author_reports = get_single_user_reports_for_export(author, reports).iterator(
+            chunk_size=constants.STREAMING_CHUNK_SIZE.value
+        )
+        yield from self._generate_rows_for_single_user(get_employee_name(author), author_reports)
+
+    def _generate_rows_for_single_user(self, employee_name: str, reports: Iterable[dict]) -> Iterator[list]:
+        self._reset_per_sheet_settings()
+        yield [employee_name]
+        yield list(self._headers)
+        for report in reports:
+            yield self._create_report_row(self._get_report_storage_data(report))
+        yield self._create_total_row()
+
+    def _create_report_row(self, storage_data: dict) -> list:
+        row = [None] * len(self._headers)  # type: list
+        for column_name, cell_value in storage_data.items():
+            if self._headers_settings.get(column_name) is None:
+                continue
+            if column_name == constants.HOURS_HEADER_STR.value:
+                self._sum_hours = self._sum_hours + cell_value if self._sum_hours is not None else cell_value
+            row[self._headers_settings[column_name].position - 1] = cell_value
+        return row
+
+    def _create_total_row(self) -> list:
+        row = [None] * len(self._headers)  # type: list
+        row[constants.TOTAL_COLUMN.value - 1] = constants.TOTAL.value
+        if self._sum_hours is not None:
+            row[self._headers_settings[constants.HOURS_HEADER_STR.value].position - 1] = timedelta_to_string(
+                self._sum_hours
+            )
+        return row
+
+
 def save_work_book_as_csv(writer: _writer, work_book: Workbook, hours_column_setting: ColumnSettings) -> None:
     sheet = work_book.active
     is_last_row = False
@@ -0,0 +1,40 @@
+from datetime import date
+from datetime import timedelta
+from typing import Dict
+from typing import Iterable
+from typing import Tuple
+from typing import Union
+
+from employees.models import Report
+
+
+class ReportsMonthSummary:
+    """
+    Work hours summary of reports from a single month, computed in one pass over already fetched reports,
+    so no additional aggregation queries are needed.
+    """
+
+    def __init__(self, reports: Iterable[Report]) -> None:
+        self.daily_hours_sum = {}  # type: Dict[date, timedelta]
+        self.monthly_hours_sum = {}  # type: Dict[int, timedelta]
+        self.project_hours_sum = {}  # type: Dict[str, timedelta]
+
+        for report in reports:
+            self.daily_hours_sum[report.date] = self.daily_hours_sum.get(report.date, timedelta()) + report.work_hours
+            self.monthly_hours_sum[report.author_id] = (
+                self.monthly_hours_sum.get(report.author_id, timedelta()) + report.work_hours
+            )
+            self.project_hours_sum[report.project.name] = (
+                self.project_hours_sum.get(report.project.name, timedelta()) + report.work_hours
+            )
+
+    def get_projects_work_percentage(self) -> Dict[str, Union[Tuple[timedelta, float], int]]:
+        """
+        Returns dict where keys are Project names and values are tuples containing total sum of work hours
+        and percentage amount of work in the project.
+        """
+        all_hours = sum(self.project_hours_sum.values(), timedelta())
+        return {
+            project_name: (project_hours, (project_hours / all_hours) * 100) if all_hours.total_seconds() > 0 else 0
+            for (project_name, project_hours) in sorted(self.project_hours_sum.items())
+        }
@@ -119,3 +119,21 @@ class ReportValidationStrings(NotCallableMixin, Enum):
 class MonthNavigationText(NotCallableMixin, Enum):
     SWITCH_MONTH = _("Go")
     CURRENT_MONTH = _("Current month")
+
+
+class ExportJobKindText:
+    USER_REPORTS = _("User reports")
+    PROJECT_REPORTS = _("Project reports")
+    PROJECT_AUTHOR_REPORTS = _("Project author reports")
+
+
+class ExportJobFormatText:
+    XLSX = _("XLSX")
+    CSV = _("CSV")
+
+
+class ExportJobStatusText:
+    PENDING = _("Pending")
+    RUNNING = _("Running")
+    DONE = _("Done")
+    FAILED = _("Failed")
@@ -0,0 +1,56 @@
+import threading
+import uuid
+from typing import Dict
+from typing import List
+
+from django.core.cache import caches
+
+from employees.common.constants import TaskActivitiesCacheConstants
+
+# Ordered task activities of projects, kept by each process and valid only for the version they were loaded with.
+_project_task_activities = {}  # type: Dict[int, List]
+_project_task_activities_version = None
+_lock = threading.Lock()
+
+
+def get_task_activities_version() -> str:
+    """
+    Returns version shared by all processes, which changes whenever task activities of any project may have changed.
+    """
+    cache = caches[TaskActivitiesCacheConstants.CACHE_ALIAS.value]
+    version = cache.get(TaskActivitiesCacheConstants.VERSION_CACHE_KEY.value)
+    if version is None:
+        # Version has never been set or has been evicted, so nothing cached before can be trusted.
+        version = uuid.uuid4().hex
+        if not cache.add(TaskActivitiesCacheConstants.VERSION_CACHE_KEY.value, version, timeout=None):
+            version = cache.get(TaskActivitiesCacheConstants.VERSION_CACHE_KEY.value, version)
+    return version
+
+
+def invalidate_project_task_activities() -> None:
+    caches[TaskActivitiesCacheConstants.CACHE_ALIAS.value].set(
+        TaskActivitiesCacheConstants.VERSION_CACHE_KEY.value, uuid.uuid4().hex, timeout=None
+    )
+
+
+def get_project_task_activities(project_id: int) -> List:
+    """
+    Returns task activities of given project ordered by name. Returned objects contain only primary key and name.
+    """
+    from employees.models import TaskActivityType  # pylint: disable=import-outside-toplevel
+
+    global _project_task_activities_version  # pylint: disable=global-statement
+
+    version = get_task_activities_version()
+    with _lock:
+        if version != _project_task_activities_version:
+            _project_task_activities.clear()
+            _project_task_activities_version = version
+        if project_id in _project_task_activities:
+            return _project_task_activities[project_id]
+
+    task_activities = list(TaskActivityType.objects.filter(projects=project_id).order_by("name").only("name"))
+    with _lock:
+        if version == _project_task_activities_version:
+            _project_task_activities[project_id] = task_activities
+    return task_activities
@@ -17,6 +17,7 @@ from django.utils.duration import duration_string
 from common.convert import convert_string_work_hours_field_to_hour_and_minutes
 from common.convert import timedelta_to_string
 from employees.common.constants import MonthNavigationConstants
+from employees.common.task_activities_cache import get_project_task_activities
 from employees.models import Report
 from employees.models import TaskActivityType
 from managers.models import Project
@@ -79,14 +80,18 @@ class ReportForm(forms.ModelForm):
         if "project" in self.data:
             with suppress(ValueError, TypeError):
                 project_id = int(self.data.get("project"))
-                self.fields["task_activities"].queryset = TaskActivityType.objects.filter(projects=project_id).order_by(
-                    "name"
+                self._set_task_activities_choices(
+                    project_id, TaskActivityType.objects.filter(projects=project_id).order_by("name")
                 )
         elif self.instance.pk:
-            self.fields["task_activities"].queryset = (
-                self.instance.project.project_activities.order_by("name")
-                | TaskActivityType.objects.filter(pk=self.instance.task_activities.pk)
-            ).distinct()
+            self._set_task_activities_choices(
+                self.instance.project_id,
+                (
+                    TaskActivityType.objects.filter(projects=self.instance.project_id).order_by("name")
+                    | TaskActivityType.objects.filter(pk=self.instance.task_activities_id)
+                ).distinct(),
+                self.instance.task_activities_id,
+            )
 
     def _set_last_choices_in_report_form(self, author: CustomUser) -> None:
         if self.instance.pk is None:
@@ -95,11 +100,13 @@ class ReportForm(forms.ModelForm):
                 author in last_report.project.members.all() or author in last_report.project.managers.all()
             ):
                 self.initial["project"] = last_report.project
-                self.fields["task_activities"].queryset = last_report.project.project_activities.all()
+                self._set_task_activities_choices(last_report.project_id, last_report.project.project_activities.all())
                 self.initial["task_activities"] = last_report.task_activities
             elif self.fields["project"].queryset.exists():
                 self.initial["project"] = self.fields["project"].queryset.first()
-                self.fields["task_activities"].queryset = self.initial["project"].project_activities.all()
+                self._set_task_activities_choices(
+                    self.initial["project"].pk, self.initial["project"].project_activities.all()
+                )
             else:
                 self.fields["task_activities"].queryset = TaskActivityType.objects.none()
         else:
@@ -107,6 +114,27 @@ class ReportForm(forms.ModelForm):
                 self.fields["project"].queryset | Project.objects.filter(pk=self.instance.project.pk).distinct()
             )
 
+    def _set_task_activities_choices(
+        self, project_id: int, queryset: QuerySet, task_activity_id: Optional[int] = None
+    ) -> None:
+        """
+        Sets queryset, which chosen task activity is validated against, and choices rendered from cached task
+        activities of given project, so rendering the form does not query them. Given task activity is added
+        to the choices even if it is not related to the project anymore.
+        """
+        task_activities = get_project_task_activities(project_id)
+        if task_activity_id is not None and task_activity_id not in {activity.pk for activity in task_activities}:
+            task_activities = sorted(
+                task_activities + [TaskActivityType.objects.only("name").get(pk=task_activity_id)],
+                key=lambda activity: activity.name,
+            )
+
+        field = self.fields["task_activities"]
+        field.queryset = queryset
+        field.choices = ([("", field.empty_label)] if field.empty_label is not None else []) + [
+            (activity.pk, activity.name) for activity in task_activities
+        ]
+
 
 class MonthSwitchForm(forms.Form):
 
@@ -0,0 +1,48 @@
+import logging
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from employees.common.constants import ExportJobConstants
+from employees.common.export_jobs import claim_next_export_job
+from employees.common.export_jobs import delete_expired_export_jobs
+from employees.common.export_jobs import fail_stale_export_jobs
+from employees.common.export_jobs import run_export_job
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Generate files for pending background exports and remove expired ones."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process all pending export jobs and exit instead of waiting for new ones",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=ExportJobConstants.WORKER_POLL_INTERVAL_SECONDS.value,
+            help="Number of seconds to wait before checking for new export jobs when the queue is empty",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        logger.info("Export worker has been started")
+        while True:
+            deleted_jobs_number = delete_expired_export_jobs()
+            if deleted_jobs_number > 0:
+                logger.info(f"Deleted {deleted_jobs_number} expired export jobs")
+            stale_jobs_number = fail_stale_export_jobs()
+            if stale_jobs_number > 0:
+                logger.warning(f"Marked {stale_jobs_number} stale export jobs as failed")
+
+            job = claim_next_export_job()
+            if job is not None:
+                run_export_job(job)
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,18 @@
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employees.models import DailyWorkHours
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Recreate daily work hours sums from all reports."
+
+    @transaction.atomic
+    def handle(self, *args: Any, **options: Any) -> None:
+        created_rows_number = DailyWorkHours.objects.rebuild()
+        logger.info(f"Daily work hours have been rebuilt, {created_rows_number} rows created")
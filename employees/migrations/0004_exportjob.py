@@ -0,0 +1,93 @@
+# Generated by Django 3.0.7 on 2026-10-17 07:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("managers", "0003_project_is_notification_enabled"),
+        ("employees", "0003_auto_20190805_1021"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("USER_REPORTS", "User reports"),
+                            ("PROJECT_REPORTS", "Project reports"),
+                            ("PROJECT_AUTHOR_REPORTS", "Project author reports"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("file_format", models.CharField(choices=[("XLSX", "XLSX"), ("CSV", "CSV")], max_length=32)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("RUNNING", "Running"),
+                            ("DONE", "Done"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="PENDING",
+                        max_length=32,
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                ("deduplication_key", models.CharField(max_length=255)),
+                ("file", models.FileField(blank=True, upload_to="exports/")),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to="managers.Project"
+                    ),
+                ),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="requested_export_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="exportjob",
+            index=models.Index(fields=["deduplication_key", "status"], name="employees_e_dedupli_1c0c2a_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="exportjob",
+            index=models.Index(fields=["status", "created_at"], name="employees_e_status_8ae07d_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="exportjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(status__in=["PENDING", "RUNNING"]),
+                fields=("deduplication_key",),
+                name="unique_unfinished_export_job",
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 3.0.7 on 2026-10-17 08:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_daily_work_hours(apps, schema_editor):
+    DailyWorkHours = apps.get_model('employees', 'DailyWorkHours')
+    Report = apps.get_model('employees', 'Report')
+    DailyWorkHours.objects.bulk_create(
+        (
+            DailyWorkHours(
+                author_id=work_hours['author'],
+                project_id=work_hours['project'],
+                date=work_hours['date'],
+                work_hours=work_hours['work_hours_sum'],
+            )
+            for work_hours in Report.objects.order_by()
+            .values('author', 'project', 'date')
+            .annotate(work_hours_sum=models.Sum('work_hours'))
+            .iterator()
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('managers', '0003_project_is_notification_enabled'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('employees', '0004_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyWorkHours',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('work_hours', models.DurationField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='managers.Project')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyworkhours',
+            constraint=models.UniqueConstraint(fields=('author', 'project', 'date'), name='unique_daily_work_hours'),
+        ),
+        migrations.RunPython(create_daily_work_hours, migrations.RunPython.noop),
+    ]
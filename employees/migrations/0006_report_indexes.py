@@ -0,0 +1,29 @@
+# Generated by Django 3.0.7 on 2026-10-17 08:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_dailyworkhours'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyworkhours',
+            index=models.Index(fields=['project', 'date'], name='employees_d_project_271210_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['author', 'date'], name='employees_r_author__46f164_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['project', 'date'], name='employees_r_project_d5a491_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['author', 'creation_date'], name='employees_r_author__ff2dfb_idx'),
+        ),
+    ]
@@ -1,20 +1,49 @@
 from datetime import date
 from datetime import timedelta
+from typing import Any
 from typing import Optional
+from typing import Tuple
 
+from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.db import models
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Q
 from django.db.models import QuerySet
 from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from django.utils import timezone
 
 from common.convert import timedelta_to_string
+from employees.common.constants import DailyWorkHoursConstants
+from employees.common.constants import ExportJobConstants
 from employees.common.constants import ReportModelConstants
 from employees.common.constants import TaskActivityTypeConstans
+from employees.common.strings import ExportJobFormatText
+from employees.common.strings import ExportJobKindText
+from employees.common.strings import ExportJobStatusText
 from employees.common.strings import ReportValidationStrings
+from employees.common.task_activities_cache import invalidate_project_task_activities
 from managers.models import Project
+from users.common.fields import ChoiceEnum
 from users.models import CustomUser
 
 
+def get_month_date_range(year: int, month: int) -> Tuple[date, date]:
+    """
+    Returns first day of given month and first day of the next one. Filtering on such range, unlike filtering
+    on `date__year` and `date__month`, can use indexes on date column.
+    """
+    first_day = date(int(year), int(month), 1)
+    return (first_day, first_day + relativedelta(months=1))
+
+
 class TaskActivityTypeQuerySet(models.QuerySet):
     def get_defaults(self) -> QuerySet:
         return self.filter(is_default=True)
@@ -31,6 +60,23 @@ class TaskActivityType(models.Model):
         return self.name
 
 
+@receiver(post_save, sender=TaskActivityType)
+@receiver(post_delete, sender=TaskActivityType)
+def invalidate_task_activities_after_change(sender: TaskActivityType, **kwargs: Any) -> None:
+    assert sender == TaskActivityType
+    invalidate_project_task_activities()
+    # Other processes could cache not yet committed task activities again, so version is changed once more.
+    transaction.on_commit(invalidate_project_task_activities)
+
+
+@receiver(m2m_changed, sender=TaskActivityType.projects.through)
+def invalidate_task_activities_after_projects_change(sender: Any, action: str, **kwargs: Any) -> None:
+    assert sender == TaskActivityType.projects.through
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_project_task_activities()
+        transaction.on_commit(invalidate_project_task_activities)
+
+
 class ReportQuerySet(models.QuerySet):
     def get_work_hours_sum_for_all_dates(self) -> dict:
         return dict(
@@ -56,8 +102,34 @@ class ReportQuerySet(models.QuerySet):
             .values_list("author", "monthly_hours_sum")
         )
 
+    def get_export_values(self) -> QuerySet:
+        return self.values(
+            "author",
+            "author__first_name",
+            "author__last_name",
+            "author__email",
+            "date",
+            "description",
+            "work_hours",
+            "project__name",
+            "task_activities__name",
+        )
+
+    def get_version_values(self) -> dict:
+        """
+        Returns values which change whenever any of the reports, or project or author exported or displayed
+        with them, is created, updated or deleted.
+        """
+        return self.order_by().aggregate(
+            last_update=models.Max("last_update"),
+            count=models.Count("pk"),
+            project_updated_at=models.Max("project__updated_at"),
+            author_updated_at=models.Max("author__updated_at"),
+        )
+
     def get_reports_from_a_particular_month(self, year: int, month: int, author_id: Optional[int] = None) -> QuerySet:
-        filtered_reports = self.filter(date__year=year, date__month=month)
+        first_day, next_month_first_day = get_month_date_range(year, month)
+        filtered_reports = self.filter(date__gte=first_day, date__lt=next_month_first_day)
         if author_id is not None:
             filtered_reports = filtered_reports.filter(author=author_id)
         return filtered_reports
@@ -76,6 +148,13 @@ class Report(models.Model):
     work_hours = models.DurationField()
     editable = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["author", "date"]),
+            models.Index(fields=["project", "date"]),
+            models.Index(fields=["author", "creation_date"]),
+        ]
+
     @property
     def work_hours_str(self) -> str:
         return timedelta_to_string(self.work_hours)
@@ -97,3 +176,257 @@ class Report(models.Model):
                 raise ValidationError(
                     message=ReportValidationStrings.WORK_HOURS_SUM_FOR_GIVEN_DATE_FOR_SINGLE_AUTHOR_EXCEEDED.value
                 )
+
+
+class DailyWorkHoursQuerySet(models.QuerySet):
+    def get_from_a_particular_month(self, year: int, month: int, author_id: Optional[int] = None) -> QuerySet:
+        first_day, next_month_first_day = get_month_date_range(year, month)
+        filtered_work_hours = self.filter(date__gte=first_day, date__lt=next_month_first_day)
+        if author_id is not None:
+            filtered_work_hours = filtered_work_hours.filter(author=author_id)
+        return filtered_work_hours
+
+    def get_work_hours_sum_for_all_dates(self) -> dict:
+        return dict(
+            self.values("date").annotate(work_hours_sum=models.Sum("work_hours")).values_list("date", "work_hours_sum")
+        )
+
+    def get_work_hours_sum_for_all_authors(self) -> dict:
+        return dict(
+            self.values("author")
+            .annotate(work_hours_sum=models.Sum("work_hours"))
+            .values_list("author", "work_hours_sum")
+        )
+
+    def add_work_hours(self, author_id: int, project_id: int, for_date: date, work_hours: timedelta) -> None:
+        """
+        Adds given, possibly negative, amount of work hours to the sum of given author, project and date.
+        Sums which drop to zero are removed.
+        """
+        work_hours_of_day = self.filter(author_id=author_id, project_id=project_id, date=for_date)
+        if work_hours > timedelta():
+            if work_hours_of_day.update(work_hours=F("work_hours") + work_hours) == 0:
+                try:
+                    with transaction.atomic():
+                        self.create(author_id=author_id, project_id=project_id, date=for_date, work_hours=work_hours)
+                except IntegrityError:
+                    # Row has been created concurrently by another report of the same day.
+                    work_hours_of_day.update(work_hours=F("work_hours") + work_hours)
+        elif work_hours < timedelta():
+            # Rows are never created here, because reports are also deleted when their project or author is.
+            work_hours_of_day.update(work_hours=F("work_hours") + work_hours)
+            work_hours_of_day.filter(work_hours__lte=timedelta()).delete()
+
+    def rebuild(self) -> int:
+        """
+        Recreates all sums from reports. Returns number of created rows.
+        """
+        self.all().delete()
+        created_work_hours = self.bulk_create(
+            (
+                DailyWorkHours(
+                    author_id=work_hours["author"],
+                    project_id=work_hours["project"],
+                    date=work_hours["date"],
+                    work_hours=work_hours["work_hours_sum"],
+                )
+                for work_hours in Report.objects.order_by()
+                .values("author", "project", "date")
+                .annotate(work_hours_sum=models.Sum("work_hours"))
+                .iterator(chunk_size=DailyWorkHoursConstants.REBUILD_BATCH_SIZE.value)
+            ),
+            batch_size=DailyWorkHoursConstants.REBUILD_BATCH_SIZE.value,
+        )
+        return len(created_work_hours)
+
+
+class DailyWorkHours(models.Model):
+    """
+    Sum of work hours reported by an author in a project on a single day. Kept up to date by `Report` signals,
+    so month summaries don't need to aggregate every single report. Changes made with bulk queryset operations
+    bypass signals, run `rebuild_daily_work_hours` command after them.
+    """
+
+    objects = DailyWorkHoursQuerySet.as_manager()
+
+    author = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    date = models.DateField()
+    work_hours = models.DurationField()
+
+    class Meta:
+        indexes = [models.Index(fields=["project", "date"])]
+        constraints = [models.UniqueConstraint(fields=["author", "project", "date"], name="unique_daily_work_hours")]
+
+
+@receiver(pre_save, sender=Report)
+def remember_previous_work_hours(sender: Report, instance: Report, **kwargs: Any) -> None:
+    assert sender == Report
+    instance._previous_work_hours = (  # pylint: disable=protected-access
+        Report.objects.filter(pk=instance.pk).values("author", "project", "date", "work_hours").first()
+        if instance.pk is not None
+        else None
+    )
+
+
+@receiver(post_save, sender=Report)
+def update_daily_work_hours_after_save(sender: Report, instance: Report, **kwargs: Any) -> None:
+    assert sender == Report
+    previous_work_hours = getattr(instance, "_previous_work_hours", None)
+    if previous_work_hours is not None and (
+        previous_work_hours["author"],
+        previous_work_hours["project"],
+        previous_work_hours["date"],
+    ) == (instance.author_id, instance.project_id, instance.date):
+        DailyWorkHours.objects.add_work_hours(
+            instance.author_id,
+            instance.project_id,
+            instance.date,
+            instance.work_hours - previous_work_hours["work_hours"],
+        )
+        return
+    if previous_work_hours is not None:
+        DailyWorkHours.objects.add_work_hours(
+            previous_work_hours["author"],
+            previous_work_hours["project"],
+            previous_work_hours["date"],
+            -previous_work_hours["work_hours"],
+        )
+    DailyWorkHours.objects.add_work_hours(instance.author_id, instance.project_id, instance.date, instance.work_hours)
+
+
+@receiver(post_delete, sender=Report)
+def update_daily_work_hours_after_delete(sender: Report, instance: Report, **kwargs: Any) -> None:
+    assert sender == Report
+    DailyWorkHours.objects.add_work_hours(instance.author_id, instance.project_id, instance.date, -instance.work_hours)
+
+
+@receiver(post_save, sender=Report)
+def update_last_report_date_after_save(sender: Report, instance: Report, **kwargs: Any) -> None:
+    assert sender == Report
+    previous_report = getattr(instance, "_previous_work_hours", None)
+    if previous_report is not None and (previous_report["author"], previous_report["date"]) != (
+        instance.author_id,
+        instance.date,
+    ):
+        # Moved report could have been the last one of its previous author.
+        CustomUser.objects.filter(
+            pk=previous_report["author"], last_report_date__lte=previous_report["date"]
+        ).update_last_report_date()
+    CustomUser.objects.filter(pk=instance.author_id).advance_last_report_date(instance.date)
+
+
+@receiver(post_delete, sender=Report)
+def update_last_report_date_after_delete(sender: Report, instance: Report, **kwargs: Any) -> None:
+    assert sender == Report
+    CustomUser.objects.filter(pk=instance.author_id, last_report_date__lte=instance.date).update_last_report_date()
+
+
+class ExportJobQuerySet(models.QuerySet):
+    def unfinished(self) -> QuerySet:
+        return self.filter(status__in=[ExportJob.Status.PENDING.name, ExportJob.Status.RUNNING.name])
+
+    def expired(self) -> QuerySet:
+        return self.filter(expires_at__lte=timezone.now())
+
+    def stale(self) -> QuerySet:
+        return self.filter(
+            status=ExportJob.Status.RUNNING.name,
+            started_at__lte=timezone.now() - ExportJobConstants.RUNNING_TIMEOUT.value,
+        )
+
+    def get_reusable(self, deduplication_key: str) -> Optional["ExportJob"]:
+        """
+        Returns job which is still being processed or already finished with a not expired file, for the given key.
+        Stale running jobs are not returned, as their worker has most likely been stopped.
+        """
+        return (
+            self.filter(deduplication_key=deduplication_key)
+            .filter(
+                Q(status=ExportJob.Status.PENDING.name)
+                | Q(
+                    status=ExportJob.Status.RUNNING.name,
+                    started_at__gt=timezone.now() - ExportJobConstants.RUNNING_TIMEOUT.value,
+                )
+                | Q(status=ExportJob.Status.DONE.name, expires_at__gt=timezone.now())
+            )
+            .order_by("-created_at")
+            .first()
+        )
+
+
+class ExportJob(models.Model):
+    """
+    Export of reports from a single month which is generated in background by `process_export_jobs` command.
+    """
+
+    class Kind(ChoiceEnum):
+        USER_REPORTS = ExportJobKindText.USER_REPORTS
+        PROJECT_REPORTS = ExportJobKindText.PROJECT_REPORTS
+        PROJECT_AUTHOR_REPORTS = ExportJobKindText.PROJECT_AUTHOR_REPORTS
+
+    class Format(ChoiceEnum):
+        XLSX = ExportJobFormatText.XLSX
+        CSV = ExportJobFormatText.CSV
+
+    class Status(ChoiceEnum):
+        PENDING = ExportJobStatusText.PENDING
+        RUNNING = ExportJobStatusText.RUNNING
+        DONE = ExportJobStatusText.DONE
+        FAILED = ExportJobStatusText.FAILED
+
+    objects = ExportJobQuerySet.as_manager()
+
+    kind = models.CharField(max_length=ExportJobConstants.CHOICE_MAX_LENGTH.value, choices=Kind.choices())
+    file_format = models.CharField(max_length=ExportJobConstants.CHOICE_MAX_LENGTH.value, choices=Format.choices())
+    status = models.CharField(
+        max_length=ExportJobConstants.CHOICE_MAX_LENGTH.value, choices=Status.choices(), default=Status.PENDING.name
+    )
+    requested_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="requested_export_jobs")
+    author = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True, blank=True)
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    deduplication_key = models.CharField(max_length=ExportJobConstants.DEDUPLICATION_KEY_MAX_LENGTH.value)
+    file = models.FileField(upload_to=ExportJobConstants.UPLOAD_DIRECTORY.value, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["deduplication_key", "status"]), models.Index(fields=["status", "created_at"])]
+        constraints = [
+            # Only one job for the same export can be waiting or running at a time.
+            models.UniqueConstraint(
+                fields=["deduplication_key"],
+                condition=Q(status__in=["PENDING", "RUNNING"]),
+                name="unique_unfinished_export_job",
+            )
+        ]
+
+    @property
+    def is_downloadable(self) -> bool:
+        return self.status == ExportJob.Status.DONE.name and self.expires_at > timezone.now()
+
+    def get_reports(self) -> QuerySet:
+        if self.kind == ExportJob.Kind.USER_REPORTS.name:
+            return Report.objects.get_reports_from_a_particular_month(self.year, self.month, self.author_id)
+        return Report.objects.filter(project=self.project_id).get_reports_from_a_particular_month(
+            self.year, self.month, self.author_id
+        )
+
+    def get_export_name(self) -> str:
+        if self.kind == ExportJob.Kind.USER_REPORTS.name:
+            return self.author.email
+        if self.kind == ExportJob.Kind.PROJECT_REPORTS.name:
+            return self.project.name
+        return f"{self.author.email}/{self.project.name}"
+
+    def can_be_accessed_by(self, user: CustomUser) -> bool:
+        if user.is_admin:
+            return True
+        if self.kind == ExportJob.Kind.USER_REPORTS.name:
+            return self.author_id == user.pk
+        return user.is_manager and self.project.managers.filter(pk=user.pk).exists()
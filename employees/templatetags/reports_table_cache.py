@@ -0,0 +1,33 @@
+from typing import Any
+from typing import Iterable
+
+from django import template
+from django.utils import translation
+
+from employees.common.conditional_get import get_etag
+from employees.common.conditional_get import get_templates_version
+from employees.common.task_activities_cache import get_task_activities_version
+from employees.models import Report
+
+register = template.Library()
+
+
+@register.simple_tag
+def reports_table_version(reports: Iterable[Report], *parts: Any) -> str:
+    """
+    Returns version stamp of table displaying given, already fetched reports, used as key of its cached fragment.
+    It changes whenever any report is added, updated or deleted, or its project or task activity changes.
+    Other data displayed in the table, e.g. its author or the user viewing it, have to be passed in `parts`.
+    """
+    reports = list(reports)
+    return get_etag(
+        (
+            len(reports),
+            max((report.last_update for report in reports), default=None),
+            max((report.project.updated_at for report in reports), default=None),
+            get_task_activities_version(),
+            get_templates_version(),
+            translation.get_language(),
+            *parts,
+        )
+    )
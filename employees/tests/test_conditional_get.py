@@ -0,0 +1,157 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.common.export_cache import get_export_cache
+from employees.factories import ReportFactory
+from managers.factories import ProjectFactory
+from managers.models import Project
+from users.factories import AdminUserFactory
+from users.factories import ManagerUserFactory
+from users.factories import UserFactory
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        get_export_cache().clear()
+        self.addCleanup(get_export_cache().clear)
+        self.admin = AdminUserFactory()
+        self.manager = ManagerUserFactory()
+        self.employee = UserFactory()
+        self.project = ProjectFactory()
+        self.project.managers.add(self.manager)
+        self.project.members.add(self.employee)
+        self.report = ReportFactory(author=self.employee, project=self.project, date="2019-06-03")
+        self.month = {"year": 2019, "month": 6}
+
+    def _get_etag(self, url):
+        # The first response sets CSRF cookie, which is a part of ETag of pages with forms.
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        return etag
+
+    def test_unchanged_report_list_should_not_be_rendered_again(self):
+        self.client.force_login(self.employee)
+        url = reverse("custom-report-list", kwargs=self.month)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=self._get_etag(url))
+
+        self.assertEqual(response.status_code, 304)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_report_list_should_be_rendered_again_after_report_is_deleted(self):
+        ReportFactory(author=self.employee, project=self.project, date="2019-06-04")
+        self.client.force_login(self.employee)
+        url = reverse("custom-report-list", kwargs=self.month)
+        etag = self._get_etag(url)
+
+        self.report.delete()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_report_list_should_be_rendered_again_after_report_is_deleted_for_client_sending_last_modified(self):
+        ReportFactory(author=self.employee, project=self.project, date="2019-06-04")
+        self.client.force_login(self.employee)
+        url = reverse("custom-report-list", kwargs=self.month)
+        response = self.client.get(url)
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        self.report.delete()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT").status_code, 200)
+
+    def test_report_list_should_be_rendered_again_after_user_joins_project(self):
+        self.client.force_login(self.employee)
+        url = reverse("custom-report-list", kwargs=self.month)
+        etag = self._get_etag(url)
+
+        ProjectFactory().members.add(self.employee)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_project_report_list_should_be_rendered_again_after_project_is_renamed(self):
+        self.client.force_login(self.manager)
+        url = reverse("project-report-list", kwargs={"pk": self.project.pk, **self.month})
+        etag = self._get_etag(url)
+
+        self.project.name = "Renamed project"
+        self.project.save()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_project_report_list_should_not_be_revalidated_for_manager_of_other_project(self):
+        self.client.force_login(self.manager)
+        url = reverse("project-report-list", kwargs={"pk": self.project.pk, **self.month})
+        etag = self._get_etag(url)
+
+        ProjectFactory().managers.add(self.manager)
+        self.project.managers.remove(self.manager)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+    def test_author_report_list_should_be_rendered_again_after_report_is_updated(self):
+        self.client.force_login(self.admin)
+        url = reverse("author-report-list", kwargs={"pk": self.employee.pk, **self.month})
+        etag = self._get_etag(url)
+
+        self.report.description = "Updated description"
+        self.report.save()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_unchanged_export_should_not_be_generated_again(self):
+        self.client.force_login(self.manager)
+        url = reverse("export-project-reports", kwargs={"pk": self.project.pk, **self.month})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=self._get_etag(url))
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_export_should_be_generated_again_after_author_is_renamed(self):
+        self.client.force_login(self.manager)
+        url = reverse("export-project-reports", kwargs={"pk": self.project.pk, **self.month})
+        etag = self._get_etag(url)
+
+        self.employee.first_name = "Renamed"
+        self.employee.save()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_export_in_other_format_should_have_different_etag(self):
+        self.client.force_login(self.manager)
+        url = reverse("export-project-reports", kwargs={"pk": self.project.pk, **self.month})
+
+        self.assertNotEqual(self.client.get(url)["ETag"], self.client.get(url, {"format": "csv"})["ETag"])
+
+
+class ProjectUpdatedAtTests(TestCase):
+    def setUp(self):
+        self.project = ProjectFactory()
+        self.user = UserFactory()
+        self.updated_at = Project.objects.get(pk=self.project.pk).updated_at
+
+    def _assert_project_has_been_touched(self):
+        self.assertGreater(Project.objects.get(pk=self.project.pk).updated_at, self.updated_at)
+
+    def test_adding_member_should_update_project(self):
+        self.project.members.add(self.user)
+
+        self._assert_project_has_been_touched()
+
+    def test_removing_project_of_user_should_update_project(self):
+        self.project.members.add(self.user)
+        self.updated_at = Project.objects.get(pk=self.project.pk).updated_at
+
+        self.user.projects.remove(self.project)
+
+        self._assert_project_has_been_touched()
+
+    def test_clearing_projects_of_manager_should_update_project(self):
+        self.project.managers.add(self.user)
+        self.updated_at = Project.objects.get(pk=self.project.pk).updated_at
+
+        self.user.manager_projects.clear()
+
+        self._assert_project_has_been_touched()
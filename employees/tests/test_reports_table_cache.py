@@ -0,0 +1,102 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.factories import ReportFactory
+from employees.models import Report
+from employees.models import TaskActivityType
+from managers.factories import ProjectFactory
+from users.factories import AdminUserFactory
+from users.factories import ManagerUserFactory
+from users.factories import UserFactory
+
+
+class ReportsTableCacheTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["template_fragments"].clear()
+        self.addCleanup(caches["template_fragments"].clear)
+        self.manager = ManagerUserFactory()
+        self.employee = UserFactory()
+        self.project = ProjectFactory(name="Old project name")
+        self.project.managers.add(self.manager)
+        self.project.members.add(self.employee)
+        self.report = ReportFactory(
+            author=self.employee, project=self.project, date="2019-06-03", description="Old description"
+        )
+        self.month = {"year": 2019, "month": 6}
+        self.report_list_url = reverse("custom-report-list", kwargs=self.month)
+        self.project_report_list_url = reverse("project-report-list", kwargs={"pk": self.project.pk, **self.month})
+
+    def _update_description_without_changing_version(self):
+        # Queryset update does not change `last_update`, so only cached table can still contain old description.
+        Report.objects.filter(pk=self.report.pk).update(description="New description")
+
+    def test_unchanged_report_list_table_should_be_served_from_cache(self):
+        self.client.force_login(self.employee)
+        self.client.get(self.report_list_url)
+        self._update_description_without_changing_version()
+
+        response = self.client.get(self.report_list_url)
+
+        self.assertContains(response, "Old description")
+
+    def test_unchanged_project_report_list_table_should_be_served_from_cache(self):
+        self.client.force_login(self.manager)
+        self.client.get(self.project_report_list_url)
+        self._update_description_without_changing_version()
+
+        response = self.client.get(self.project_report_list_url)
+
+        self.assertContains(response, "Old description")
+
+    def test_table_should_be_rendered_again_after_report_is_updated(self):
+        self.client.force_login(self.manager)
+        self.client.get(self.project_report_list_url)
+        self.report.description = "New description"
+        self.report.save()
+
+        response = self.client.get(self.project_report_list_url)
+
+        self.assertContains(response, "New description")
+
+    def test_table_should_be_rendered_again_after_report_is_deleted(self):
+        ReportFactory(author=self.employee, project=self.project, date="2019-06-04", description="Other description")
+        self.client.force_login(self.employee)
+        self.client.get(self.report_list_url)
+        self.report.delete()
+
+        response = self.client.get(self.report_list_url)
+
+        self.assertNotContains(response, "Old description")
+
+    def test_table_should_be_rendered_again_after_project_is_renamed(self):
+        self.client.force_login(self.employee)
+        self.client.get(self.report_list_url)
+        self.project.name = "New project name"
+        self.project.save()
+
+        response = self.client.get(self.report_list_url)
+
+        self.assertContains(response, "New project name")
+
+    def test_table_should_be_rendered_again_after_task_activity_is_renamed(self):
+        self.client.force_login(self.employee)
+        self.client.get(self.report_list_url)
+        task_activity = TaskActivityType.objects.get(pk=self.report.task_activities_id)
+        task_activity.name = "New task activity name"
+        task_activity.save()
+
+        response = self.client.get(self.report_list_url)
+
+        self.assertContains(response, "New task activity name")
+
+    def test_tables_of_different_pages_should_not_be_shared(self):
+        admin = AdminUserFactory()
+        self.client.force_login(self.employee)
+        self.client.get(self.report_list_url)
+
+        self.client.force_login(admin)
+        response = self.client.get(reverse("author-report-list", kwargs={"pk": self.employee.pk, **self.month}))
+
+        self.assertContains(response, reverse("admin-report-detail", kwargs={"pk": self.report.pk}))
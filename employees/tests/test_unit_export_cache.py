@@ -0,0 +1,123 @@
+import io
+
+from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from employees.common.export_cache import cache_streamed_export
+from employees.common.export_cache import get_cached_export
+from employees.common.export_cache import get_export_cache
+from employees.common.export_cache import get_export_cache_key
+from employees.common.export_jobs import VIEW_EXPORT_SOURCE
+from employees.factories import ReportFactory
+from employees.models import ExportJob
+from employees.models import Report
+from managers.factories import ProjectFactory
+from sheetstorm.metrics import registry
+from users.factories import ManagerUserFactory
+from users.factories import UserFactory
+
+
+class ExportCacheTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        get_export_cache().clear()
+        self.addCleanup(get_export_cache().clear)
+        self.manager = ManagerUserFactory()
+        self.employee = UserFactory()
+        self.project = ProjectFactory()
+        self.project.managers.add(self.manager)
+        self.project.members.add(self.employee)
+        self.report = ReportFactory(author=self.employee, project=self.project, date="2019-06-03")
+        self.url = reverse("export-project-reports", kwargs={"pk": self.project.pk, "year": 2019, "month": 6})
+        self.client.force_login(self.manager)
+
+    def _get_export_job(self, file_format=ExportJob.Format.XLSX.name):
+        return ExportJob(
+            requested_by=self.manager,
+            kind=ExportJob.Kind.PROJECT_REPORTS.name,
+            file_format=file_format,
+            year=2019,
+            month=6,
+            project=self.project,
+        )
+
+    def test_export_view_should_cache_generated_xlsx_file(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(get_cached_export(self._get_export_job()), response.getvalue())
+
+    def test_export_view_should_cache_streamed_csv_file(self):
+        response = self.client.get(self.url, {"format": "csv"})
+        content = response.getvalue()
+
+        self.assertEqual(get_cached_export(self._get_export_job(ExportJob.Format.CSV.name)), content)
+
+    def test_export_view_should_record_duration_and_size_of_generated_files(self):
+        samples_at_start = registry.collect()
+
+        self.client.get(self.url)
+        response = self.client.get(self.url, {"format": "csv"})
+        content = response.getvalue()
+
+        samples = registry.collect()
+        for file_format in ["xlsx", "csv"]:
+            key = (("format", file_format), ("source", VIEW_EXPORT_SOURCE))
+            for metric in ["sheetstorm_export_duration_seconds", "sheetstorm_export_size_bytes"]:
+                self.assertEqual(samples[(metric, "_count", key)] - samples_at_start.get((metric, "_count", key), 0), 1)
+        csv_size_key = ("sheetstorm_export_size_bytes", "_sum", (("format", "csv"), ("source", VIEW_EXPORT_SOURCE)))
+        self.assertEqual(samples[csv_size_key] - samples_at_start.get(csv_size_key, 0), len(content))
+
+    def test_export_view_should_serve_cached_file_if_reports_have_not_changed(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, get_cached_export(self._get_export_job()))
+
+    def test_export_view_should_not_serve_cached_file_if_report_has_been_updated(self):
+        self.client.get(self.url)
+        self.report.description = "Updated description"
+        self.report.save()
+
+        response = self.client.get(self.url)
+
+        workbook = load_workbook(filename=io.BytesIO(response.getvalue()))
+        self.assertIn("Updated description", [row[-1] for row in workbook.active.values])
+
+    def test_export_view_should_not_serve_cached_file_if_task_activity_has_been_renamed(self):
+        self.client.get(self.url)
+        task_activity = self.report.task_activities
+        task_activity.name = "Renamed task activity"
+        task_activity.save()
+
+        response = self.client.get(self.url)
+
+        workbook = load_workbook(filename=io.BytesIO(response.getvalue()))
+        self.assertIn("Renamed task activity", [value for row in workbook.active.values for value in row])
+
+    def test_export_cache_key_should_change_when_report_is_deleted(self):
+        ReportFactory(author=self.employee, project=self.project, date="2019-06-04")
+        cache_key = get_export_cache_key(self._get_export_job())
+
+        Report.objects.filter(pk=self.report.pk).delete()
+
+        self.assertNotEqual(get_export_cache_key(self._get_export_job()), cache_key)
+
+    def test_export_cache_key_should_not_depend_on_reports_from_other_months(self):
+        cache_key = get_export_cache_key(self._get_export_job())
+
+        ReportFactory(
+            author=self.employee, project=self.project, date="2019-07-01", task_activities=self.report.task_activities
+        )
+
+        self.assertEqual(get_export_cache_key(self._get_export_job()), cache_key)
+
+    def test_cache_streamed_export_should_not_cache_partially_streamed_export(self):
+        job = self._get_export_job(ExportJob.Format.CSV.name)
+
+        next(cache_streamed_export(job, iter(["a,b\r\n", "c,d\r\n"])))
+
+        self.assertIsNone(get_cached_export(job))
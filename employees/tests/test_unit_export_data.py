@@ -8,10 +8,15 @@ from freezegun import freeze_time
 from openpyxl import load_workbook
 
 from employees.common.constants import ExcelGeneratorSettingsConstants as excel_constants
+from employees.common.exports import export_all_project_reports_as_one_csv_file
+from employees.common.exports import generate_csv_rows_for_project
+from employees.common.exports import generate_csv_rows_for_single_user
 from employees.common.exports import generate_xlsx_for_project
 from employees.common.exports import generate_xlsx_for_single_user
 from employees.common.exports import get_employee_name
 from employees.common.exports import save_work_book_as_csv
+from employees.common.exports import stream_csv_rows
+from employees.common.exports import stream_xlsx_for_project
 from employees.factories import ReportFactory
 from employees.models import Report
 from managers.factories import ProjectFactory
@@ -64,6 +69,12 @@ class ExportViewTest(DataSetUpToTests):
         response = self.client.get(self.url_single_user)
         self.assertEqual(response.status_code, 302)
 
+    def test_export_reports_should_return_not_found_for_invalid_month(self):
+        self.client.force_login(self.user)
+        url = reverse("export-data", kwargs={"pk": self.user.pk, "year": 2019, "month": 13})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
     def test_export_reports_for_project_should_download_if_user_is_logged(self):
         self.client.force_login(self.user)
         response = self.client.get(self.url_project)
@@ -454,3 +465,210 @@ class TestExportingFunctions(TestCase):
         received_workbook = load_workbook(filename=io.BytesIO(response.content))
         self.assertEqual(len(received_workbook.sheetnames), 1)
         self.assertEqual(received_workbook.sheetnames[0], f"{self.employee1.first_name} {self.employee1.last_name[0]}.")
+
+    def test_user_should_export_his_own_reports_when_requested_user_does_not_exist(self):
+        self.client.force_login(self.employee1)
+        url = reverse("export-data", kwargs={"pk": self.employee2.pk + 1000, "year": self.year, "month": self.month})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        received_workbook = load_workbook(filename=io.BytesIO(response.content))
+        self.assertEqual(received_workbook.sheetnames[0], f"{self.employee1.first_name} {self.employee1.last_name[0]}.")
+
+
+class StreamingExportForProjectTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee1 = UserFactory(first_name="Cezar", last_name="Goldstein")
+        self.employee2 = UserFactory(first_name="", last_name="", email="bozydar.stolzman@codepots.it")
+        self.manager = ManagerUserFactory()
+        self.project = ProjectFactory()
+        self.project.members.add(self.employee1)
+        self.project.members.add(self.employee2)
+        self.project.managers.add(self.manager)
+        self.year = "2019"
+        self.month = "06"
+        for day in range(3, 0, -1):
+            ReportFactory(author=self.employee1, project=self.project, date=f"{self.year}-{self.month}-{day}")
+            ReportFactory(author=self.employee1, project=self.project, date=f"{self.year}-{self.month}-{day}")
+            ReportFactory(author=self.employee2, project=self.project, date=f"{self.year}-{self.month}-{day}")
+        ReportFactory(
+            author=self.employee1,
+            project=self.project,
+            date=f"{self.year}-{self.month}-5",
+            description="Multiline\ndescription",
+        )
+        self.streamed_workbook = load_workbook(filename=stream_xlsx_for_project(self.project))
+        # Saved and loaded again, so both workbooks hold cell values converted the same way.
+        saved_project_workbook = io.BytesIO()
+        generate_xlsx_for_project(self.project).save(saved_project_workbook)
+        self.project_workbook = load_workbook(filename=saved_project_workbook)
+
+    def test_streamed_workbook_should_have_the_same_sheets_in_the_same_order_as_regular_export(self):
+        self.assertEqual(self.streamed_workbook.sheetnames, self.project_workbook.sheetnames)
+
+    def test_streamed_workbook_should_have_the_same_cell_values_as_regular_export(self):
+        for streamed_sheet, sheet in zip(self.streamed_workbook.worksheets, self.project_workbook.worksheets):
+            self.assertEqual(list(streamed_sheet.iter_rows(values_only=True)), list(sheet.iter_rows(values_only=True)))
+
+    def test_streamed_workbook_should_have_the_same_row_heights_and_merged_cells_as_regular_export(self):
+        for streamed_sheet, sheet in zip(self.streamed_workbook.worksheets, self.project_workbook.worksheets):
+            self.assertEqual(
+                [streamed_sheet.row_dimensions[row].height for row in range(1, sheet.max_row + 1)],
+                [sheet.row_dimensions[row].height for row in range(1, sheet.max_row + 1)],
+            )
+            self.assertEqual(
+                [str(cell_range) for cell_range in streamed_sheet.merged_cells],
+                [str(cell_range) for cell_range in sheet.merged_cells],
+            )
+
+    def test_streamed_workbook_should_skip_project_members_with_no_reports(self):
+        not_a_member = UserFactory(first_name="Asterix", last_name="Longsword")
+        self.project.members.add(not_a_member)
+        streamed_workbook = load_workbook(filename=stream_xlsx_for_project(self.project))
+        self.assertNotIn(get_employee_name(not_a_member), streamed_workbook.sheetnames)
+
+    def test_export_reports_in_project_view_should_return_streamed_xlsx_file(self):
+        self.client.force_login(self.manager)
+        url = reverse("export-project-reports", kwargs={"pk": self.project.pk, "year": self.year, "month": self.month})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        received_workbook = load_workbook(filename=io.BytesIO(response.getvalue()))
+        self.assertEqual(received_workbook.sheetnames, self.project_workbook.sheetnames)
+
+
+class ProjectExportDataFetchTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = ManagerUserFactory()
+        self.employee1 = UserFactory(first_name="Cezar", last_name="Goldstein")
+        self.employee2 = UserFactory(first_name="Abimelek", last_name="Zuckerberg")
+        self.project = ProjectFactory()
+        self.project.managers.add(self.manager)
+        self.project.members.add(self.employee1, self.employee2)
+        self.year = "2019"
+        self.month = "06"
+        for day in range(1, 4):
+            ReportFactory(author=self.employee1, project=self.project, date=f"{self.year}-{self.month}-{day}")
+            ReportFactory(author=self.employee2, project=self.project, date=f"{self.year}-{self.month}-{day}")
+        self.report_from_other_month = ReportFactory(author=self.employee1, project=self.project, date="2019-07-01")
+        self.month_reports = self.project.report_set.get_reports_from_a_particular_month(self.year, self.month)
+
+    def test_generate_xlsx_for_project_should_fetch_reports_of_all_authors_in_one_query(self):
+        with self.assertNumQueries(1):
+            generate_xlsx_for_project(self.project, self.month_reports)
+
+    def test_generate_xlsx_for_project_should_export_only_given_reports(self):
+        workbook = generate_xlsx_for_project(self.project, self.month_reports)
+        exported_dates = [
+            cell.value
+            for worksheet in workbook.worksheets
+            for (cell,) in worksheet.iter_rows(min_row=excel_constants.FIRST_ROW_FOR_DATA.value, max_col=1)
+            if cell.value not in (None, excel_constants.TOTAL.value)
+        ]
+        self.assertNotIn(self.report_from_other_month.date, exported_dates)
+        self.assertEqual(len(exported_dates), 6)
+
+    def test_export_reports_in_project_view_should_export_only_reports_from_selected_month(self):
+        self.client.force_login(self.manager)
+        url = reverse("export-project-reports", kwargs={"pk": self.project.pk, "year": self.year, "month": self.month})
+
+        response = self.client.get(url)
+
+        received_workbook = load_workbook(filename=io.BytesIO(response.getvalue()))
+        exported_rows = [
+            row
+            for worksheet in received_workbook.worksheets
+            for row in worksheet.iter_rows(min_row=excel_constants.FIRST_ROW_FOR_DATA.value, values_only=True)
+            if row[0] != excel_constants.TOTAL.value
+        ]
+        self.assertEqual(len(exported_rows), 6)
+
+    def test_export_author_reports_in_project_view_should_export_only_selected_author(self):
+        self.client.force_login(self.manager)
+        url = reverse(
+            "export-project-author-reports",
+            kwargs={"pk": self.project.pk, "user_pk": self.employee1.pk, "year": self.year, "month": self.month},
+        )
+
+        response = self.client.get(url)
+
+        received_workbook = load_workbook(filename=io.BytesIO(response.content))
+        self.assertEqual(received_workbook.sheetnames, [get_employee_name(self.employee1)])
+
+
+class CSVExportTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = ManagerUserFactory()
+        self.employee1 = UserFactory(first_name="Cezar", last_name="Goldstein")
+        self.employee2 = UserFactory(first_name="abimelek", last_name="Zuckerberg")
+        self.employee3 = UserFactory(first_name="Bartholomew", last_name="Kowalski")
+        self.project = ProjectFactory()
+        self.project.managers.add(self.manager)
+        self.project.members.add(self.employee1, self.employee2, self.employee3)
+        self.year = "2019"
+        self.month = "06"
+        for day in (3, 1, 2):
+            ReportFactory(author=self.employee1, project=self.project, date=f"{self.year}-{self.month}-{day}")
+            ReportFactory(author=self.employee2, project=self.project, date=f"{self.year}-{self.month}-{day}")
+        self.month_reports = self.project.report_set.get_reports_from_a_particular_month(self.year, self.month)
+
+    @staticmethod
+    def _write_rows(rows):
+        output = io.StringIO()
+        csv.writer(output).writerows(rows)
+        return output.getvalue()
+
+    def _get_work_book_csv_for_project(self):
+        output = io.StringIO()
+        export_all_project_reports_as_one_csv_file(
+            generate_xlsx_for_project(self.project, self.month_reports), csv.writer(output)
+        )
+        return output.getvalue()
+
+    def _get_work_book_csv_for_single_user(self, author):
+        output = io.StringIO()
+        hours_column_setting = excel_constants.HEADERS_TO_COLUMNS_SETTINGS_FOR_SINGLE_USER.value[
+            excel_constants.HOURS_HEADER_STR.value
+        ]
+        save_work_book_as_csv(csv.writer(output), generate_xlsx_for_single_user(author), hours_column_setting)
+        return output.getvalue()
+
+    def test_csv_rows_for_project_should_be_the_same_as_rows_of_work_book_saved_as_csv(self):
+        self.assertEqual(
+            self._write_rows(generate_csv_rows_for_project(self.project, self.month_reports)),
+            self._get_work_book_csv_for_project(),
+        )
+
+    def test_csv_rows_for_single_user_should_be_the_same_as_rows_of_work_book_saved_as_csv(self):
+        self.assertEqual(
+            self._write_rows(generate_csv_rows_for_single_user(self.employee1)),
+            self._get_work_book_csv_for_single_user(self.employee1),
+        )
+
+    def test_csv_rows_for_project_should_be_fetched_in_two_queries(self):
+        with self.assertNumQueries(2):
+            list(generate_csv_rows_for_project(self.project, self.month_reports))
+
+    def test_stream_csv_rows_should_yield_one_csv_line_per_row(self):
+        self.assertEqual(list(stream_csv_rows([["a", 1], ["b", None]])), ["a,1\r\n", "b,\r\n"])
+
+    def test_export_reports_in_project_view_should_stream_csv_file(self):
+        self.client.force_login(self.manager)
+        url = reverse("export-project-reports", kwargs={"pk": self.project.pk, "year": self.year, "month": self.month})
+
+        response = self.client.get(url, {"format": "csv"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.getvalue().decode(), self._get_work_book_csv_for_project())
+
+    def test_export_user_report_view_should_stream_csv_file(self):
+        self.client.force_login(self.employee1)
+        url = reverse("export-data", kwargs={"pk": self.employee1.pk, "year": self.year, "month": self.month})
+
+        response = self.client.get(url, {"format": "csv"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.getvalue().decode(), self._get_work_book_csv_for_single_user(self.employee1))
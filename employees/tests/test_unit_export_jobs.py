@@ -0,0 +1,276 @@
+import csv
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from openpyxl import load_workbook
+
+from employees.common.constants import ExportJobConstants
+from employees.common.export_jobs import claim_next_export_job
+from employees.common.export_jobs import delete_expired_export_jobs
+from employees.common.export_jobs import enqueue_export_job
+from employees.common.export_jobs import run_export_job
+from employees.common.exports import get_employee_name
+from employees.factories import ReportFactory
+from employees.models import ExportJob
+from managers.factories import ProjectFactory
+from users.factories import ManagerUserFactory
+from users.factories import UserFactory
+
+
+class ExportJobTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.manager = ManagerUserFactory()
+        self.employee = UserFactory(first_name="Cezar", last_name="Goldstein")
+        self.project = ProjectFactory()
+        self.project.managers.add(self.manager)
+        self.project.members.add(self.employee)
+        self.year = 2019
+        self.month = 6
+        for day in range(1, 4):
+            ReportFactory(author=self.employee, project=self.project, date=f"2019-06-0{day}")
+        self.report_from_other_month = ReportFactory(author=self.employee, project=self.project, date="2019-07-01")
+
+    def _enqueue_project_export_job(self, file_format=ExportJob.Format.XLSX.name, requested_by=None):
+        return enqueue_export_job(
+            ExportJob(
+                requested_by=requested_by or self.manager,
+                kind=ExportJob.Kind.PROJECT_REPORTS.name,
+                file_format=file_format,
+                year=self.year,
+                month=self.month,
+                project=self.project,
+            )
+        )
+
+    def _enqueue_user_export_job(self, file_format=ExportJob.Format.XLSX.name):
+        return enqueue_export_job(
+            ExportJob(
+                requested_by=self.employee,
+                kind=ExportJob.Kind.USER_REPORTS.name,
+                file_format=file_format,
+                year=self.year,
+                month=self.month,
+                author=self.employee,
+            )
+        )
+
+    def _process_job(self, job):
+        claimed_job = claim_next_export_job()
+        self.assertEqual(claimed_job, job)
+        run_export_job(claimed_job)
+        claimed_job.refresh_from_db()
+        return claimed_job
+
+
+class ExportJobQueueTests(ExportJobTestCase):
+    def test_enqueue_export_job_should_create_pending_job(self):
+        job = self._enqueue_project_export_job()
+
+        self.assertEqual(job.status, ExportJob.Status.PENDING.name)
+        self.assertEqual(ExportJob.objects.count(), 1)
+
+    def test_enqueue_export_job_should_reuse_unfinished_job_for_the_same_export(self):
+        job = self._enqueue_project_export_job()
+
+        self.assertEqual(self._enqueue_project_export_job(requested_by=self.manager), job)
+        self.assertEqual(ExportJob.objects.count(), 1)
+
+    def test_enqueue_export_job_should_reuse_finished_job_for_the_same_export(self):
+        job = self._process_job(self._enqueue_project_export_job())
+
+        self.assertEqual(self._enqueue_project_export_job(), job)
+
+    def test_enqueue_export_job_should_create_new_job_when_exported_reports_have_changed(self):
+        job = self._process_job(self._enqueue_project_export_job())
+        ReportFactory(author=self.employee, project=self.project, date="2019-06-10")
+
+        self.assertNotEqual(self._enqueue_project_export_job(), job)
+
+    def test_enqueue_export_job_should_create_separate_jobs_for_different_formats(self):
+        xlsx_job = self._enqueue_project_export_job(ExportJob.Format.XLSX.name)
+        csv_job = self._enqueue_project_export_job(ExportJob.Format.CSV.name)
+
+        self.assertNotEqual(xlsx_job, csv_job)
+
+    def test_claim_next_export_job_should_mark_oldest_pending_job_as_running(self):
+        job = self._enqueue_project_export_job()
+        self._enqueue_user_export_job()
+
+        claimed_job = claim_next_export_job()
+
+        self.assertEqual(claimed_job, job)
+        self.assertEqual(claimed_job.status, ExportJob.Status.RUNNING.name)
+        self.assertIsNotNone(claimed_job.started_at)
+
+    def test_claim_next_export_job_should_return_none_if_there_are_no_pending_jobs(self):
+        self.assertIsNone(claim_next_export_job())
+
+    def test_run_export_job_should_store_xlsx_file_with_reports_from_given_month(self):
+        job = self._process_job(self._enqueue_project_export_job())
+
+        self.assertEqual(job.status, ExportJob.Status.DONE.name)
+        self.assertTrue(job.is_downloadable)
+        with job.file.open("rb") as export_file:
+            workbook = load_workbook(filename=io.BytesIO(export_file.read()))
+        self.assertEqual(workbook.sheetnames, [get_employee_name(self.employee)])
+        self.assertNotIn(self.report_from_other_month.date, [row[0] for row in workbook.active.values])
+
+    def test_run_export_job_should_store_csv_file_with_single_user_reports_from_given_month(self):
+        job = self._process_job(self._enqueue_user_export_job(ExportJob.Format.CSV.name))
+
+        with job.file.open("rb") as export_file:
+            rows = list(csv.reader(io.StringIO(export_file.read().decode())))
+        self.assertEqual(rows[0], [get_employee_name(self.employee)])
+        self.assertEqual(len(rows), 6)
+
+    def test_run_export_job_should_mark_job_as_failed_if_file_generation_fails(self):
+        job = self._enqueue_project_export_job()
+
+        with mock.patch("employees.common.export_jobs.stream_xlsx_for_project", side_effect=ValueError("Broken")):
+            job = self._process_job(job)
+
+        self.assertEqual(job.status, ExportJob.Status.FAILED.name)
+        self.assertEqual(job.error, "Broken")
+        self.assertFalse(job.file)
+
+    def test_failed_export_job_should_be_deleted_once_expired(self):
+        job = self._enqueue_project_export_job()
+        with mock.patch("employees.common.export_jobs.stream_xlsx_for_project", side_effect=ValueError("Broken")):
+            job = self._process_job(job)
+
+        with freeze_time(job.finished_at + ExportJobConstants.RESULT_LIFETIME.value):
+            self.assertEqual(delete_expired_export_jobs(), 1)
+
+    def test_export_job_of_killed_worker_should_not_block_the_same_export(self):
+        job = self._enqueue_project_export_job()
+        self.assertEqual(claim_next_export_job(), job)
+        # Worker has been killed before `run_export_job` finished, so the job has been left running.
+
+        with freeze_time(timezone.now() + ExportJobConstants.RUNNING_TIMEOUT.value):
+            new_job = self._enqueue_project_export_job()
+
+        job.refresh_from_db()
+        self.assertNotEqual(new_job, job)
+        self.assertEqual(new_job.status, ExportJob.Status.PENDING.name)
+        self.assertEqual(job.status, ExportJob.Status.FAILED.name)
+        self.assertIsNotNone(job.expires_at)
+
+    def test_running_export_job_should_be_reused_until_it_becomes_stale(self):
+        job = self._enqueue_project_export_job()
+        claim_next_export_job()
+
+        self.assertEqual(self._enqueue_project_export_job(), job)
+
+    def test_process_export_jobs_command_should_mark_stale_jobs_as_failed(self):
+        job = self._enqueue_project_export_job()
+        claim_next_export_job()
+
+        with freeze_time(timezone.now() + ExportJobConstants.RUNNING_TIMEOUT.value):
+            call_command("process_export_jobs", "--once")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED.name)
+
+    def test_delete_expired_export_jobs_should_remove_jobs_and_their_files(self):
+        job = self._process_job(self._enqueue_project_export_job())
+        file_storage, file_name = job.file.storage, job.file.name
+        ExportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now())
+
+        self.assertEqual(delete_expired_export_jobs(), 1)
+        self.assertFalse(ExportJob.objects.exists())
+        self.assertFalse(file_storage.exists(file_name))
+
+    def test_process_export_jobs_command_should_process_all_pending_jobs(self):
+        self._enqueue_project_export_job()
+        self._enqueue_user_export_job()
+
+        call_command("process_export_jobs", "--once")
+
+        self.assertEqual(ExportJob.objects.filter(status=ExportJob.Status.DONE.name).count(), 2)
+
+
+class ExportJobViewsTests(ExportJobTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse(
+            "export-project-reports", kwargs={"pk": self.project.pk, "year": self.year, "month": self.month}
+        )
+
+    def test_post_to_export_view_should_enqueue_export_job(self):
+        self.client.force_login(self.manager)
+
+        response = self.client.post(f"{self.url}?format=csv")
+
+        self.assertEqual(response.status_code, 202)
+        job = ExportJob.objects.get()
+        self.assertEqual(job.file_format, ExportJob.Format.CSV.name)
+        self.assertEqual(job.project, self.project)
+        self.assertEqual(response.json()["status_url"], reverse("export-job-status", kwargs={"pk": job.pk}))
+        self.assertIsNone(response.json()["download_url"])
+
+    def test_post_to_export_view_of_not_managed_project_should_not_enqueue_export_job(self):
+        self.client.force_login(ManagerUserFactory())
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_employee_should_enqueue_export_of_own_reports(self):
+        self.client.force_login(self.employee)
+        url = reverse("export-data", kwargs={"pk": self.employee.pk, "year": self.year, "month": self.month})
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(ExportJob.objects.get().author, self.employee)
+
+    def test_status_view_should_return_download_url_of_finished_job(self):
+        job = self._process_job(self._enqueue_project_export_job())
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse("export-job-status", kwargs={"pk": job.pk}))
+
+        self.assertEqual(response.json()["status"], ExportJob.Status.DONE.name)
+        self.assertEqual(response.json()["download_url"], reverse("export-job-download", kwargs={"pk": job.pk}))
+
+    def test_download_view_should_return_stored_file(self):
+        job = self._process_job(self._enqueue_project_export_job(ExportJob.Format.CSV.name))
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse("export-job-download", kwargs={"pk": job.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        with job.file.open("rb") as export_file:
+            self.assertEqual(b"".join(response.streaming_content), export_file.read())
+
+    def test_download_view_should_not_return_file_of_unfinished_job(self):
+        job = self._enqueue_project_export_job()
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse("export-job-download", kwargs={"pk": job.pk}))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_user_without_access_to_exported_reports_should_not_see_export_job(self):
+        job = self._process_job(self._enqueue_project_export_job())
+        self.client.force_login(self.employee)
+
+        response = self.client.get(reverse("export-job-status", kwargs={"pk": job.pk}))
+
+        self.assertEqual(response.status_code, 404)
@@ -1,6 +1,8 @@
 import datetime
 
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db.models import Sum
 from django.test import TestCase
 from django.utils import timezone
 from parameterized import parameterized
@@ -8,6 +10,7 @@ from parameterized import parameterized
 from employees.common.constants import ReportModelConstants  # pylint: disable=no-name-in-module
 from employees.common.strings import ReportValidationStrings
 from employees.factories import ReportFactory
+from employees.models import DailyWorkHours
 from employees.models import Report
 from employees.models import TaskActivityType
 from managers.factories import ProjectFactory
@@ -312,3 +315,188 @@ class TestGetProjectOrderedByLastReportCreationDate(TestCase):
         self.project_2.report_set.all().delete()
         result = list(self.user.get_project_ordered_by_last_report_creation_date())
         self.assertEqual(result, [self.project_1, self.project_3, self.project_2])
+
+
+class TestDailyWorkHours(InitTaskTypeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = UserFactory()
+        self.project = ProjectFactory()
+        self.date = datetime.date(2019, 6, 3)
+        self.report = ReportFactory(
+            author=self.author, project=self.project, date=self.date, work_hours=datetime.timedelta(hours=3)
+        )
+
+    def _assert_daily_work_hours_match_reports(self):
+        expected_work_hours = {
+            (row["author"], row["project"], row["date"]): row["work_hours_sum"]
+            for row in Report.objects.values("author", "project", "date").annotate(work_hours_sum=Sum("work_hours"))
+        }
+        daily_work_hours = {
+            (row.author_id, row.project_id, row.date): row.work_hours for row in DailyWorkHours.objects.all()
+        }
+        self.assertEqual(daily_work_hours, expected_work_hours)
+
+    def test_creating_report_should_add_its_work_hours_to_daily_work_hours(self):
+        ReportFactory(author=self.author, project=self.project, date=self.date, work_hours=datetime.timedelta(hours=2))
+
+        self.assertEqual(DailyWorkHours.objects.get().work_hours, datetime.timedelta(hours=5))
+        self._assert_daily_work_hours_match_reports()
+
+    def test_updating_report_work_hours_should_update_daily_work_hours(self):
+        self.report.work_hours = datetime.timedelta(hours=7)
+        self.report.save()
+
+        self.assertEqual(DailyWorkHours.objects.get().work_hours, datetime.timedelta(hours=7))
+
+    def test_moving_report_to_other_date_and_project_should_move_its_work_hours(self):
+        ReportFactory(author=self.author, project=self.project, date=self.date, work_hours=datetime.timedelta(hours=1))
+        self.report.date = self.date + datetime.timedelta(days=1)
+        self.report.project = ProjectFactory()
+        self.report.save()
+
+        self._assert_daily_work_hours_match_reports()
+
+    def test_deleting_report_should_remove_its_work_hours_from_daily_work_hours(self):
+        self.report.delete()
+
+        self.assertFalse(DailyWorkHours.objects.exists())
+
+    def test_deleting_project_should_delete_its_daily_work_hours(self):
+        self.project.delete()
+
+        self.assertFalse(DailyWorkHours.objects.exists())
+
+    def test_rebuild_daily_work_hours_command_should_recreate_work_hours_sums_from_reports(self):
+        Report.objects.filter(pk=self.report.pk).update(work_hours=datetime.timedelta(hours=8))
+        ReportFactory(author=self.author, project=self.project, date=self.date)
+        DailyWorkHours.objects.create(
+            author=self.author, project=ProjectFactory(), date=self.date, work_hours=datetime.timedelta(hours=1)
+        )
+
+        call_command("rebuild_daily_work_hours")
+
+        self._assert_daily_work_hours_match_reports()
+
+    def test_daily_work_hours_sums_should_be_the_same_as_report_sums(self):
+        other_author = UserFactory()
+        ReportFactory(author=other_author, project=self.project, date=self.date)
+        ReportFactory(author=self.author, date=self.date + datetime.timedelta(days=1))
+        ReportFactory(author=self.author, date=datetime.date(2019, 7, 1))
+        month_reports = Report.objects.get_reports_from_a_particular_month(2019, 6)
+        month_work_hours = DailyWorkHours.objects.get_from_a_particular_month(2019, 6)
+
+        self.assertEqual(
+            month_work_hours.get_work_hours_sum_for_all_dates(), month_reports.get_work_hours_sum_for_all_dates()
+        )
+        self.assertEqual(
+            month_work_hours.get_work_hours_sum_for_all_authors(), month_reports.get_work_hours_sum_for_all_authors()
+        )
+
+
+class TestLastReportDate(InitTaskTypeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = UserFactory()
+        self.date = datetime.date(2019, 6, 3)
+        self.report = ReportFactory(author=self.author, date=self.date)
+
+    def _get_last_report_date(self, user):
+        return CustomUser.objects.values_list("last_report_date", flat=True).get(pk=user.pk)
+
+    def test_creating_report_should_set_last_report_date_of_its_author(self):
+        self.assertEqual(self._get_last_report_date(self.author), self.date)
+
+    def test_creating_earlier_report_should_not_change_last_report_date(self):
+        ReportFactory(author=self.author, date=self.date - datetime.timedelta(days=3))
+
+        self.assertEqual(self._get_last_report_date(self.author), self.date)
+
+    def test_moving_last_report_to_earlier_date_should_move_last_report_date(self):
+        self.report.date = self.date - datetime.timedelta(days=3)
+        self.report.save()
+
+        self.assertEqual(self._get_last_report_date(self.author), self.report.date)
+
+    def test_moving_last_report_to_other_author_should_update_last_report_date_of_both_authors(self):
+        ReportFactory(author=self.author, date=self.date - datetime.timedelta(days=3))
+        other_author = UserFactory()
+        self.report.author = other_author
+        self.report.save()
+
+        self.assertEqual(self._get_last_report_date(self.author), self.date - datetime.timedelta(days=3))
+        self.assertEqual(self._get_last_report_date(other_author), self.date)
+
+    def test_deleting_last_report_should_set_date_of_previous_report(self):
+        ReportFactory(author=self.author, date=self.date - datetime.timedelta(days=3))
+        self.report.delete()
+
+        self.assertEqual(self._get_last_report_date(self.author), self.date - datetime.timedelta(days=3))
+
+    def test_deleting_only_report_should_clear_last_report_date(self):
+        self.report.delete()
+
+        self.assertIsNone(self._get_last_report_date(self.author))
+
+    def test_saving_author_loaded_before_report_should_not_overwrite_last_report_date(self):
+        ReportFactory(author=self.author, date=self.date + datetime.timedelta(days=1))
+        self.author.first_name = "Changed"
+        self.author.save()
+
+        self.assertEqual(self._get_last_report_date(self.author), self.date + datetime.timedelta(days=1))
+        self.assertEqual(self.author.last_report_date, self.date + datetime.timedelta(days=1))
+
+    def test_saving_author_with_changed_last_report_date_should_recompute_it_from_reports(self):
+        self.author.last_report_date = self.date - datetime.timedelta(days=30)
+        self.author.save()
+
+        self.assertEqual(self._get_last_report_date(self.author), self.date)
+        self.assertEqual(self.author.last_report_date, self.date)
+
+    def test_saving_author_with_other_update_fields_should_not_recompute_last_report_date(self):
+        CustomUser.objects.filter(pk=self.author.pk).update(last_report_date=None)
+        self.author.first_name = "Changed"
+
+        with self.assertNumQueries(1):
+            self.author.save(update_fields=["first_name"])
+
+        self.assertIsNone(self._get_last_report_date(self.author))
+
+    def test_saving_deleted_user_should_insert_it_again(self):
+        author = UserFactory()
+        CustomUser.objects.filter(pk=author.pk).delete()
+
+        author.save()
+
+        self.assertTrue(CustomUser.objects.filter(pk=author.pk).exists())
+
+    def test_backfill_last_report_date_command_should_recompute_last_report_dates_from_reports(self):
+        Report.objects.filter(pk=self.report.pk).update(date=self.date + datetime.timedelta(days=1))
+        user_without_reports = UserFactory()
+        CustomUser.objects.filter(pk=user_without_reports.pk).update(last_report_date=self.date)
+
+        call_command("backfill_last_report_date")
+
+        self.assertEqual(self._get_last_report_date(self.author), self.date + datetime.timedelta(days=1))
+        self.assertIsNone(self._get_last_report_date(user_without_reports))
+
+
+class TestReportQuerySetReportsFromParticularMonth(InitTaskTypeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = UserFactory()
+        self.first_day_report = ReportFactory(author=self.author, date=datetime.date(2019, 12, 1))
+        self.last_day_report = ReportFactory(author=self.author, date=datetime.date(2019, 12, 31))
+        ReportFactory(author=self.author, date=datetime.date(2019, 11, 30))
+        ReportFactory(author=self.author, date=datetime.date(2020, 1, 1))
+        ReportFactory(date=datetime.date(2019, 12, 15))
+
+    def test_get_reports_from_a_particular_month_should_return_reports_from_first_to_last_day_of_month(self):
+        reports = Report.objects.get_reports_from_a_particular_month(2019, 12, self.author.pk)
+
+        self.assertEqual(set(reports), {self.first_day_report, self.last_day_report})
+
+    def test_get_reports_from_a_particular_month_should_accept_year_and_month_given_as_strings(self):
+        reports = Report.objects.get_reports_from_a_particular_month("2019", "12", self.author.pk)
+
+        self.assertEqual(set(reports), {self.first_day_report, self.last_day_report})
@@ -0,0 +1,113 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.common.task_activities_cache import get_project_task_activities
+from employees.common.task_activities_cache import invalidate_project_task_activities
+from employees.factories import TaskActivityTypeFactory
+from employees.forms import ReportForm
+from managers.factories import ProjectFactory
+from users.factories import UserFactory
+
+
+class TaskActivitiesCacheTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        invalidate_project_task_activities()
+        self.project = ProjectFactory()
+        self.meeting = TaskActivityTypeFactory(name="Meeting")
+        self.backend = TaskActivityTypeFactory(name="Backend Development")
+        self.project.project_activities.set([self.meeting, self.backend])
+
+    def test_get_project_task_activities_should_return_task_activities_of_project_ordered_by_name(self):
+        self.assertEqual(get_project_task_activities(self.project.pk), [self.backend, self.meeting])
+
+    def test_get_project_task_activities_should_not_query_database_for_cached_project(self):
+        get_project_task_activities(self.project.pk)
+
+        with self.assertNumQueries(0):
+            get_project_task_activities(self.project.pk)
+
+    def test_adding_task_activity_to_project_should_invalidate_cache(self):
+        get_project_task_activities(self.project.pk)
+        review = TaskActivityTypeFactory(name="Review")
+
+        self.project.project_activities.add(review)
+
+        self.assertEqual(get_project_task_activities(self.project.pk), [self.backend, self.meeting, review])
+
+    def test_removing_project_from_task_activity_should_invalidate_cache(self):
+        get_project_task_activities(self.project.pk)
+
+        self.meeting.projects.remove(self.project)
+
+        self.assertEqual(get_project_task_activities(self.project.pk), [self.backend])
+
+    def test_renaming_task_activity_should_invalidate_cache(self):
+        get_project_task_activities(self.project.pk)
+
+        self.meeting.name = "All hands"
+        self.meeting.save()
+
+        self.assertEqual(
+            [activity.name for activity in get_project_task_activities(self.project.pk)],
+            ["All hands", "Backend Development"],
+        )
+
+    def test_report_form_should_render_task_activities_choices_from_cache(self):
+        user = UserFactory()
+        self.project.members.add(user)
+        get_project_task_activities(self.project.pk)
+
+        form = ReportForm(initial={"author": user})
+
+        self.assertEqual(
+            list(form.fields["task_activities"].choices),
+            [(self.backend.pk, self.backend.name), (self.meeting.pk, self.meeting.name)],
+        )
+
+
+class LoadTaskActivitiesInProjectViewTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        self.task_activity = TaskActivityTypeFactory(name="Meeting")
+        self.project.project_activities.add(self.task_activity)
+        self.url = reverse("ajax-load-task-activities")
+        self.client.force_login(UserFactory())
+
+    def test_view_should_return_task_activities_of_project_with_etag(self):
+        response = self.client.get(self.url, {"project": self.project.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'<option value="{self.task_activity.pk}">Meeting</option>')
+        self.assertTrue(response.has_header("ETag"))
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_view_should_return_not_modified_response_for_current_etag(self):
+        etag = self.client.get(self.url, {"project": self.project.pk})["ETag"]
+
+        response = self.client.get(self.url, {"project": self.project.pk}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_view_should_return_changed_task_activities_for_outdated_etag(self):
+        etag = self.client.get(self.url, {"project": self.project.pk})["ETag"]
+        self.project.project_activities.add(TaskActivityTypeFactory(name="Review"))
+
+        response = self.client.get(self.url, {"project": self.project.pk}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Review")
+
+    def test_view_should_return_different_etags_for_different_projects(self):
+        other_project = ProjectFactory()
+
+        self.assertNotEqual(
+            self.client.get(self.url, {"project": self.project.pk})["ETag"],
+            self.client.get(self.url, {"project": other_project.pk})["ETag"],
+        )
+
+    def test_view_should_return_404_for_invalid_project(self):
+        response = self.client.get(self.url, {"project": "invalid"})
+
+        self.assertEqual(response.status_code, 404)
@@ -2,9 +2,11 @@ import datetime
 
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.db import connection
 from django.shortcuts import reverse
 from django.template.defaultfilters import date
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 from parameterized import parameterized
@@ -200,6 +202,42 @@ class ReportCustomListTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertNotContains(response, self.report)
 
+    def test_custom_list_view_should_compute_work_hours_summary_from_reports_of_the_month(self):
+        other_project = ProjectFactory(name="Other project")
+        ReportFactory(
+            author=self.user,
+            project=other_project,
+            date=self.report.date,
+            task_activities=self.task_activity,
+            work_hours=datetime.timedelta(hours=2),
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context_data["daily_hours_sum"], {self.report.date: datetime.timedelta(hours=10)})
+        self.assertEqual(response.context_data["monthly_hours_sum"], {self.user.pk: datetime.timedelta(hours=10)})
+        self.assertEqual(
+            response.context_data["projects_work_percentage"],
+            {
+                self.report.project.name: (datetime.timedelta(hours=8), 80.0),
+                other_project.name: (datetime.timedelta(hours=2), 20.0),
+            },
+        )
+
+    def test_custom_list_view_number_of_queries_should_not_depend_on_number_of_reports_and_projects(self):
+        with CaptureQueriesContext(connection) as queries_for_one_report:
+            self.client.get(self.url)
+        for _ in range(3):
+            project = ProjectFactory()
+            project.members.add(self.user)
+            ReportFactory.create_batch(2, author=self.user, project=project, date=self.report.date)
+
+        with CaptureQueriesContext(connection) as queries_for_many_reports:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context_data["object_list"]), 7)
+        self.assertEqual(len(queries_for_many_reports), len(queries_for_one_report))
+
     def test_custom_report_list_view_should_add_new_report_on_post(self):
         response = self.client.post(self.url, self.data)
         self.assertEqual(response.status_code, 302)
@@ -744,6 +782,20 @@ class ProjectReportListTests(TestCase):
         self.assertNotContains(response, other_project_report.description)
         self.assertContains(response, project_report_from_other_month.description)
 
+    def test_project_report_list_view_number_of_queries_should_not_depend_on_number_of_authors(self):
+        with CaptureQueriesContext(connection) as queries_for_one_author:
+            self.client.get(self.url)
+        for _ in range(3):
+            author = UserFactory()
+            self.project.members.add(author)
+            ReportFactory.create_batch(2, author=author, project=self.project, date=self.report.date)
+
+        with CaptureQueriesContext(connection) as queries_for_many_authors:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context_data["project_reports"]), 7)
+        self.assertEqual(len(queries_for_many_authors), len(queries_for_one_author))
+
     def _assert_response_contain_report(self, response, reports):
         for report in reports:
             dates = ["creation_date", "last_update"]
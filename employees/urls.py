@@ -42,6 +42,8 @@ urlpatterns = [
         views.ExportAuthorReportProjectView.as_view(),
         name="export-project-author-reports",
     ),
+    url(r"^export/jobs/(?P<pk>[0-9]+)/$", views.ExportJobStatusView.as_view(), name="export-job-status"),
+    url(r"^export/jobs/(?P<pk>[0-9]+)/download/$", views.ExportJobDownloadView.as_view(), name="export-job-download"),
     url(
         r"^ajax/load-task-activities/",
         views.LoadTaskActivitiesInProjectView.as_view(),
@@ -1,22 +1,31 @@
-import csv
 import datetime
+import functools
 import logging
+import time
 from typing import Any
+from typing import Optional
 from typing import Union
 
 from dateutil.relativedelta import relativedelta
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count
+from django.db.models import Max
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
+from django.http import JsonResponse
+from django.http.response import FileResponse
 from django.http.response import Http404
 from django.http.response import HttpResponse
 from django.http.response import HttpResponseRedirectBase
+from django.http.response import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.shortcuts import reverse
 from django.urls import resolve
 from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.views.generic import CreateView
 from django.views.generic import DeleteView
 from django.views.generic import DetailView
@@ -24,27 +33,42 @@ from django.views.generic import UpdateView
 from django.views.generic.base import ContextMixin
 from django.views.generic.base import TemplateView
 
-from employees.common.constants import ColumnSettings
+from employees.common.conditional_get import get_conditional_or_rendered_response
+from employees.common.conditional_get import get_etag
+from employees.common.conditional_get import get_page_etag
 from employees.common.constants import ExcelGeneratorSettingsConstants as excel_constants
 from employees.common.constants import MonthNavigationConstants
-from employees.common.exports import export_all_project_reports_as_one_csv_file
-from employees.common.exports import generate_xlsx_for_project
-from employees.common.exports import generate_xlsx_for_single_user
-from employees.common.exports import save_work_book_as_csv
+from employees.common.export_cache import cache_export_file
+from employees.common.export_cache import cache_streamed_export
+from employees.common.export_cache import get_cached_export
+from employees.common.export_jobs import VIEW_EXPORT_SOURCE
+from employees.common.export_jobs import enqueue_export_job
+from employees.common.export_jobs import generate_export_csv_rows
+from employees.common.export_jobs import generate_export_xlsx_file
+from employees.common.export_jobs import get_deduplication_key
+from employees.common.export_jobs import get_file_size
+from employees.common.export_jobs import measure_streamed_export
+from employees.common.export_jobs import record_generated_export
+from employees.common.exports import stream_csv_rows
+from employees.common.month_summary import ReportsMonthSummary
 from employees.common.strings import AuthorReportListStrings
 from employees.common.strings import MonthNavigationText
 from employees.common.strings import ProjectReportDetailStrings
 from employees.common.strings import ProjectReportListStrings
 from employees.common.strings import ReportDetailStrings
 from employees.common.strings import ReportListStrings
+from employees.common.task_activities_cache import get_project_task_activities
+from employees.common.task_activities_cache import get_task_activities_version
 from employees.forms import MonthSwitchForm
 from employees.forms import ProjectJoinForm
 from employees.forms import ReportForm
+from employees.models import DailyWorkHours
+from employees.models import ExportJob
 from employees.models import Report
-from employees.models import TaskActivityType
 from managers.models import Project
 from users.models import CustomUser
 from utils.decorators import check_permissions
+from utils.decorators import non_atomic_safe_requests
 from utils.mixins import ProjectsWorkPercentageMixin
 from utils.mixins import UserIsAuthorOfCurrentReportMixin
 from utils.mixins import UserIsManagerOfCurrentProjectMixin
@@ -53,6 +77,111 @@ from utils.mixins import UserIsManagerOfCurrentReportProjectOrAuthorOfCurrentRep
 logger = logging.getLogger(__name__)
 
 
+def get_export_job_status_data(job: ExportJob) -> dict:
+    return {
+        "id": job.pk,
+        "status": job.status,
+        "error": job.error,
+        "status_url": reverse("export-job-status", kwargs={"pk": job.pk}),
+        "download_url": reverse("export-job-download", kwargs={"pk": job.pk}) if job.is_downloadable else None,
+    }
+
+
+class ReportsExportMixin:
+    """
+    Exports reports described by export job returned by `get_export_job(file_format)`, which has to be implemented
+    by views using this mixin. GET request returns export file, served from export cache if exported reports have
+    not changed since it was generated. POST request enqueues background export job and returns its status.
+    """
+
+    request = None  # type: HttpRequest
+    kwargs = {}  # type: dict
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not 1 <= int(kwargs["month"]) <= MonthNavigationConstants.MAX_MONTH_VALUE.value:
+            raise Http404
+        return super().dispatch(request, *args, **kwargs)  # type: ignore
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.object = self.get_object()  # type: ignore  # pylint: disable=attribute-defined-outside-init
+        job = self.get_export_job(self.get_file_format())  # type: ignore
+        return get_conditional_or_rendered_response(
+            request, self.get_export_etag(job), functools.partial(self.render_export, job)
+        )
+
+    @staticmethod
+    def get_export_etag(job: ExportJob) -> str:
+        # Deduplication key describes exported reports and is reused as the key of export cache.
+        job.deduplication_key = get_deduplication_key(job)
+        return get_etag(
+            (
+                job.deduplication_key,
+                job.author.updated_at if job.author is not None else None,
+                job.project.updated_at if job.project is not None else None,
+            )
+        )
+
+    def get_file_format(self) -> str:
+        return ExportJob.Format.CSV.name if self.request.GET.get("format") == "csv" else ExportJob.Format.XLSX.name
+
+    def render_export(self, job: ExportJob) -> Union[HttpResponse, StreamingHttpResponse, FileResponse]:
+        if job.file_format == ExportJob.Format.CSV.name:
+            content_type = excel_constants.CSV_CONTENT_TYPE_FORMAT.value
+            content_disposition = excel_constants.CSV_EXPORTED_FILE_NAME.value
+        else:
+            content_type = excel_constants.XLSX_CONTENT_TYPE_FORMAT.value
+            content_disposition = excel_constants.XLSX_EXPORTED_FILE_NAME.value
+
+        cached_export = get_cached_export(job)
+        if cached_export is not None:
+            response = HttpResponse(cached_export, content_type=content_type)
+        elif job.file_format == ExportJob.Format.CSV.name:
+            response = StreamingHttpResponse(
+                measure_streamed_export(
+                    job, cache_streamed_export(job, stream_csv_rows(generate_export_csv_rows(job)))
+                ),
+                content_type=content_type,
+            )
+        else:
+            start = time.perf_counter()
+            export_file = generate_export_xlsx_file(job)
+            record_generated_export(job, VIEW_EXPORT_SOURCE, time.perf_counter() - start, get_file_size(export_file))
+            exported_content = cache_export_file(job, export_file)
+            if exported_content is None:
+                response = FileResponse(export_file, content_type=content_type)
+            else:
+                export_file.close()
+                response = HttpResponse(exported_content, content_type=content_type)
+
+        response["Content-Disposition"] = content_disposition.format(
+            job.get_export_name(), f"{self.kwargs['month']}/{self.kwargs['year']}"
+        )
+        return response
+
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        self.object = self.get_object()  # type: ignore  # pylint: disable=attribute-defined-outside-init
+        job = enqueue_export_job(self.get_export_job(self.get_file_format()))  # type: ignore
+        return JsonResponse(get_export_job_status_data(job), status=202)
+
+
+class ConditionalMonthViewMixin:
+    """
+    Answers GET request with 304 Not Modified when month page would be rendered from the same data as the page
+    which the client already has, so it is not rendered again. ETag of the page is returned by `get_etag()`,
+    which has to be implemented by views using this mixin.
+    """
+
+    request = None  # type: HttpRequest
+    kwargs = {}  # type: dict
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return get_conditional_or_rendered_response(
+            request,
+            self.get_etag(),  # type: ignore
+            functools.partial(super().get, request, *args, **kwargs),  # type: ignore
+        )
+
+
 class MonthNavigationMixin(ContextMixin):
     kwargs = {}  # type: dict
 
@@ -157,6 +286,7 @@ class MonthNavigationMixin(ContextMixin):
         return redirect(self._get_current_month_url(pk))
 
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(
     check_permissions(
@@ -168,7 +298,7 @@ class MonthNavigationMixin(ContextMixin):
     ),
     name="dispatch",
 )
-class ReportListCreateProjectJoinView(MonthNavigationMixin, ProjectsWorkPercentageMixin, CreateView):
+class ReportListCreateProjectJoinView(ConditionalMonthViewMixin, MonthNavigationMixin, CreateView):
     template_name = "employees/report_list.html"
     project_join_form = ProjectJoinForm
     model = Report
@@ -191,16 +321,29 @@ class ReportListCreateProjectJoinView(MonthNavigationMixin, ProjectsWorkPercenta
     def get_context_data(self, **kwargs: Any) -> dict:
         context_data = super().get_context_data(**kwargs)
         context_data["UI_text"] = ReportListStrings
-        context_data["object_list"] = self.get_queryset().order_by("-date", "project__name", "-creation_date")
-        context_data["daily_hours_sum"] = context_data["object_list"].order_by().get_work_hours_sum_for_all_dates()
-        context_data["monthly_hours_sum"] = context_data["object_list"].order_by().get_work_hours_sum_for_all_authors()
-        project_form_queryset = (
-            Project.objects.filter_active().exclude(members__id=self.request.user.id).order_by("name")
+        # Reports of the month are fetched once and all work hours sums are computed from them.
+        reports = list(
+            self.get_queryset()
+            .select_related("project", "task_activities")
+            .order_by("-date", "project__name", "-creation_date")
+        )
+        month_summary = ReportsMonthSummary(reports)
+        context_data["object_list"] = reports
+        context_data["daily_hours_sum"] = month_summary.daily_hours_sum
+        context_data["monthly_hours_sum"] = month_summary.monthly_hours_sum
+        context_data["projects_work_percentage"] = month_summary.get_projects_work_percentage()
+        project_form = ProjectJoinForm(
+            queryset=Project.objects.filter_active().exclude(members__id=self.request.user.id).order_by("name")
         )
-        context_data["hide_join"] = not project_form_queryset.exists()
-        context_data["project_form"] = ProjectJoinForm(queryset=project_form_queryset)
+        context_data["hide_join"] = not project_form.fields["projects"].choices
+        context_data["project_form"] = project_form
         return context_data
 
+    def get_etag(self) -> Optional[str]:
+        # Forms list projects which the user is a member of and projects which can be joined.
+        projects_state = Project.objects.aggregate(updated_at=Max("updated_at"), count=Count("pk"))
+        return get_page_etag(self.request, self.get_queryset(), *projects_state.values())
+
     def get_success_url(self) -> str:
         return reverse("custom-report-list", kwargs={"year": self.kwargs["year"], "month": self.kwargs["month"]})
 
@@ -326,9 +469,10 @@ class ReportDeleteView(
         return reverse("custom-report-list", kwargs={"year": self.object.date.year, "month": self.object.date.month})
 
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name]), name="dispatch")
-class AuthorReportView(DetailView, ProjectsWorkPercentageMixin, MonthNavigationMixin):
+class AuthorReportView(ConditionalMonthViewMixin, DetailView, ProjectsWorkPercentageMixin, MonthNavigationMixin):
     model = CustomUser
     template_name = "employees/author_report_list.html"
 
@@ -344,10 +488,27 @@ class AuthorReportView(DetailView, ProjectsWorkPercentageMixin, MonthNavigationM
     def get_context_data(self, **kwargs: Any) -> dict:
         context = super().get_context_data(**kwargs)
         context["UI_text"] = AuthorReportListStrings
-        context["daily_hours_sum"] = self.object.report_set.get_work_hours_sum_for_all_dates()
-        context["monthly_hours_sum"] = self.object.report_set.get_work_hours_sum_for_all_authors()
+        context["daily_hours_sum"] = self.get_work_hours_queryset().get_work_hours_sum_for_all_dates()
+        context["monthly_hours_sum"] = self.get_work_hours_queryset().get_work_hours_sum_for_all_authors()
         return context
 
+    def get_work_hours_queryset(self) -> QuerySet:
+        return DailyWorkHours.objects.get_from_a_particular_month(
+            self.kwargs["year"], self.kwargs["month"], self.object.pk
+        )
+
+    def get_etag(self) -> Optional[str]:
+        author_updated_at = CustomUser.objects.filter(pk=self.kwargs["pk"]).values_list("updated_at", flat=True).first()
+        if author_updated_at is None:
+            return None
+        return get_page_etag(
+            self.request,
+            Report.objects.get_reports_from_a_particular_month(
+                self.kwargs["year"], self.kwargs["month"], self.kwargs["pk"]
+            ),
+            author_updated_at,
+        )
+
     def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Union[HttpResponse, HttpResponseRedirectBase]:
         if self._date_out_of_bounds():
             return self.redirect_to_current_month()
@@ -367,22 +528,52 @@ class AdminReportView(ReportDetailBase):
     url_pk = "author"
 
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(
     check_permissions(allowed_user_types=[CustomUser.UserType.MANAGER.name, CustomUser.UserType.ADMIN.name]),
     name="dispatch",
 )
-class BaseProjectReportList(UserIsManagerOfCurrentProjectMixin, DetailView, MonthNavigationMixin):
+class BaseProjectReportList(
+    UserIsManagerOfCurrentProjectMixin, ConditionalMonthViewMixin, DetailView, MonthNavigationMixin
+):
     model = Project
     template_name = "employees/project_report_list.html"
 
     def get_context_data(self, **kwargs: Any) -> dict:
         context = super().get_context_data(**kwargs)
         context["UI_text"] = ProjectReportListStrings
-        context["monthly_hours_sum"] = self.object.report_set.get_work_hours_sum_for_all_authors()
+        context["project_reports"] = self.get_reports()
+        context["monthly_hours_sum"] = self.object.dailyworkhours_set.get_from_a_particular_month(
+            self.kwargs["year"], self.kwargs["month"], self.kwargs.get("user_pk")
+        ).get_work_hours_sum_for_all_authors()
         context["project_work_hours_sum"] = sum(context["monthly_hours_sum"].values(), datetime.timedelta())
         return context
 
+    def get_reports(self) -> QuerySet:
+        return (
+            self.object.report_set.get_reports_from_a_particular_month(
+                self.kwargs["year"], self.kwargs["month"], self.kwargs.get("user_pk")
+            )
+            .select_related("author", "task_activities")
+            .order_by("author__email", "-date", "-creation_date")
+        )
+
+    def get_etag(self) -> Optional[str]:
+        # Projects which are not managed by the user are not found, so the page is rendered to respond with 404.
+        project_updated_at = (
+            self.get_queryset().filter(pk=self.kwargs["pk"]).values_list("updated_at", flat=True).first()
+        )
+        if project_updated_at is None:
+            return None
+        return get_page_etag(
+            self.request,
+            Report.objects.filter(project=self.kwargs["pk"]).get_reports_from_a_particular_month(
+                self.kwargs["year"], self.kwargs["month"], self.kwargs.get("user_pk")
+            ),
+            project_updated_at,
+        )
+
     def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Union[HttpResponse, HttpResponseRedirectBase]:
         if self._date_out_of_bounds():
             return self.redirect_to_current_month()
@@ -397,28 +588,8 @@ class BaseProjectReportList(UserIsManagerOfCurrentProjectMixin, DetailView, Mont
 class ProjectReportList(BaseProjectReportList):
     extra_context = {"only_one_author_reports": False}
 
-    def get_queryset(self) -> QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .get_with_prefetched_reports(
-                Report.objects.get_reports_from_a_particular_month(self.kwargs["year"], self.kwargs["month"])
-            )
-        )
-
 
 class AuthorReportProjectView(BaseProjectReportList):
-    def get_queryset(self) -> QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .get_with_prefetched_reports(
-                Report.objects.get_reports_from_a_particular_month(
-                    self.kwargs["year"], self.kwargs["month"], self.kwargs["user_pk"]
-                )
-            )
-        )
-
     def get_context_data(self, **kwargs: Any) -> dict:
         context = super().get_context_data(**kwargs)
         context["only_one_author_reports"] = True
@@ -437,6 +608,7 @@ class ProjectReportDetail(UserIsManagerOfCurrentReportProjectOrAuthorOfCurrentRe
     url_pk = "project"
 
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(
     check_permissions(
@@ -448,136 +620,118 @@ class ProjectReportDetail(UserIsManagerOfCurrentReportProjectOrAuthorOfCurrentRe
     ),
     name="dispatch",
 )
-class ExportUserReportView(DetailView):
+class ExportUserReportView(ReportsExportMixin, DetailView):
     model = CustomUser
 
-    def get_queryset(self) -> QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .get_with_prefetched_reports(
-                Report.objects.get_reports_from_a_particular_month(self.kwargs["year"], self.kwargs["month"])
-            )
+    def get_object(self, queryset: Optional[QuerySet] = None) -> CustomUser:
+        # Only admins can export reports of other users, others always export their own reports.
+        if not self.request.user.is_admin:
+            return self.request.user
+        return super().get_object(queryset)
+
+    def get_export_job(self, file_format: str) -> ExportJob:
+        return ExportJob(
+            requested_by=self.request.user,
+            kind=ExportJob.Kind.USER_REPORTS.name,
+            file_format=file_format,
+            year=int(self.kwargs["year"]),
+            month=int(self.kwargs["month"]),
+            author=self.object,
         )
 
-    def render_to_response(self, context: dict, **response_kwargs: Any) -> HttpResponse:
-        if self.request.user.is_admin:
-            author = super().get_object()
-        else:
-            author = self.get_queryset().get(pk=self.request.user.pk)
-
-        work_book = generate_xlsx_for_single_user(author)
-
-        if self.request.GET.get("format") == "csv":
-            response = HttpResponse(content_type=excel_constants.CSV_CONTENT_TYPE_FORMAT.value)
-            response["Content-Disposition"] = excel_constants.CSV_EXPORTED_FILE_NAME.value.format(
-                author.email, f"{self.kwargs['month']}/{self.kwargs['year']}"
-            )
-            writer = csv.writer(response)
-            hours_column_setting: ColumnSettings = excel_constants.HEADERS_TO_COLUMNS_SETTINGS_FOR_SINGLE_USER.value[
-                excel_constants.HOURS_HEADER_STR.value
-            ]
-            save_work_book_as_csv(writer, work_book, hours_column_setting)
-        else:
-            response = HttpResponse(content_type=excel_constants.XLSX_CONTENT_TYPE_FORMAT.value)
-            response["Content-Disposition"] = excel_constants.XLSX_EXPORTED_FILE_NAME.value.format(
-                author.email, f"{self.kwargs['month']}/{self.kwargs['year']}"
-            )
-            work_book.save(response)
-        return response
-
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(
     check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name, CustomUser.UserType.MANAGER.name]),
     name="dispatch",
 )
-class ExportReportsInProjectView(UserIsManagerOfCurrentProjectMixin, DetailView):
+class ExportReportsInProjectView(UserIsManagerOfCurrentProjectMixin, ReportsExportMixin, DetailView):
     model = Project
 
-    def get_queryset(self) -> QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .get_with_prefetched_reports(
-                Report.objects.get_reports_from_a_particular_month(self.kwargs["year"], self.kwargs["month"])
-            )
+    def get_export_job(self, file_format: str) -> ExportJob:
+        return ExportJob(
+            requested_by=self.request.user,
+            kind=ExportJob.Kind.PROJECT_REPORTS.name,
+            file_format=file_format,
+            year=int(self.kwargs["year"]),
+            month=int(self.kwargs["month"]),
+            project=self.object,
         )
 
-    def render_to_response(self, context: dict, **response_kwargs: Any) -> HttpResponse:
-        project = super().get_object()
-        work_book = generate_xlsx_for_project(project)
-
-        if self.request.GET.get("format") == "csv":
-            response = HttpResponse(content_type=excel_constants.CSV_CONTENT_TYPE_FORMAT.value)
-            response["Content-Disposition"] = excel_constants.CSV_EXPORTED_FILE_NAME.value.format(
-                project.name, f"{self.kwargs['month']}/{self.kwargs['year']}"
-            )
-            writer = csv.writer(response)
-            export_all_project_reports_as_one_csv_file(work_book, writer)
-        else:
-            response = HttpResponse(content_type=excel_constants.XLSX_CONTENT_TYPE_FORMAT.value)
-            response["Content-Disposition"] = excel_constants.XLSX_EXPORTED_FILE_NAME.value.format(
-                project.name, f"{self.kwargs['month']}/{self.kwargs['year']}"
-            )
-            work_book.save(response)
-        return response
-
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(
     check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name, CustomUser.UserType.MANAGER.name]),
     name="dispatch",
 )
-class ExportAuthorReportProjectView(UserIsManagerOfCurrentProjectMixin, DetailView):
+class ExportAuthorReportProjectView(UserIsManagerOfCurrentProjectMixin, ReportsExportMixin, DetailView):
     model = Project
 
-    def get_queryset(self) -> QuerySet:
-        return (
-            super()
-            .get_queryset()
-            .get_with_prefetched_reports(
-                Report.objects.get_reports_from_a_particular_month(
-                    self.kwargs["year"], self.kwargs["month"], self.kwargs["user_pk"]
-                )
-            )
+    def get_export_job(self, file_format: str) -> ExportJob:
+        return ExportJob(
+            requested_by=self.request.user,
+            kind=ExportJob.Kind.PROJECT_AUTHOR_REPORTS.name,
+            file_format=file_format,
+            year=int(self.kwargs["year"]),
+            month=int(self.kwargs["month"]),
+            project=self.object,
+            author=get_object_or_404(CustomUser, pk=self.kwargs["user_pk"]),
         )
 
-    def render_to_response(self, context: dict, **response_kwargs: Any) -> HttpResponse:
-        project = super().get_object()
-        author = get_object_or_404(CustomUser, pk=self.kwargs["user_pk"])
-        work_book = generate_xlsx_for_project(project)
 
-        if self.request.GET.get("format") == "csv":
-            response = HttpResponse(content_type=excel_constants.CSV_CONTENT_TYPE_FORMAT.value)
-            response["Content-Disposition"] = excel_constants.CSV_EXPORTED_FILE_NAME.value.format(
-                f"{author.email}/{project.name}", f"{self.kwargs['month']}/{self.kwargs['year']}"
-            )
-            writer = csv.writer(response)
-            hours_column_setting: ColumnSettings = excel_constants.HEADERS_TO_COLUMNS_SETTINGS_FOR_USER_IN_PROJECT.value[
-                excel_constants.HOURS_HEADER_STR.value
-            ]
-            save_work_book_as_csv(writer, work_book, hours_column_setting)
+@method_decorator(login_required, name="dispatch")
+class ExportJobStatusView(DetailView):
+    model = ExportJob
+
+    def get_object(self, queryset: Optional[QuerySet] = None) -> ExportJob:
+        job = super().get_object(queryset)
+        if not job.can_be_accessed_by(self.request.user):
+            raise Http404
+        return job
+
+    def render_to_response(self, context: dict, **response_kwargs: Any) -> JsonResponse:
+        return JsonResponse(get_export_job_status_data(self.object))
+
+
+class ExportJobDownloadView(ExportJobStatusView):
+    def render_to_response(self, context: dict, **response_kwargs: Any) -> FileResponse:
+        if not self.object.is_downloadable:
+            raise Http404
+        if self.object.file_format == ExportJob.Format.CSV.name:
+            content_type = excel_constants.CSV_CONTENT_TYPE_FORMAT.value
+            content_disposition = excel_constants.CSV_EXPORTED_FILE_NAME.value
         else:
-            response = HttpResponse(content_type=excel_constants.XLSX_CONTENT_TYPE_FORMAT.value)
-            response["Content-Disposition"] = excel_constants.XLSX_EXPORTED_FILE_NAME.value.format(
-                f"{author.email}/{project.name}", f"{self.kwargs['month']}/{self.kwargs['year']}"
-            )
-            work_book.save(response)
+            content_type = excel_constants.XLSX_CONTENT_TYPE_FORMAT.value
+            content_disposition = excel_constants.XLSX_EXPORTED_FILE_NAME.value
+        response = FileResponse(self.object.file.open("rb"), content_type=content_type)
+        response["Content-Disposition"] = content_disposition.format(
+            self.object.get_export_name(), f"{self.object.month}/{self.object.year}"
+        )
         return response
 
 
+def get_task_activities_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    try:
+        project_id = int(request.GET["project"])
+    except (ValueError, KeyError):
+        return None
+    return f"{get_task_activities_version()}-{project_id}"
+
+
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
+@method_decorator(cache_control(private=True, no_cache=True), name="dispatch")
+@method_decorator(condition(etag_func=get_task_activities_etag), name="get")
 class LoadTaskActivitiesInProjectView(TemplateView):
     template_name = "employees/partial/task_activity_list.html"
 
     def get_context_data(self, **kwargs: Any) -> dict:
         context = super().get_context_data(**kwargs)
         try:
-            int(self.request.GET["project"])
+            project_id = int(self.request.GET["project"])
         except (ValueError, KeyError):
             raise Http404
-        context["task_activities"] = TaskActivityType.objects.filter(projects=self.request.GET.get("project")).order_by(
-            "name"
-        )
+        context["task_activities"] = get_project_task_activities(project_id)
         return context
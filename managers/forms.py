@@ -2,7 +2,8 @@ from typing import Any
 
 from bootstrap_datepicker_plus import DatePickerInput
 from django import forms
-from django_select2.forms import Select2MultipleWidget
+from django.db.models import QuerySet
+from django_select2.forms import ModelSelect2MultipleWidget
 
 from common.constants import CORRECT_DATE_FORMAT
 from employees.models import TaskActivityType
@@ -10,12 +11,36 @@ from managers.models import Project
 from users.models import CustomUser
 
 
+class ProjectFormSelect2MultipleWidget(ModelSelect2MultipleWidget):
+    """
+    Renders only selected options and loads the others page by page from the autocomplete view,
+    so size of the form does not depend on number of users or task activities.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("data_view", "project-form-autocomplete")
+        kwargs.setdefault("attrs", {"data-minimum-input-length": 0})
+        super().__init__(*args, **kwargs)
+
+
+class UserSelect2MultipleWidget(ProjectFormSelect2MultipleWidget):
+    search_fields = ["email__icontains", "first_name__icontains", "last_name__icontains"]
+
+
+class TaskActivitySelect2MultipleWidget(ProjectFormSelect2MultipleWidget):
+    search_fields = ["name__icontains"]
+
+
+def get_active_users_to_choose() -> QuerySet:
+    return CustomUser.objects.active().only("email", "first_name", "last_name").order_by("email")
+
+
 class ActivityWidget(forms.ModelMultipleChoiceField):
-    widget = Select2MultipleWidget()
+    widget = TaskActivitySelect2MultipleWidget()
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(
-            queryset=TaskActivityType.objects.all(),
+            queryset=TaskActivityType.objects.order_by("name"),
             required=False,
             initial=TaskActivityType.objects.filter(is_default=True),
             **kwargs
@@ -29,14 +54,14 @@ class ProjectAdminForm(forms.ModelForm):
         user_pk = kwargs.pop("user_pk", None)
         super().__init__(*args, **kwargs)
 
-        managers_to_choose = CustomUser.objects.active().exclude(user_type=CustomUser.UserType.EMPLOYEE.name)
+        managers_to_choose = get_active_users_to_choose().exclude(user_type=CustomUser.UserType.EMPLOYEE.name)
         if self.instance.pk:
             self.fields["managers"].queryset = managers_to_choose
             self.initial["activities"] = list(TaskActivityType.objects.filter(projects=self.instance.pk))
         else:
             self.fields["managers"].queryset = managers_to_choose.exclude(pk=user_pk)
             self.fields["managers"].required = False
-        self.fields["members"].queryset = CustomUser.objects.active()
+        self.fields["members"].queryset = get_active_users_to_choose()
 
     class Meta:
         model = Project
@@ -44,8 +69,8 @@ class ProjectAdminForm(forms.ModelForm):
         widgets = {
             "start_date": DatePickerInput(options={"format": CORRECT_DATE_FORMAT}),
             "stop_date": DatePickerInput(options={"format": CORRECT_DATE_FORMAT}),
-            "managers": Select2MultipleWidget(),
-            "members": Select2MultipleWidget(),
+            "managers": UserSelect2MultipleWidget(),
+            "members": UserSelect2MultipleWidget(),
         }
 
     def save(self, commit: bool = True) -> Project:
@@ -57,7 +82,7 @@ class ProjectAdminForm(forms.ModelForm):
 class ProjectManagerForm(forms.ModelForm):
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
-        self.fields["members"].queryset = CustomUser.objects.active()
+        self.fields["members"].queryset = get_active_users_to_choose()
 
     activities = ActivityWidget()
 
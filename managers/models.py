@@ -43,15 +43,14 @@ class Project(models.Model):
     managers = models.ManyToManyField(CustomUser, related_name="manager_projects")
     members = models.ManyToManyField(CustomUser, related_name="projects")
     is_notification_enabled = models.BooleanField(default=True)
+    # Changed also when members or managers are changed.
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = ProjectQuerySet.as_manager()
 
     def __str__(self) -> str:
         return self.name
 
-    def get_report_ordered(self) -> QuerySet:
-        return self.report_set.select_related("task_activities").order_by("author__email", "-date", "-creation_date")
-
     def clean(self) -> None:
         super().clean()
         if self.stop_date is not None and self.start_date > self.stop_date:
@@ -69,6 +68,23 @@ def update_user_type(sender: Project, action: str, pk_set: Set, **kwargs: Any) -
         change_user_type_to_manager(project)
 
 
+@receiver(m2m_changed, sender=Project.managers.through)
+@receiver(m2m_changed, sender=Project.members.through)
+def touch_project_after_members_change(sender: Any, action: str, reverse: bool, pk_set: Set, **kwargs: Any) -> None:
+    assert sender in (Project.managers.through, Project.members.through)
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    instance = kwargs["instance"]
+    if not reverse:
+        projects = Project.objects.filter(pk=instance.pk)
+    elif action == "pre_clear":
+        # Cleared projects are not known after the clear, so they are looked up while still being related.
+        projects = Project.objects.filter(**{"managers" if sender == Project.managers.through else "members": instance})
+    else:
+        projects = Project.objects.filter(pk__in=pk_set)
+    projects.update(updated_at=timezone.now())
+
+
 def change_user_type_to_manager(project: Project) -> None:
     project.managers.filter(user_type=CustomUser.UserType.EMPLOYEE.name).update(
         user_type=CustomUser.UserType.MANAGER.name
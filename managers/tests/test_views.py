@@ -1,5 +1,7 @@
+from django.db import connection
 from django.shortcuts import reverse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from parameterized import parameterized
 
@@ -233,8 +235,78 @@ class ProjectUpdateViewTestCase(ProjectBaseTests):
         self.assertEqual(response.status_code, 200)
         self.assertIn(self.user, response.context_data["form"].initial["managers"])
         self.assertNotIn(other_manager, response.context_data["form"].initial["managers"])
+        self.assertIn(other_manager, response.context_data["form"].fields["managers"].queryset)
         self.assertContains(response, self.user)
-        self.assertContains(response, other_manager)
+
+    def test_project_update_view_should_render_only_selected_users_as_options(self):
+        self.project.members.add(self.user)
+        not_selected_user = UserFactory()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'<option value="{self.user.pk}" selected>')
+        self.assertNotContains(response, not_selected_user.email)
+        self.assertContains(response, reverse("project-form-autocomplete"))
+
+    def test_project_update_view_number_of_queries_should_not_depend_on_number_of_users(self):
+        with CaptureQueriesContext(connection) as queries_for_one_user:
+            self.client.get(self.url)
+        UserFactory.create_batch(5)
+        ManagerUserFactory.create_batch(5)
+
+        with CaptureQueriesContext(connection) as queries_for_many_users:
+            self.client.get(self.url)
+
+        self.assertEqual(len(queries_for_many_users), len(queries_for_one_user))
+
+
+class ProjectFormAutocompleteViewTests(ProjectBaseTests):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("project-form-autocomplete")
+        self.employee = UserFactory(first_name="Ignacy", last_name="Kowalski")
+        self.inactive_employee = UserFactory(first_name="Ignacy", last_name="Nowak", is_active=False)
+
+    def _get_field_id(self, field_name):
+        response = self.client.get(reverse("custom-project-create"))
+        return response.context_data["form"].fields[field_name].widget.field_id
+
+    def test_autocomplete_view_should_return_active_users_matching_searched_term(self):
+        response = self.client.get(self.url, {"field_id": self._get_field_id("members"), "term": "ignacy"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [{"id": self.employee.pk, "text": str(self.employee)}])
+
+    def test_autocomplete_view_should_return_only_managers_for_managers_field(self):
+        manager = ManagerUserFactory(first_name="Ignacy", last_name="Manager")
+
+        response = self.client.get(self.url, {"field_id": self._get_field_id("managers"), "term": "ignacy"})
+
+        self.assertEqual([result["id"] for result in response.json()["results"]], [manager.pk])
+
+    def test_autocomplete_view_should_return_task_activities_matching_searched_term(self):
+        task_activity = TaskActivityTypeFactory(name="Code review")
+
+        response = self.client.get(self.url, {"field_id": self._get_field_id("activities"), "term": "review"})
+
+        self.assertEqual(response.json()["results"], [{"id": task_activity.pk, "text": task_activity.name}])
+
+    def test_autocomplete_view_should_paginate_results(self):
+        UserFactory.create_batch(30)
+
+        response = self.client.get(self.url, {"field_id": self._get_field_id("members")})
+
+        self.assertEqual(len(response.json()["results"]), 25)
+        self.assertTrue(response.json()["more"])
+
+    def test_autocomplete_view_should_not_be_available_for_employees(self):
+        field_id = self._get_field_id("members")
+        self.client.force_login(self.employee)
+
+        response = self.client.get(self.url, {"field_id": field_id, "term": "ignacy"})
+
+        self.assertNotEqual(response.status_code, 200)
 
 
 class ProjectDeleteViewTests(ProjectBaseTests):
@@ -7,6 +7,7 @@ urlpatterns = [
     url("^projects/create/$", views.ProjectCreateView.as_view(), name="custom-project-create"),
     url("^projects/(?P<pk>[0-9]+)/$", views.ProjectDetailView.as_view(), name="custom-project-detail"),
     url("^projects/(?P<pk>[0-9]+)/update/$", views.ProjectUpdateView.as_view(), name="custom-project-update"),
+    url("^projects/autocomplete/$", views.ProjectFormAutocompleteView.as_view(), name="project-form-autocomplete"),
     url("^projects/(?P<pk>[0-9]+)/delete/$", views.ProjectDeleteView.as_view(), name="custom-project-delete"),
     url(
         "^project/(?P<pk>[0-9]+)/task-activities/$",
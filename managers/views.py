@@ -23,6 +23,7 @@ from django.views.generic import RedirectView
 from django.views.generic import UpdateView
 from django.views.generic.edit import FormView
 from django.views.generic.edit import ModelFormMixin
+from django_select2.views import AutoResponseView
 
 from employees.forms import TaskActivityForm
 from employees.models import TaskActivityType
@@ -31,11 +32,13 @@ from managers.forms import ProjectManagerForm
 from managers.models import Project
 from users.models import CustomUser
 from utils.decorators import check_permissions
+from utils.decorators import non_atomic_safe_requests
 from utils.mixins import UserIsManagerOfCurrentProjectMixin
 
 logger = logging.getLogger(__name__)
 
 
+@method_decorator(non_atomic_safe_requests, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 @method_decorator(
     check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name, CustomUser.UserType.MANAGER.name]),
@@ -156,6 +159,17 @@ class ProjectUpdateView(UserIsManagerOfCurrentProjectMixin, UpdateView):
         return super(ModelFormMixin, self).form_valid(form)  # pylint: disable=bad-super-call
 
 
+@method_decorator(login_required, name="dispatch")
+@method_decorator(
+    check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name, CustomUser.UserType.MANAGER.name]),
+    name="dispatch",
+)
+class ProjectFormAutocompleteView(AutoResponseView):
+    """
+    Returns page of users or task activities matching searched term for autocomplete widgets of project forms.
+    """
+
+
 @method_decorator(login_required, name="dispatch")
 @method_decorator(check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name]), name="dispatch")
 class ProjectDeleteView(DeleteView):
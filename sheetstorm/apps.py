@@ -5,4 +5,5 @@ class SheetstormConfig(AppConfig):
     name = "sheetstorm"
 
     def ready(self) -> None:
+        from sheetstorm import db_connections  # noqa: F401  # pylint: disable=unused-import, import-outside-toplevel
         from sheetstorm import system_check  # noqa: F401  # pylint: disable=unused-import, import-outside-toplevel
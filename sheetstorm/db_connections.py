@@ -0,0 +1,68 @@
+import logging
+import threading
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """
+    Numbers of database connections opened, reused by subsequent requests and closed by health checks
+    in the current thread. Connections are not shared between threads, so neither are their statistics.
+    """
+
+    def __init__(self, opened: int = 0, reused: int = 0, closed_unusable: int = 0) -> None:
+        self.opened = opened
+        self.reused = reused
+        self.closed_unusable = closed_unusable
+
+    def __sub__(self, other: "ConnectionStats") -> "ConnectionStats":
+        return ConnectionStats(
+            self.opened - other.opened, self.reused - other.reused, self.closed_unusable - other.closed_unusable
+        )
+
+    def copy(self) -> "ConnectionStats":
+        return ConnectionStats(self.opened, self.reused, self.closed_unusable)
+
+
+_thread_local = threading.local()
+
+
+def get_connection_stats() -> ConnectionStats:
+    if not hasattr(_thread_local, "connection_stats"):
+        _thread_local.connection_stats = ConnectionStats()
+    return _thread_local.connection_stats
+
+
+@receiver(connection_created)
+def count_opened_connection(
+    sender: BaseDatabaseWrapper, connection: BaseDatabaseWrapper, **kwargs: Any  # pylint: disable=unused-argument
+) -> None:
+    get_connection_stats().opened += 1
+
+
+@receiver(request_started)
+def check_persistent_connections(sender: Any, **kwargs: Any) -> None:  # pylint: disable=unused-argument
+    """
+    Checks connections kept open by previous requests because of `CONN_MAX_AGE`, so the request does not fail
+    on connection dropped in the meantime, e.g. by database restart. Unusable connections are closed
+    and reopened on first query. It runs after Django closes connections older than `CONN_MAX_AGE`.
+    """
+    stats = get_connection_stats()
+    for connection in connections.all():
+        # Connection in transaction at the start of request is not persistent one, e.g. in tests.
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if settings.DATABASE_CONNECTION_HEALTH_CHECKS and not connection.is_usable():
+            logger.warning(f"Closing unusable persistent connection to {connection.alias} database")
+            connection.close()
+            stats.closed_unusable += 1
+        else:
+            stats.reused += 1
@@ -0,0 +1,79 @@
+import threading
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db.models import Model
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_routing_state = threading.local()
+
+
+def get_read_replica_alias() -> Optional[str]:
+    """
+    Returns alias of read replica database or None if `READ_REPLICA_DATABASE` is not configured in `DATABASES`.
+    """
+    alias = settings.READ_REPLICA_DATABASE
+    return alias if alias is not None and alias in settings.DATABASES else None
+
+
+@contextmanager
+def route_reads_to_replica() -> Iterator[None]:
+    """
+    Routes reads executed in the block to read replica until first write, after which primary database is used,
+    so changes made in the block are visible to its subsequent reads.
+    """
+    previous_state = (getattr(_routing_state, "enabled", False), getattr(_routing_state, "written", False))
+    _routing_state.enabled = True
+    _routing_state.written = False
+    try:
+        yield
+    finally:
+        (_routing_state.enabled, _routing_state.written) = previous_state
+
+
+def stream_with_reads_routed_to_replica(content: Iterable[bytes]) -> Iterator[bytes]:
+    # Streamed responses query database while being consumed, after middlewares return.
+    with route_reads_to_replica():
+        yield from content
+
+
+class ReadReplicaRouter:
+    """
+    Sends all writes to primary database. Reads are sent to read replica only inside `route_reads_to_replica` block
+    and only outside of transactions on primary database, e.g. the ones opened by `ATOMIC_REQUESTS`.
+    """
+
+    def db_for_read(self, model: Model, **hints: Any) -> str:  # pylint: disable=unused-argument
+        replica_alias = get_read_replica_alias()
+        if (
+            replica_alias is not None
+            and getattr(_routing_state, "enabled", False)
+            and not getattr(_routing_state, "written", False)
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return replica_alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: Model, **hints: Any) -> str:  # pylint: disable=unused-argument
+        _routing_state.written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        # pylint: disable=unused-argument, protected-access
+        databases = {DEFAULT_DB_ALIAS, get_read_replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> Optional[bool]:  # pylint: disable=unused-argument
+        # Replica receives schema changes from primary database.
+        if db == get_read_replica_alias():
+            return False
+        return None
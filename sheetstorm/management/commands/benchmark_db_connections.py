@@ -0,0 +1,128 @@
+import logging
+import statistics
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.test import RequestFactory
+from django.urls import reverse
+
+from managers.models import Project
+from sheetstorm.db_connections import get_connection_stats
+from sheetstorm.management.commands.constants import DataSize
+from sheetstorm.management.commands.run_benchmarks import test_databases
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Request small endpoint through full WSGI request cycle with and without persistent database connections "
+        "and compare per-request latency."
+    )
+
+    DEFAULT_REQUESTS = 100
+    DEFAULT_CONN_MAX_AGE = 60
+    PERCENTILE = 0.95
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=self.DEFAULT_REQUESTS, help="Number of requests sent in each mode"
+        )
+        parser.add_argument(
+            "--conn-max-age",
+            type=int,
+            default=self.DEFAULT_CONN_MAX_AGE,
+            help="Lifetime of persistent connections in seconds",
+        )
+        parser.add_argument(
+            "--url", help="URL of benchmarked endpoint. Defaults to task activities of project with most reports"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["requests"] < 1:
+            raise CommandError("Number of requests has to be positive")
+        if options["conn_max_age"] < 1:
+            raise CommandError("Lifetime of persistent connections has to be positive")
+
+        with test_databases():
+            call_command("generate_test_data", data_size=DataSize.SMALL.value, bulk=True)
+            url = options["url"] or self.get_default_url()
+            session_cookie = self.get_session_cookie()
+            results = {
+                mode: self.benchmark(url, session_cookie, conn_max_age, options["requests"])
+                for (mode, conn_max_age) in [("non-persistent", 0), ("persistent", options["conn_max_age"])]
+            }
+        self.print_results(url, results)
+
+    @staticmethod
+    def get_default_url() -> str:
+        project = Project.objects.annotate(reports_count=Count("report")).order_by("-reports_count", "pk").first()
+        return reverse("ajax-load-task-activities") + f"?project={project.pk}"
+
+    @staticmethod
+    def get_session_cookie() -> str:
+        client = Client()
+        client.force_login(CustomUser.objects.filter(is_superuser=True).first())
+        return f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+    def benchmark(self, url: str, session_cookie: str, conn_max_age: int, requests: int) -> Dict[str, float]:
+        """
+        Sends requests through WSGI handler, which, unlike test client, closes connections at the end of request
+        the same way gunicorn workers do.
+        """
+        for connection in connections.all():
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+
+        handler = WSGIHandler()
+        request_factory = RequestFactory()
+        stats_at_start = get_connection_stats().copy()
+        timings = []  # type: List[float]
+        for _ in range(requests):
+            environ = request_factory.get(url, HTTP_COOKIE=session_cookie).environ
+            start = time.perf_counter()
+            response = handler(environ, self.start_response)
+            b"".join(response)
+            response.close()
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise CommandError(f"Benchmarked endpoint {url} returned status code {response.status_code}")
+        stats = get_connection_stats() - stats_at_start
+
+        return {
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "p95": self.get_percentile(timings, self.PERCENTILE),
+            "opened": stats.opened,
+            "reused": stats.reused,
+        }
+
+    @staticmethod
+    def start_response(status: str, headers: list, exc_info: Optional[tuple] = None) -> None:
+        pass
+
+    @staticmethod
+    def get_percentile(timings: List[float], percentile: float) -> float:
+        sorted_timings = sorted(timings)
+        return sorted_timings[min(int(len(sorted_timings) * percentile), len(sorted_timings) - 1)]
+
+    def print_results(self, url: str, results: Dict[str, Dict[str, float]]) -> None:
+        self.stdout.write(f"{url}:")
+        for (mode, result) in results.items():
+            self.stdout.write(
+                f"  {mode:<16} median {result['median'] * 1000:>7.2f} ms  mean {result['mean'] * 1000:>7.2f} ms  "
+                f"p95 {result['p95'] * 1000:>7.2f} ms  {result['opened']:>5} connections opened  "
+                f"{result['reused']:>5} reused"
+            )
@@ -6,6 +6,12 @@ SUPERUSER_USER_TYPE = "SUPERUSER"
 
 DATA_SIZE_PARAMETER = "data_size"
 
+BULK_PARAMETER = "bulk"
+
+REPORT_MONTHS_PARAMETER = "report_months"
+
+REPORTS_PER_DAY_PARAMETER = "reports_per_day"
+
 
 class DataSize(Enum):
     SMALL = "small"
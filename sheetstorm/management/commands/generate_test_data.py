@@ -1,18 +1,34 @@
+import datetime
 import logging
+import random
+from itertools import islice
 from typing import Any
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
 from typing import Union
 
 from dateutil.relativedelta import relativedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
 from django.db import transaction
 from django.utils import timezone
+from faker import Faker
 
+from employees.models import DailyWorkHours
+from employees.models import Report
+from employees.models import TaskActivityType
 from managers.factories import ProjectFactory
 from managers.models import Project
+from sheetstorm.management.commands.constants import BULK_PARAMETER
 from sheetstorm.management.commands.constants import DATA_SETS
 from sheetstorm.management.commands.constants import DATA_SIZE_PARAMETER
+from sheetstorm.management.commands.constants import REPORT_MONTHS_PARAMETER
+from sheetstorm.management.commands.constants import REPORTS_PER_DAY_PARAMETER
 from sheetstorm.management.commands.constants import SUPERUSER_USER_TYPE
 from sheetstorm.management.commands.constants import DataSize
 from sheetstorm.management.commands.constants import ProjectType
@@ -34,6 +50,14 @@ class Command(BaseCommand):
     PROJECT_START_DATE_TIME_DELTA = relativedelta(months=1, day=1)
     PROJECT_STOP_DATE_TIME_DELTA = relativedelta(days=14)
 
+    BULK_BATCH_SIZE = 5000
+    BULK_USER_PASSWORD = "password"
+    BULK_PROJECTS_PER_USER = 2
+    BULK_TASK_ACTIVITIES_PER_PROJECT = 3
+    BULK_DEFAULT_REPORT_MONTHS = 3
+    BULK_DEFAULT_REPORTS_PER_DAY = 1
+    BULK_WORK_HOURS_PER_DAY = 8
+
     def __init__(self) -> None:
         super().__init__()
         self.number_of_admins: int
@@ -44,19 +68,33 @@ class Command(BaseCommand):
         self.number_of_completed_projects: int
         self.is_superuser_request: bool
         self.data_set_size: Any
+        self.is_bulk_request: bool
+        self.number_of_report_months: int
+        self.number_of_reports_per_day: int
 
     @transaction.atomic
     def handle(self, *args: Any, **options: Union[bool, int, None]) -> None:
         self._init_values_from_given_options(options)
 
-        self.execute_creating_users()
-        self.execute_creating_project()
+        if self.is_bulk_request:
+            self.execute_bulk_creating()
+        else:
+            self.execute_creating_users()
+            self.execute_creating_project()
 
         logging.info(f"Total number of users in the database: {CustomUser.objects.count()}")
         logging.info(f"Total number of projects in the database: {Project.objects.count()}")
+        logging.info(f"Total number of reports in the database: {Report.objects.count()}")
 
     def _init_values_from_given_options(self, options: Dict[str, Any]) -> None:
         self.data_set_size = options[DATA_SIZE_PARAMETER]
+        self.is_bulk_request = options.get(BULK_PARAMETER, False)
+        self.number_of_report_months = self._get_positive_option(
+            options, REPORT_MONTHS_PARAMETER, self.BULK_DEFAULT_REPORT_MONTHS
+        )
+        self.number_of_reports_per_day = self._get_positive_option(
+            options, REPORTS_PER_DAY_PARAMETER, self.BULK_DEFAULT_REPORTS_PER_DAY
+        )
 
         if self._get_request_to_create_data_using_prepared_set():
             options = self._pick_dataset_to_create()
@@ -69,6 +107,15 @@ class Command(BaseCommand):
         self.number_of_completed_projects = options[ProjectType.COMPLETED.name]
         self.is_superuser_request = options[SUPERUSER_USER_TYPE]
 
+    @staticmethod
+    def _get_positive_option(options: Dict[str, Any], option_name: str, default: int) -> int:
+        value = options.get(option_name)
+        if value is None:
+            return default
+        if value < 1:
+            raise CommandError(f"Value of {option_name} has to be positive")
+        return value
+
     def _get_request_to_create_data_using_prepared_set(self) -> bool:
         return isinstance(self.data_set_size, str)
 
@@ -170,6 +217,170 @@ class Command(BaseCommand):
     def _create_stop_date(time_delta: Any = PROJECT_STOP_DATE_TIME_DELTA) -> timezone.datetime:
         return timezone.now() - time_delta
 
+    def execute_bulk_creating(self) -> None:
+        """
+        Creates users, projects, memberships, task activities and reports with as few queries as possible.
+        Signals are not sent by bulk operations, so their effects are applied explicitly.
+        """
+        first_report_date = self._get_first_report_date()
+        users = self.bulk_create_users()
+        projects = self.bulk_create_projects(first_report_date)
+        self.bulk_create_task_activities(projects)
+        memberships = self.bulk_create_memberships(users, projects)
+        self.bulk_create_reports(memberships, first_report_date)
+        DailyWorkHours.objects.rebuild()
+        CustomUser.objects.update_last_report_date()
+
+    def _get_first_report_date(self) -> datetime.date:
+        return timezone.now().date() - relativedelta(months=self.number_of_report_months - 1, day=1)
+
+    def bulk_create_users(self) -> List[CustomUser]:
+        existing_emails = set(CustomUser.objects.values_list("email", flat=True))
+        # Hashing is deliberately slow, so all users share single precomputed hash.
+        password = make_password(self.BULK_USER_PASSWORD)
+        fake = Faker()
+        users_to_create = []
+
+        user_options = dict(self._get_user_options())  # type: Dict[str, Optional[int]]
+        if self._get_superuser_request():
+            user_options[SUPERUSER_USER_TYPE] = 1
+
+        for (user_type, number_of_users) in user_options.items():
+            for user_number in range(number_of_users or 0):
+                user_email = f"user.{user_type}{user_number + 1}@codepoets.it".lower()
+                if user_email not in existing_emails:
+                    users_to_create.append(
+                        CustomUser(
+                            **self._set_user_factory_parameters(user_type),
+                            email=user_email,
+                            first_name=fake.first_name(),
+                            last_name=fake.last_name(),
+                            password=password,
+                            is_active=True,
+                        )
+                    )
+
+        logging.info(f"Creating {len(users_to_create)} user(s)")
+        return CustomUser.objects.bulk_create(users_to_create, batch_size=self.BULK_BATCH_SIZE)
+
+    def bulk_create_projects(self, first_report_date: datetime.date) -> List[Project]:
+        fake = Faker()
+        projects_to_create = []
+
+        for (project_type, number_of_projects) in self._set_number_of_projects_to_create().items():
+            # Reports are created since the first report date, so projects have to be started by then.
+            start_date = min(self._create_start_date().date(), first_report_date)
+            factory_parameters = {**self._set_project_factory_parameters(project_type), "start_date": start_date}
+            # Stop date is compared with report dates before projects are reloaded from the database.
+            if factory_parameters["stop_date"] is not None:
+                factory_parameters["stop_date"] = factory_parameters["stop_date"].date()
+            projects_to_create += [
+                Project(**factory_parameters, name=fake.sentence(nb_words=3)) for _ in range(number_of_projects)
+            ]
+
+        logging.info(f"Creating {len(projects_to_create)} project(s)")
+        return Project.objects.bulk_create(projects_to_create, batch_size=self.BULK_BATCH_SIZE)
+
+    def bulk_create_task_activities(self, projects: List[Project]) -> None:
+        if not TaskActivityType.objects.exists():
+            call_command("loaddata", "task_activities", verbosity=0)
+
+        default_task_activities = list(TaskActivityType.objects.get_defaults())
+        other_task_activities = list(TaskActivityType.objects.filter(is_default=False))
+        project_task_activities = []
+        for project in projects:
+            task_activities = default_task_activities + random.sample(
+                other_task_activities, min(self.BULK_TASK_ACTIVITIES_PER_PROJECT, len(other_task_activities))
+            )
+            project_task_activities += [
+                TaskActivityType.projects.through(project_id=project.pk, taskactivitytype_id=task_activity.pk)
+                for task_activity in task_activities
+            ]
+
+        TaskActivityType.projects.through.objects.bulk_create(project_task_activities, batch_size=self.BULK_BATCH_SIZE)
+
+    def bulk_create_memberships(self, users: List[CustomUser], projects: List[Project]) -> Dict[int, List[Project]]:
+        """
+        Makes each created employee and manager a member of a few created projects, and each created manager
+        a manager of projects they are member of. Returns projects of each member.
+        """
+        memberships = {}  # type: Dict[int, List[Project]]
+        if not projects:
+            return memberships
+
+        members = []
+        managers = []
+        for user in users:
+            if user.user_type == CustomUser.UserType.ADMIN.name:
+                continue
+            memberships[user.pk] = random.sample(projects, min(self.BULK_PROJECTS_PER_USER, len(projects)))
+            for project in memberships[user.pk]:
+                members.append(Project.members.through(project_id=project.pk, customuser_id=user.pk))
+                if user.user_type == CustomUser.UserType.MANAGER.name:
+                    managers.append(Project.managers.through(project_id=project.pk, customuser_id=user.pk))
+
+        Project.members.through.objects.bulk_create(members, batch_size=self.BULK_BATCH_SIZE)
+        Project.managers.through.objects.bulk_create(managers, batch_size=self.BULK_BATCH_SIZE)
+        return memberships
+
+    def bulk_create_reports(self, memberships: Dict[int, List[Project]], first_report_date: datetime.date) -> None:
+        task_activities = {}  # type: Dict[int, List[int]]
+        for (project_id, task_activity_id) in TaskActivityType.projects.through.objects.filter(
+            project__in={project.pk for projects in memberships.values() for project in projects}
+        ).values_list("project", "taskactivitytype"):
+            task_activities.setdefault(project_id, []).append(task_activity_id)
+
+        reports = self._generate_reports(memberships, task_activities, first_report_date)
+        number_of_reports = 0
+        while True:
+            batch = list(islice(reports, self.BULK_BATCH_SIZE))
+            if not batch:
+                break
+            Report.objects.bulk_create(batch)
+            number_of_reports += len(batch)
+            logging.info(f"{number_of_reports} report(s) created")
+
+    def _generate_reports(
+        self,
+        memberships: Dict[int, List[Project]],
+        task_activities: Dict[int, List[int]],
+        first_report_date: datetime.date,
+    ) -> Iterator[Report]:
+        """
+        Yields reports for every working day since given date, split evenly between projects of their authors
+        which have not been stopped by that day.
+        """
+        work_hours = datetime.timedelta(hours=self.BULK_WORK_HOURS_PER_DAY) / self.number_of_reports_per_day
+        fake = Faker()
+        descriptions = [fake.sentence() for _ in range(100)]
+
+        for report_date in self._get_working_days(first_report_date, timezone.now().date()):
+            for (author_id, projects) in memberships.items():
+                ongoing_projects = [
+                    project for project in projects if project.stop_date is None or project.stop_date >= report_date
+                ]
+                if not ongoing_projects:
+                    continue
+                for report_number in range(self.number_of_reports_per_day):
+                    # Starting project changes every day, so each project gets reports also with one report per day.
+                    project = ongoing_projects[(report_date.toordinal() + report_number) % len(ongoing_projects)]
+                    yield Report(
+                        date=report_date,
+                        author_id=author_id,
+                        project_id=project.pk,
+                        task_activities_id=random.choice(task_activities[project.pk]),
+                        work_hours=work_hours,
+                        description=random.choice(descriptions),
+                    )
+
+    @staticmethod
+    def _get_working_days(first_day: datetime.date, last_day: datetime.date) -> Iterable[datetime.date]:
+        return (
+            first_day + datetime.timedelta(days=day)
+            for day in range((last_day - first_day).days + 1)
+            if (first_day + datetime.timedelta(days=day)).weekday() < 5
+        )
+
     def add_arguments(self, parser: Any) -> None:
         parser.add_argument(
             "-a",
@@ -227,3 +438,23 @@ class Command(BaseCommand):
             choices=[DataSize.SMALL.value, DataSize.MEDIUM.value, DataSize.LARGE.value, DataSize.EXTRA_LARGE.value],
             help="Use prepared data set of given size to generate test data",
         )
+        parser.add_argument(
+            "--bulk",
+            dest=BULK_PARAMETER,
+            action="store_true",
+            help="Create data with bulk queries, including project memberships, task activities and reports",
+        )
+        parser.add_argument(
+            "--report-months",
+            dest=REPORT_MONTHS_PARAMETER,
+            type=int,
+            help=f"Number of months, ending with the current one, to create reports for in bulk mode "
+            f"(default: {self.BULK_DEFAULT_REPORT_MONTHS})",
+        )
+        parser.add_argument(
+            "--reports-per-day",
+            dest=REPORTS_PER_DAY_PARAMETER,
+            type=int,
+            help=f"Number of reports created by each user per working day in bulk mode "
+            f"(default: {self.BULK_DEFAULT_REPORTS_PER_DAY})",
+        )
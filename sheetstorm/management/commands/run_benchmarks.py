@@ -0,0 +1,283 @@
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import connections
+from django.db import reset_queries
+from django.db.models import Count
+from django.http import HttpResponse
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from django.test.utils import setup_test_environment
+from django.test.utils import teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from employees.models import Report
+from managers.models import Project
+from sheetstorm.management.commands.constants import DATA_SIZE_PARAMETER
+from sheetstorm.management.commands.constants import DataSize
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+Measurements = Dict[str, Dict[str, Dict[str, float]]]
+
+
+@contextmanager
+def test_databases() -> Iterator[None]:
+    """
+    Runs benchmarks in separate test databases, so data of configured databases is never modified.
+    """
+    setup_test_environment()
+    test_runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = test_runner.setup_databases()
+    try:
+        yield
+    finally:
+        # Connections to test mirrors, e.g. read replica, would prevent dropping test databases.
+        connections.close_all()
+        test_runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed test database with generate_test_data presets, request main views and export endpoints "
+        "and compare query counts, wall time and peak memory with stored baseline."
+    )
+
+    DEFAULT_BASELINE_PATH = os.path.join(settings.BASE_DIR, "benchmark_baseline.json")
+    DEFAULT_REPEAT = 3
+    DEFAULT_QUERY_TOLERANCE = 0
+    DEFAULT_TIME_TOLERANCE = 0.5
+    DEFAULT_MEMORY_TOLERANCE = 0.25
+    # Differences below these values are treated as measurement noise, regardless of relative tolerance.
+    MINIMAL_TIME_DIFFERENCE = 0.01
+    MINIMAL_MEMORY_DIFFERENCE = 64 * 1024
+
+    QUERIES = "queries"
+    TIME = "time"
+    PEAK_MEMORY = "peak_memory"
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--data-size",
+            dest=DATA_SIZE_PARAMETER,
+            action="append",
+            metavar="size",
+            choices=[data_size.value for data_size in DataSize],
+            help="Benchmark given prepared data set. Can be used multiple times. Defaults to small data set",
+        )
+        parser.add_argument(
+            "--baseline", default=self.DEFAULT_BASELINE_PATH, help="Path of JSON file with baseline measurements"
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store results as new baseline instead of comparing them with existing one",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=self.DEFAULT_REPEAT,
+            help="Number of requests to each endpoint used to compute median wall time",
+        )
+        parser.add_argument(
+            "--query-tolerance",
+            type=int,
+            default=self.DEFAULT_QUERY_TOLERANCE,
+            help="Number of additional queries per request which is not treated as regression",
+        )
+        parser.add_argument(
+            "--time-tolerance",
+            type=float,
+            default=self.DEFAULT_TIME_TOLERANCE,
+            help="Relative increase of wall time which is not treated as regression",
+        )
+        parser.add_argument(
+            "--memory-tolerance",
+            type=float,
+            default=self.DEFAULT_MEMORY_TOLERANCE,
+            help="Relative increase of peak memory which is not treated as regression",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        data_sizes = options[DATA_SIZE_PARAMETER] or [DataSize.SMALL.value]
+        if options["repeat"] < 1:
+            raise CommandError("Number of repeats has to be positive")
+        if not options["update_baseline"] and not os.path.exists(options["baseline"]):
+            raise CommandError(
+                f"Baseline file {options['baseline']} does not exist, create it with --update-baseline option"
+            )
+
+        results = self.run_benchmarks(data_sizes, options["repeat"])
+        self.print_results(results)
+
+        if options["update_baseline"]:
+            self.save_baseline(options["baseline"], results)
+            return
+
+        with open(options["baseline"]) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = self.find_regressions(
+            baseline, results, options["query_tolerance"], options["time_tolerance"], options["memory_tolerance"]
+        )
+        if regressions:
+            raise CommandError("Performance regressions found:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No performance regressions found"))
+
+    def run_benchmarks(self, data_sizes: List[str], repeat: int) -> Measurements:
+        results = {}
+        with test_databases():
+            for data_size in data_sizes:
+                call_command("flush", interactive=False, verbosity=0)
+                call_command("generate_test_data", data_size=data_size, bulk=True)
+                logger.info(f"Running benchmarks for {data_size} data set")
+                results[data_size] = self.benchmark_endpoints(repeat)
+        return results
+
+    def benchmark_endpoints(self, repeat: int) -> Dict[str, Dict[str, float]]:
+        client = Client()
+        client.force_login(CustomUser.objects.filter(is_superuser=True).first())
+        return {name: self.benchmark_endpoint(client, url, repeat) for (name, url) in self.get_endpoints()}
+
+    @staticmethod
+    def get_endpoints() -> List[Tuple[str, str]]:
+        """
+        Returns names and URLs of benchmarked endpoints. Objects with the biggest number of reports are picked,
+        so views render as much data as seeded data set allows.
+        """
+        today = timezone.now().date()
+        month = {"year": today.year, "month": today.month}
+        project = Project.objects.annotate(reports_count=Count("report")).order_by("-reports_count", "pk").first()
+        author = CustomUser.objects.annotate(reports_count=Count("report")).order_by("-reports_count", "pk").first()
+        project_author_pk = Report.objects.filter(project=project).values_list("author", flat=True).first() or author.pk
+        project_author = {"pk": project.pk, "user_pk": project_author_pk, **month}
+
+        return [
+            ("home", reverse("home")),
+            ("custom-report-list", reverse("custom-report-list", kwargs=month)),
+            ("author-report-list", reverse("author-report-list", kwargs={"pk": author.pk, **month})),
+            ("project-report-list", reverse("project-report-list", kwargs={"pk": project.pk, **month})),
+            ("author-report-project-list", reverse("author-report-project-list", kwargs=project_author)),
+            ("custom-projects-list", reverse("custom-projects-list")),
+            ("custom-project-detail", reverse("custom-project-detail", kwargs={"pk": project.pk})),
+            ("custom-users-list", reverse("custom-users-list")),
+            ("custom-users-notifications", reverse("custom-users-notifications")),
+            ("export-data", reverse("export-data", kwargs={"pk": author.pk, **month})),
+            ("export-data-csv", reverse("export-data", kwargs={"pk": author.pk, **month}) + "?format=csv"),
+            ("export-project-reports", reverse("export-project-reports", kwargs={"pk": project.pk, **month})),
+            (
+                "export-project-reports-csv",
+                reverse("export-project-reports", kwargs={"pk": project.pk, **month}) + "?format=csv",
+            ),
+            ("export-project-author-reports", reverse("export-project-author-reports", kwargs=project_author)),
+        ]
+
+    def benchmark_endpoint(self, client: Client, url: str, repeat: int) -> Dict[str, float]:
+        timings = []
+        for _ in range(repeat):
+            # Log of queries is bounded, so queries executed while seeding data could hide captured ones.
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                self.request(client, url)
+                timings.append(time.perf_counter() - start)
+
+        # Memory is traced in separate request, because tracing slows down measured code considerably.
+        tracemalloc.start()
+        try:
+            self.request(client, url)
+            (_, peak_memory) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            self.QUERIES: len(queries.captured_queries),
+            self.TIME: round(statistics.median(timings), 4),
+            self.PEAK_MEMORY: peak_memory,
+        }
+
+    @staticmethod
+    def request(client: Client, url: str) -> HttpResponse:
+        # Cached exports would hide the cost of their generation.
+        for cache in caches.all():
+            cache.clear()
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"Benchmarked endpoint {url} returned status code {response.status_code}")
+        # Streamed responses are generated while being consumed.
+        response.getvalue()
+        return response
+
+    def find_regressions(
+        self,
+        baseline: Measurements,
+        results: Measurements,
+        query_tolerance: int,
+        time_tolerance: float,
+        memory_tolerance: float,
+    ) -> List[str]:
+        regressions = []
+        for (data_size, endpoints) in results.items():
+            for (endpoint, measurement) in endpoints.items():
+                expected = baseline.get(data_size, {}).get(endpoint)
+                if expected is None:
+                    logger.info(f"There is no baseline for {endpoint} endpoint with {data_size} data set")
+                    continue
+                limits = {
+                    self.QUERIES: expected[self.QUERIES] + query_tolerance,
+                    self.TIME: max(
+                        expected[self.TIME] * (1 + time_tolerance), expected[self.TIME] + self.MINIMAL_TIME_DIFFERENCE
+                    ),
+                    self.PEAK_MEMORY: max(
+                        expected[self.PEAK_MEMORY] * (1 + memory_tolerance),
+                        expected[self.PEAK_MEMORY] + self.MINIMAL_MEMORY_DIFFERENCE,
+                    ),
+                }
+                for (metric, limit) in limits.items():
+                    if measurement[metric] > limit:
+                        regressions.append(
+                            f"{data_size} {endpoint}: {metric} {measurement[metric]} exceeds baseline "
+                            f"{expected[metric]} beyond tolerance"
+                        )
+        return regressions
+
+    def print_results(self, results: Measurements) -> None:
+        for (data_size, endpoints) in results.items():
+            self.stdout.write(f"{data_size}:")
+            for (endpoint, measurement) in endpoints.items():
+                self.stdout.write(
+                    f"  {endpoint:<32} {measurement[self.QUERIES]:>5} queries "
+                    f"{measurement[self.TIME] * 1000:>9.1f} ms {measurement[self.PEAK_MEMORY] / 1024:>9.0f} KiB"
+                )
+
+    def save_baseline(self, path: str, results: Measurements) -> None:
+        """
+        Replaces baseline of benchmarked data sets, keeping baseline of other data sets untouched.
+        """
+        baseline = {}  # type: Measurements
+        if os.path.exists(path):
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+        baseline.update(results)
+        with open(path, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Baseline has been saved to {path}"))
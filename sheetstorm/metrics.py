@@ -0,0 +1,224 @@
+import atexit
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+# Name of metric, suffix of sample name, e.g. `_bucket` of histogram, and labels of the sample.
+SampleKey = Tuple[str, str, Labels]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLES_FILE_EXTENSION = ".json"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels: Labels) -> str:
+    if len(labels) == 0:
+        return ""
+    escaped_labels = (
+        (name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for (name, value) in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for (name, value) in escaped_labels) + "}"
+
+
+class Metric:
+    TYPE = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, label_names: Iterable[str]) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def get_labels(self, labels: Dict[str, str]) -> Labels:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} requires labels {', '.join(self.label_names)}")
+        return tuple((name, str(labels[name])) for name in self.label_names)
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self.registry.add_samples([((self.name, "", self.get_labels(labels)), amount)])
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        label_names: Iterable[str],
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: str) -> None:
+        sample_labels = self.get_labels(labels)
+        # Buckets are cumulative, so the value is counted in every bucket with upper bound not lower than the value.
+        self.registry.add_samples(
+            [
+                ((self.name, "_bucket", sample_labels + (("le", format_value(upper_bound)),)), 1)
+                for upper_bound in self.buckets
+                if value <= upper_bound
+            ]
+            + [((self.name, "_sum", sample_labels), value), ((self.name, "_count", sample_labels), 1)]
+        )
+
+
+class Gauge(Metric):
+    """
+    Metric which value is computed by given function when metrics are collected, e.g. length of queue
+    stored in database. It is not stored, so it is not summed up across processes.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, function: Callable[[], float]):
+        super().__init__(registry, name, documentation, ())
+        self.function = function
+
+
+class MetricsRegistry:
+    """
+    Keeps samples of counters and histograms recorded by the current process. If `METRICS_DIRECTORY` is set,
+    each process periodically writes its samples to a separate file in it and collected metrics are sums
+    of samples of all processes, e.g. all gunicorn workers and background workers.
+    """
+
+    def __init__(self) -> None:
+        self.metrics = {}  # type: Dict[str, Metric]
+        self._samples = defaultdict(float)  # type: Dict[SampleKey, float]
+        self._lock = threading.Lock()
+        self._last_flush_time = time.monotonic()
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(self, name, documentation, label_names))  # type: ignore
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(self, name, documentation, label_names, buckets))  # type: ignore
+
+    def gauge(self, name: str, documentation: str, function: Callable[[], float]) -> Gauge:
+        return self.register(Gauge(self, name, documentation, function))  # type: ignore
+
+    def add_samples(self, samples: List[Tuple[SampleKey, float]]) -> None:
+        with self._lock:
+            for (key, amount) in samples:
+                self._samples[key] += amount
+        if time.monotonic() - self._last_flush_time >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def get_samples_file_path(self) -> Optional[str]:
+        if settings.METRICS_DIRECTORY is None:
+            return None
+        return os.path.join(settings.METRICS_DIRECTORY, f"{os.getpid()}{SAMPLES_FILE_EXTENSION}")
+
+    def flush(self) -> None:
+        """
+        Replaces samples file of the current process, so other processes never read partially written one.
+        """
+        path = self.get_samples_file_path()
+        if path is None:
+            return
+        with self._lock:
+            samples = [[name, suffix, labels, value] for ((name, suffix, labels), value) in self._samples.items()]
+            self._last_flush_time = time.monotonic()
+
+        os.makedirs(settings.METRICS_DIRECTORY, exist_ok=True)
+        (file_descriptor, temporary_path) = tempfile.mkstemp(dir=settings.METRICS_DIRECTORY, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as samples_file:
+            json.dump(samples, samples_file)
+        os.replace(temporary_path, path)
+
+    def collect(self) -> Dict[SampleKey, float]:
+        if settings.METRICS_DIRECTORY is None:
+            with self._lock:
+                samples = dict(self._samples)
+        else:
+            self.flush()
+            samples = self.read_samples_files()
+
+        for metric in self.metrics.values():
+            if isinstance(metric, Gauge):
+                samples[(metric.name, "", ())] = metric.function()
+        return samples
+
+    @staticmethod
+    def read_samples_files() -> Dict[SampleKey, float]:
+        samples = defaultdict(float)  # type: Dict[SampleKey, float]
+        for file_name in os.listdir(settings.METRICS_DIRECTORY):
+            if not file_name.endswith(SAMPLES_FILE_EXTENSION):
+                continue
+            try:
+                with open(os.path.join(settings.METRICS_DIRECTORY, file_name)) as samples_file:
+                    process_samples = json.load(samples_file)
+            except (OSError, ValueError):
+                logger.warning(f"Metrics file {file_name} could not be read")
+                continue
+            for (name, suffix, labels, value) in process_samples:
+                samples[(name, suffix, tuple(tuple(label) for label in labels))] += value
+        return samples
+
+    def render(self) -> str:
+        """
+        Returns collected metrics in Prometheus text exposition format.
+        """
+        samples_by_metric = defaultdict(list)  # type: Dict[str, List[Tuple[SampleKey, float]]]
+        for (key, value) in self.collect().items():
+            samples_by_metric[key[0]].append((key, value))
+
+        lines = []
+        for metric in sorted(self.metrics.values(), key=lambda metric: metric.name):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            for ((name, suffix, labels), value) in sorted(samples_by_metric[metric.name], key=self.get_sort_key):
+                lines.append(f"{name}{suffix}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def get_sort_key(sample: Tuple[SampleKey, float]) -> tuple:
+        # Buckets of histogram are ordered by their upper bounds, followed by sum and count.
+        ((_, suffix, labels), _) = sample
+        other_labels = tuple(label for label in labels if label[0] != "le")
+        upper_bounds = [float(value) for (name, value) in labels if name == "le"]
+        return (other_labels, suffix != "_bucket", upper_bounds, suffix)
+
+
+registry = MetricsRegistry()
+
+# Samples recorded since the last periodic flush would be lost when process exits.
+atexit.register(registry.flush)
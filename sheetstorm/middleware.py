@@ -0,0 +1,222 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.views import View
+
+from sheetstorm.db_connections import get_connection_stats
+from sheetstorm.db_routers import SAFE_METHODS
+from sheetstorm.db_routers import get_read_replica_alias
+from sheetstorm.db_routers import route_reads_to_replica
+from sheetstorm.db_routers import stream_with_reads_routed_to_replica
+from sheetstorm.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Lists of parameters, e.g. in `IN (%s, %s, %s)` clauses, which differ in length between otherwise the same queries.
+REPEATED_PLACEHOLDERS_PATTERN = re.compile(r"%s(?:\s*,\s*%s)+")
+SQL_LOG_MAX_LENGTH = 1000
+# Label of requests not matching any URL pattern, so metrics are not labeled with arbitrary paths.
+UNRESOLVED_VIEW_NAME = "<unresolved>"
+OTHER_METHOD_NAME = "OTHER"
+
+REQUEST_DURATION = registry.histogram(
+    "sheetstorm_request_duration_seconds",
+    "Time of handling requests, including rendering templates",
+    ["view", "method"],
+)
+REQUEST_DB_QUERIES = registry.counter(
+    "sheetstorm_request_db_queries_total", "Number of database queries executed by requests", ["view", "method"]
+)
+
+
+def get_query_shape(sql: str) -> str:
+    """
+    Returns SQL with parameter lists collapsed, so queries differing only in parameters have the same shape.
+    """
+    return REPEATED_PLACEHOLDERS_PATTERN.sub("%s...", sql)
+
+
+class RequestProfile:
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.queries = []  # type: List[Tuple[str, float]]
+        self.template_time = 0.0
+        self._template_render_start = None  # type: Any
+        self._connection_stats_at_start = get_connection_stats().copy()
+
+    @property
+    def db_time(self) -> float:
+        return sum(duration for (_, duration) in self.queries)
+
+    @property
+    def opened_connections(self) -> int:
+        return get_connection_stats().opened - self._connection_stats_at_start.opened
+
+    def record_query(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    def start_template_rendering(self, response: SimpleTemplateResponse) -> None:
+        self._template_render_start = time.perf_counter()
+        response.add_post_render_callback(self.finish_template_rendering)
+
+    def finish_template_rendering(self, response: SimpleTemplateResponse) -> None:  # pylint: disable=unused-argument
+        self.template_time += time.perf_counter() - self._template_render_start
+
+    def get_repeated_query_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        return [
+            (shape, count)
+            for (shape, count) in Counter(get_query_shape(sql) for (sql, _) in self.queries).most_common()
+            if count > threshold
+        ]
+
+
+class ProfilingMiddleware:
+    """
+    Measures number and time of database queries, template rendering time and total time of each request.
+    Timings are sent in `Server-Timing` header. Slow requests, slow queries and queries repeated many times
+    in a single request, which usually are N+1 problems, are logged. Enabled by `PROFILING_ENABLED` setting.
+    Number of database connections opened by the request shows whether it paid for connection setup
+    or reused persistent connection.
+
+    Template rendering time is measured only for template responses, which are rendered after the view returns.
+    Time of generating streamed responses is not measured.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        profile = RequestProfile()
+        request.profile = profile
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.record_query))
+            response = self.get_response(request)
+        total_time = time.perf_counter() - profile.start
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={profile.db_time * 1000:.1f};desc="{len(profile.queries)} queries"',
+                f"tpl;dur={profile.template_time * 1000:.1f}",
+                f'conn;desc="{profile.opened_connections} opened"',
+                f"total;dur={total_time * 1000:.1f}",
+            ]
+        )
+        self.log_profile(request, profile, total_time)
+        return response
+
+    def process_template_response(self, request: HttpRequest, response: SimpleTemplateResponse) -> Any:
+        # Template responses are rendered right after all middlewares process them.
+        request.profile.start_template_rendering(response)
+        return response
+
+    @staticmethod
+    def log_profile(request: HttpRequest, profile: RequestProfile, total_time: float) -> None:
+        view_name = getattr(request.resolver_match, "view_name", None) or request.path
+        if total_time >= settings.PROFILING_SLOW_REQUEST_THRESHOLD:
+            stats = get_connection_stats()
+            logger.warning(
+                f"Slow request {request.method} {request.path} ({view_name}): {total_time * 1000:.1f} ms total, "
+                f"{len(profile.queries)} queries in {profile.db_time * 1000:.1f} ms, "
+                f"templates rendered in {profile.template_time * 1000:.1f} ms, "
+                f"{profile.opened_connections} database connections opened "
+                f"(worker totals: {stats.opened} opened, {stats.reused} reused, "
+                f"{stats.closed_unusable} closed by health checks)"
+            )
+        for (sql, duration) in profile.queries:
+            if duration >= settings.PROFILING_SLOW_QUERY_THRESHOLD:
+                logger.warning(f"Slow query in {view_name}: {duration * 1000:.1f} ms {sql[:SQL_LOG_MAX_LENGTH]}")
+        for (shape, count) in profile.get_repeated_query_shapes(settings.PROFILING_REPEATED_QUERY_THRESHOLD):
+            logger.warning(
+                f"Possible N+1 problem in {view_name}: query repeated {count} times {shape[:SQL_LOG_MAX_LENGTH]}"
+            )
+
+
+class ReadReplicaMiddleware:
+    """
+    Routes reads of safe-method requests to read replica configured by `READ_REPLICA_DATABASE` setting.
+    After unsafe request the client is sticky to primary database for `READ_REPLICA_STICKINESS` seconds,
+    so it reads its own writes even if replica lags behind.
+
+    Reads of views wrapped in transaction by `ATOMIC_REQUESTS` stay on primary database, so only views
+    decorated with `non_atomic_safe_requests` use the replica.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if get_read_replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            response.set_cookie(
+                settings.READ_REPLICA_STICKINESS_COOKIE_NAME,
+                "1",
+                max_age=settings.READ_REPLICA_STICKINESS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+            return response
+
+        if settings.READ_REPLICA_STICKINESS_COOKIE_NAME in request.COOKIES:
+            return self.get_response(request)
+
+        with route_reads_to_replica():
+            response = self.get_response(request)
+        # Files are streamed without querying database, so they are not wrapped to keep `wsgi.file_wrapper` usable.
+        if response.streaming and not isinstance(response, FileResponse):
+            response.streaming_content = stream_with_reads_routed_to_replica(response.streaming_content)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Records time of handling requests and number of database queries executed by them, labeled with name
+    of the view and HTTP method.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        queries_count = 0
+
+        def count_query(execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+            nonlocal queries_count
+            queries_count += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view_name = getattr(request.resolver_match, "view_name", None) or UNRESOLVED_VIEW_NAME
+        method = request.method if request.method.lower() in View.http_method_names else OTHER_METHOD_NAME
+        REQUEST_DURATION.observe(duration, view=view_name, method=method)
+        REQUEST_DB_QUERIES.inc(queries_count, view=view_name, method=method)
+        return response
@@ -11,6 +11,9 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 """
 
 import os
+from typing import Any
+from typing import Dict
+from typing import Optional
 
 from django.urls import reverse_lazy
 
@@ -51,7 +54,6 @@ INSTALLED_APPS = [
     'crispy_forms',
     'raven.contrib.django.raven_compat',
     'django_select2',
-    'staticinline.apps.StaticInlineAppConfig',
     # SheetStorm
     'managers.apps.ManagersConfig',
     'employees.apps.EmployeesConfig',
@@ -59,6 +61,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Unused unless PROFILING_ENABLED is set. It is the first one, so time of all other middlewares is measured too.
+    'sheetstorm.middleware.ProfilingMiddleware',
+    # Unused unless READ_REPLICA_DATABASE is configured. It precedes middlewares which read sessions and users.
+    'sheetstorm.middleware.ReadReplicaMiddleware',
+    'sheetstorm.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -97,6 +104,9 @@ DATABASES = {
         'ENGINE':           'django.db.backends.postgresql',
         'NAME':             'sheetstorm',
         'ATOMIC_REQUESTS':  True,
+        # Number of seconds for which connection is kept open and reused by subsequent requests handled by the same
+        # worker. 0 closes connection at the end of each request, None keeps it open indefinitely.
+        'CONN_MAX_AGE':     60,
         # 'USER':     'postgres',
         # 'PASSWORD': '',
         # 'HOST':     '',
@@ -104,6 +114,22 @@ DATABASES = {
     }
 }
 
+# Persistent connections are checked at the start of each request and replaced if they stopped working.
+DATABASE_CONNECTION_HEALTH_CHECKS = True
+
+DATABASE_ROUTERS = ['sheetstorm.db_routers.ReadReplicaRouter']
+
+# Alias of database to which reads of safe-method requests are routed. It is used only if it is configured
+# in DATABASES, e.g. `DATABASES['replica'] = {**DATABASES['default'], 'ATOMIC_REQUESTS': False, 'HOST': ...}`.
+# Locally it can point to the same database as 'default'.
+READ_REPLICA_DATABASE = 'replica'
+
+# Number of seconds after unsafe request during which reads of the same client are sent to primary database,
+# so the client sees its own changes regardless of replication lag.
+READ_REPLICA_STICKINESS = 10
+
+READ_REPLICA_STICKINESS_COOKIE_NAME = 'use_primary_database'
+
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 
@@ -235,6 +261,42 @@ LOGGING = {
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 STATIC_URL = '/static/'
 
+CACHES = {  # type: Dict[str, Dict[str, Any]]
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Generated export files. Entries are keyed on a version stamp of exported reports so they never need
+    # to be invalidated explicitly, they just stop being used.
+    'exports': {
+        'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'exports',
+        'TIMEOUT':  24 * 60 * 60,
+    },
+    # Widgets of AJAX-backed select fields, looked up by the autocomplete view serving their options.
+    'select2': {
+        'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'select2',
+        'TIMEOUT':  24 * 60 * 60,
+    },
+    # Version of task activities of projects. Activities themselves are cached by each process.
+    'task_activities': {
+        'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'task_activities',
+    },
+    # Rendered tables of reports of a month. Like exports, they are keyed on a version stamp of displayed reports,
+    # so stale entries are never read and are evicted when the number of entries exceeds MAX_ENTRIES.
+    'template_fragments': {
+        'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'OPTIONS':  {'MAX_ENTRIES': 1000},
+    },
+}
+
+SELECT2_CACHE_BACKEND = 'select2'
+
+# Files generated by the application, e.g. results of background exports. They are not served directly.
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
 AUTH_USER_MODEL = 'users.CustomUser'
 LOGIN_URL = reverse_lazy("login")
 LOGIN_REDIRECT_URL = 'home'
@@ -276,5 +338,22 @@ CRISPY_TEMPLATE_PACK = 'bootstrap4'
 # List of valid email domains which are allowed in SheetStorm
 VALID_EMAIL_DOMAIN_LIST: list = []
 
+# Request profiling: Server-Timing header and logs of slow requests, slow queries and repeated queries (N+1)
+PROFILING_ENABLED = False
+# Thresholds in seconds
+PROFILING_SLOW_REQUEST_THRESHOLD = 1.0
+PROFILING_SLOW_QUERY_THRESHOLD = 0.1
+# Number of executions of the same query in a single request, above which it is logged as possible N+1 problem
+PROFILING_REPEATED_QUERY_THRESHOLD = 10
+
+# Metrics of requests, exports and emails exposed for Prometheus at metrics endpoint, available to admins.
+# If directory is set, each process stores its metrics there, so they are summed up across all workers.
+METRICS_DIRECTORY = None  # type: Optional[str]
+# Number of seconds between writes of metrics of a process to METRICS_DIRECTORY
+METRICS_FLUSH_INTERVAL = 5
+
+# List of public holidays in ISO format (YYYY-MM-DD), which are not counted as days without report
+HOLIDAYS: list = []
+
 # Boolean value enabling user signup verification via email
 EMAIL_SIGNUP_VERIFICATION = True
@@ -13,3 +13,16 @@ VALID_EMAIL_DOMAIN_LIST = ["codepoets.it"]
 CSRF_COOKIE_SECURE = True
 
 SESSION_COOKIE_SECURE = True
+
+# Share cached exports, select widgets, version of task activities and rendered report tables between all
+# gunicorn workers.
+for cache_alias in ["exports", "select2", "task_activities", "template_fragments"]:
+    CACHES[cache_alias]["BACKEND"] = "django.core.cache.backends.filebased.FileBasedCache"
+    CACHES[cache_alias]["LOCATION"] = os.path.join(BASE_DIR, "cache", cache_alias)
+
+# Directory is cleared when web service is started, so metrics of no longer running processes are not kept forever.
+METRICS_DIRECTORY = os.path.join(BASE_DIR, "metrics")
+
+# `collectstatic` fingerprints file names and stores them together with Subresource Integrity values in manifest,
+# so collected files can be cached by browsers forever.
+STATICFILES_STORAGE = 'sheetstorm.storage.IntegrityManifestStaticFilesStorage'
@@ -0,0 +1,46 @@
+import base64
+import hashlib
+import json
+from typing import BinaryIO
+from typing import Dict
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+INTEGRITY_HASH_ALGORITHM = "sha384"
+
+
+def get_file_integrity(file: BinaryIO) -> str:
+    """
+    Returns Subresource Integrity value of given file, used in `integrity` attribute of `<link>` and `<script>` tags.
+    """
+    digest = hashlib.new(INTEGRITY_HASH_ALGORITHM, file.read()).digest()
+    return f"{INTEGRITY_HASH_ALGORITHM}-{base64.b64encode(digest).decode()}"
+
+
+class IntegrityManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Besides fingerprinted file names, `collectstatic` stores in the manifest Subresource Integrity values
+    of collected files, so they are read once per process instead of hashing files while rendering pages.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:  # type: ignore
+        super().__init__(*args, **kwargs)
+        self.integrity = self.load_integrity()
+
+    def load_integrity(self) -> Dict[str, str]:
+        content = self.read_manifest()
+        if content is None:
+            return {}
+        return json.loads(content).get("integrity", {})
+
+    def save_manifest(self) -> None:
+        self.integrity = {}
+        for (name, hashed_name) in self.hashed_files.items():
+            with self.open(hashed_name) as static_file:
+                self.integrity[name] = get_file_integrity(static_file)
+
+        payload = {"paths": self.hashed_files, "integrity": self.integrity, "version": self.manifest_version}
+        if self.exists(self.manifest_name):
+            self.delete(self.manifest_name)
+        self._save(self.manifest_name, ContentFile(json.dumps(payload).encode()))
@@ -0,0 +1,36 @@
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+from sheetstorm.storage import get_file_integrity
+
+register = template.Library()
+
+
+@register.simple_tag
+def static_integrity(path: str) -> str:
+    """
+    Returns Subresource Integrity value of given static file stored in the manifest by `collectstatic`.
+    Without manifest storage, e.g. in development, the value is computed from the file found by staticfiles finders.
+    """
+    integrity = getattr(staticfiles_storage, "integrity", None)
+    if integrity is not None:
+        if path not in integrity:
+            raise ValueError(f"Missing integrity manifest entry for '{path}'")
+        return integrity[path]
+    if settings.DEBUG:
+        # Static files are edited during development, so their integrity cannot be cached.
+        return compute_static_file_integrity.__wrapped__(path)
+    return compute_static_file_integrity(path)
+
+
+@lru_cache(maxsize=None)
+def compute_static_file_integrity(path: str) -> str:
+    file_path = finders.find(path)
+    if file_path is None:
+        raise ValueError(f"Static file '{path}' could not be found")
+    with open(file_path, "rb") as static_file:
+        return get_file_integrity(static_file)
@@ -1,10 +1,17 @@
 from django.core import management
 from django.core.management.base import CommandError
+from django.db.models import Count
 from django.test import TestCase
 from parameterized import parameterized
 
+from employees.models import DailyWorkHours
+from employees.models import Report
+from employees.models import TaskActivityType
 from managers.models import Project
+from sheetstorm.management.commands.constants import BULK_PARAMETER
 from sheetstorm.management.commands.constants import DATA_SIZE_PARAMETER
+from sheetstorm.management.commands.constants import REPORT_MONTHS_PARAMETER
+from sheetstorm.management.commands.constants import REPORTS_PER_DAY_PARAMETER
 from sheetstorm.management.commands.constants import SMALL_SET
 from sheetstorm.management.commands.constants import SUPERUSER_USER_TYPE
 from sheetstorm.management.commands.constants import DataSize
@@ -298,3 +305,86 @@ class CreateDataFromPreparedSetTests(TestCase):
         self.assertEqual(Project.objects.filter_active().count(), SMALL_SET[ProjectType.ACTIVE.name])
         self.assertEqual(Project.objects.filter_suspended().count(), SMALL_SET[ProjectType.SUSPENDED.name])
         self.assertEqual(Project.objects.filter_completed().count(), SMALL_SET[ProjectType.COMPLETED.name])
+
+
+class CreateDataInBulkTests(TestCase):
+    def setUp(self):
+        self.options = {
+            BULK_PARAMETER: True,
+            CustomUser.UserType.EMPLOYEE.name: 3,
+            CustomUser.UserType.MANAGER.name: 1,
+            SUPERUSER_USER_TYPE: True,
+            ProjectType.ACTIVE.name: 2,
+            ProjectType.COMPLETED.name: 1,
+            REPORT_MONTHS_PARAMETER: 2,
+            REPORTS_PER_DAY_PARAMETER: 2,
+        }
+
+    def test_that_command_should_create_specified_number_of_users_and_projects_in_bulk(self):
+        management.call_command("generate_test_data", **self.options)
+
+        self.assertEqual(CustomUser.objects.filter(user_type=CustomUser.UserType.EMPLOYEE.name).count(), 3)
+        self.assertEqual(CustomUser.objects.filter(user_type=CustomUser.UserType.MANAGER.name).count(), 1)
+        self.assertEqual(CustomUser.objects.filter(is_superuser=True).count(), 1)
+        self.assertEqual(Project.objects.filter_active().count(), 2)
+        self.assertEqual(Project.objects.filter_completed().count(), 1)
+
+    def test_that_users_created_in_bulk_should_be_able_to_log_in(self):
+        management.call_command("generate_test_data", **self.options)
+
+        user = CustomUser.objects.get(email="user.employee1@codepoets.it")
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.check_password("password"))
+
+    def test_that_command_should_add_members_managers_and_default_task_activities_to_projects(self):
+        management.call_command("generate_test_data", **self.options)
+
+        for user in CustomUser.objects.exclude(user_type=CustomUser.UserType.ADMIN.name):
+            self.assertTrue(user.projects.exists())
+        self.assertTrue(CustomUser.objects.get(user_type=CustomUser.UserType.MANAGER.name).manager_projects.exists())
+        for project in Project.objects.all():
+            self.assertTrue(
+                set(TaskActivityType.objects.get_defaults()).issubset(set(project.project_activities.all()))
+            )
+
+    def test_that_command_should_create_specified_number_of_reports_per_user_per_working_day(self):
+        management.call_command("generate_test_data", **self.options)
+
+        reports_per_author_and_date = Report.objects.values("author", "date").annotate(count=Count("pk"))
+        self.assertTrue(reports_per_author_and_date.exists())
+        self.assertEqual({row["count"] for row in reports_per_author_and_date}, {2})
+        self.assertFalse(Report.objects.filter(date__week_day__in=[1, 7]).exists())
+        for report in Report.objects.select_related("project", "task_activities"):
+            self.assertIn(report.task_activities, report.project.project_activities.all())
+
+    def test_that_reports_should_be_created_in_every_project_of_author_only_until_its_stop_date(self):
+        management.call_command("generate_test_data", **{**self.options, REPORTS_PER_DAY_PARAMETER: 1})
+
+        for project in Project.objects.prefetch_related("members"):
+            for member in project.members.all():
+                self.assertTrue(Report.objects.filter(author=member, project=project).exists())
+            if project.stop_date is not None:
+                self.assertFalse(Report.objects.filter(project=project, date__gt=project.stop_date).exists())
+
+    def test_that_command_should_rebuild_daily_work_hours_of_created_reports(self):
+        management.call_command("generate_test_data", **self.options)
+
+        self.assertEqual(
+            DailyWorkHours.objects.get_work_hours_sum_for_all_authors(),
+            Report.objects.get_work_hours_sum_for_all_authors(),
+        )
+
+    def test_that_command_should_not_duplicate_users_and_projects_when_called_again(self):
+        management.call_command("generate_test_data", **self.options)
+
+        management.call_command("generate_test_data", **self.options)
+
+        self.assertEqual(CustomUser.objects.count(), 5)
+        self.assertEqual(Project.objects.count(), 3)
+
+    @parameterized.expand([(REPORT_MONTHS_PARAMETER, 0), (REPORT_MONTHS_PARAMETER, -1), (REPORTS_PER_DAY_PARAMETER, 0)])
+    def test_that_command_should_reject_not_positive_number_of_report_months_and_reports_per_day(self, option, value):
+        with self.assertRaises(CommandError):
+            management.call_command("generate_test_data", **{**self.options, option: value})
+
+        self.assertFalse(CustomUser.objects.exists())
@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.core.signals import request_started
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test import override_settings
+
+from sheetstorm.db_connections import get_connection_stats
+
+
+class PersistentConnectionsTests(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        connection.ensure_connection()
+        self.stats_at_start = get_connection_stats().copy()
+
+    def test_opened_connections_should_be_counted(self):
+        connection.close()
+        connection.ensure_connection()
+
+        self.assertEqual((get_connection_stats() - self.stats_at_start).opened, 1)
+
+    def test_usable_connection_should_be_reused_by_next_request(self):
+        request_started.send(sender=self.__class__)
+
+        self.assertIsNotNone(connection.connection)
+        self.assertEqual((get_connection_stats() - self.stats_at_start).reused, 1)
+
+    def test_unusable_connection_should_be_closed_at_start_of_request(self):
+        with mock.patch.object(connection, "is_usable", return_value=False):
+            with self.assertLogs("sheetstorm.db_connections", "WARNING"):
+                request_started.send(sender=self.__class__)
+
+        self.assertIsNone(connection.connection)
+        stats = get_connection_stats() - self.stats_at_start
+        self.assertEqual((stats.closed_unusable, stats.reused), (1, 0))
+
+    @override_settings(DATABASE_CONNECTION_HEALTH_CHECKS=False)
+    def test_connection_should_not_be_checked_if_health_checks_are_disabled(self):
+        with mock.patch.object(connection, "is_usable", return_value=False) as is_usable:
+            request_started.send(sender=self.__class__)
+
+        is_usable.assert_not_called()
+        self.assertIsNotNone(connection.connection)
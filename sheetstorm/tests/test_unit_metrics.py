@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from sheetstorm.metrics import MetricsRegistry
+from users.factories import AdminUserFactory
+from users.factories import UserFactory
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.counter = self.registry.counter("test_requests_total", "Number of requests", ["view"])
+        self.histogram = self.registry.histogram("test_duration_seconds", "Duration", buckets=(0.1, 1.0))
+
+    def test_counter_should_be_rendered_in_text_exposition_format(self):
+        self.counter.inc(view="home")
+        self.counter.inc(2, view="home")
+
+        self.assertEqual(
+            self.registry.render().splitlines()[-3:],
+            [
+                "# HELP test_requests_total Number of requests",
+                "# TYPE test_requests_total counter",
+                'test_requests_total{view="home"} 3',
+            ],
+        )
+
+    def test_histogram_should_count_value_in_all_buckets_with_greater_upper_bound(self):
+        self.histogram.observe(0.5)
+        self.histogram.observe(0.05)
+
+        self.assertEqual(
+            self.registry.render().splitlines()[2:7],
+            [
+                'test_duration_seconds_bucket{le="0.1"} 1',
+                'test_duration_seconds_bucket{le="1"} 2',
+                'test_duration_seconds_bucket{le="+Inf"} 2',
+                "test_duration_seconds_count 2",
+                "test_duration_seconds_sum 0.55",
+            ],
+        )
+
+    def test_label_values_should_be_escaped(self):
+        self.counter.inc(view='a"b\\c')
+
+        self.assertIn('test_requests_total{view="a\\"b\\\\c"} 1', self.registry.render())
+
+    def test_metric_should_require_all_its_labels(self):
+        with self.assertRaises(ValueError):
+            self.counter.inc()
+
+    def test_metric_should_not_be_registered_twice(self):
+        with self.assertRaises(ValueError):
+            self.registry.counter("test_requests_total", "Number of requests")
+
+    def test_gauge_should_be_computed_when_metrics_are_collected(self):
+        self.registry.gauge("test_queue_length", "Length of queue", lambda: 7)
+
+        self.assertIn("test_queue_length 7", self.registry.render())
+
+    def test_samples_of_all_processes_should_be_summed_up_if_metrics_directory_is_set(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "1.json"), "w") as samples_file:
+                json.dump([["test_requests_total", "", [["view", "home"]], 5]], samples_file)
+
+            with override_settings(METRICS_DIRECTORY=directory):
+                self.counter.inc(view="home")
+                rendered_metrics = self.registry.render()
+
+            self.assertTrue(os.path.exists(os.path.join(directory, f"{os.getpid()}.json")))
+        self.assertIn('test_requests_total{view="home"} 6', rendered_metrics)
+
+
+class MetricsViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse("metrics")
+
+    def test_admin_should_get_metrics_of_handled_requests(self):
+        self.client.force_login(AdminUserFactory())
+        self.client.get(reverse("home"))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertContains(response, 'sheetstorm_request_duration_seconds_count{view="home",method="GET"}')
+        self.assertContains(response, 'sheetstorm_request_db_queries_total{view="home",method="GET"}')
+        self.assertContains(response, "sheetstorm_export_jobs_pending 0")
+        self.assertContains(response, "sheetstorm_emails_pending 0")
+
+    def test_metrics_should_not_be_available_to_other_users(self):
+        self.client.force_login(UserFactory())
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_unresolved_requests_should_not_be_labeled_with_their_paths(self):
+        self.client.force_login(AdminUserFactory())
+        self.client.get("/not-existing-page/")
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'view="<unresolved>"')
+        self.assertNotContains(response, "not-existing-page")
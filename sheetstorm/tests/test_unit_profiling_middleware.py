@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from sheetstorm.middleware import get_query_shape
+from users.factories import AdminUserFactory
+from users.factories import UserFactory
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = AdminUserFactory()
+        self.client.force_login(self.user)
+
+    def test_response_should_contain_server_timing_header(self):
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, conn;desc="\d+ opened", total;dur=[\d.]+$',
+        )
+
+    @override_settings(PROFILING_SLOW_REQUEST_THRESHOLD=0)
+    def test_slow_request_should_be_logged_with_view_name(self):
+        with self.assertLogs("sheetstorm.middleware", "WARNING") as logs:
+            self.client.get(reverse("home"))
+
+        self.assertIn("Slow request GET / (home)", logs.output[0])
+
+    @override_settings(PROFILING_SLOW_QUERY_THRESHOLD=0)
+    def test_slow_queries_should_be_logged(self):
+        with self.assertLogs("sheetstorm.middleware", "WARNING") as logs:
+            self.client.get(reverse("home"))
+
+        self.assertTrue(any("Slow query in home" in message for message in logs.output))
+
+    @override_settings(PROFILING_REPEATED_QUERY_THRESHOLD=2)
+    def test_query_repeated_more_times_than_threshold_should_be_logged_as_possible_n_plus_one_problem(self):
+        UserFactory.create_batch(3)
+
+        with self.assertLogs("sheetstorm.middleware", "WARNING") as logs:
+            self.client.get(reverse("custom-users-list"))
+
+        self.assertTrue(any("Possible N+1 problem in custom-users-list" in message for message in logs.output))
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_profiling_should_not_add_server_timing_header(self):
+        response = self.client.get(reverse("home"))
+
+        self.assertNotIn("Server-Timing", response)
+
+
+class GetQueryShapeTests(SimpleTestCase):
+    def test_queries_differing_only_in_number_of_parameters_should_have_the_same_shape(self):
+        self.assertEqual(
+            get_query_shape('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            get_query_shape('SELECT * FROM "t" WHERE "id" IN (%s, %s)'),
+        )
@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connection
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from parameterized import parameterized
+
+from employees.models import Report
+from sheetstorm.db_routers import ReadReplicaRouter
+from sheetstorm.db_routers import route_reads_to_replica
+from sheetstorm.middleware import ReadReplicaMiddleware
+from utils.decorators import non_atomic_safe_requests
+
+REPLICA_DATABASES = {
+    **settings.DATABASES,
+    "replica": {**settings.DATABASES[DEFAULT_DB_ALIAS], "ATOMIC_REQUESTS": False},
+}
+
+
+@override_settings(DATABASES=REPLICA_DATABASES, READ_REPLICA_DATABASE="replica")
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+
+    def test_reads_should_be_routed_to_replica_only_inside_routing_block(self):
+        with route_reads_to_replica():
+            self.assertEqual(self.router.db_for_read(Report), "replica")
+        self.assertEqual(self.router.db_for_read(Report), DEFAULT_DB_ALIAS)
+
+    def test_reads_after_write_should_be_routed_to_primary_database(self):
+        with route_reads_to_replica():
+            self.assertEqual(self.router.db_for_write(Report), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(Report), DEFAULT_DB_ALIAS)
+
+    def test_written_state_should_be_reset_by_next_routing_block(self):
+        with route_reads_to_replica():
+            self.router.db_for_write(Report)
+        with route_reads_to_replica():
+            self.assertEqual(self.router.db_for_read(Report), "replica")
+
+    @override_settings(READ_REPLICA_DATABASE="not-configured")
+    def test_reads_should_be_routed_to_primary_database_if_replica_is_not_configured(self):
+        with route_reads_to_replica():
+            self.assertEqual(self.router.db_for_read(Report), DEFAULT_DB_ALIAS)
+
+    def test_migrations_should_not_be_applied_to_replica(self):
+        self.assertFalse(self.router.allow_migrate("replica", "employees"))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, "employees"))
+
+
+@override_settings(DATABASES=REPLICA_DATABASES, READ_REPLICA_DATABASE="replica")
+class ReadReplicaRouterTransactionTests(TestCase):
+    def test_reads_inside_transaction_on_primary_database_should_not_be_routed_to_replica(self):
+        with route_reads_to_replica():
+            self.assertEqual(ReadReplicaRouter().db_for_read(Report), DEFAULT_DB_ALIAS)
+
+
+@override_settings(DATABASES=REPLICA_DATABASES, READ_REPLICA_DATABASE="replica")
+class ReadReplicaMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.read_databases = []
+
+    def get_response(self, request):  # pylint: disable=unused-argument
+        self.read_databases.append(ReadReplicaRouter().db_for_read(Report))
+        return HttpResponse()
+
+    def get_streaming_response(self, request):  # pylint: disable=unused-argument
+        def content():
+            self.read_databases.append(ReadReplicaRouter().db_for_read(Report))
+            yield b""
+
+        return StreamingHttpResponse(content())
+
+    def test_reads_of_safe_request_should_be_routed_to_replica(self):
+        ReadReplicaMiddleware(self.get_response)(self.factory.get("/"))
+
+        self.assertEqual(self.read_databases, ["replica"])
+
+    def test_reads_of_streamed_response_should_be_routed_to_replica(self):
+        response = ReadReplicaMiddleware(self.get_streaming_response)(self.factory.get("/"))
+        b"".join(response.streaming_content)
+
+        self.assertEqual(self.read_databases, ["replica"])
+
+    @parameterized.expand(["post", "put", "patch", "delete"])
+    def test_unsafe_request_should_read_from_primary_database_and_make_client_sticky(self, method):
+        response = ReadReplicaMiddleware(self.get_response)(getattr(self.factory, method)("/"))
+
+        self.assertEqual(self.read_databases, [DEFAULT_DB_ALIAS])
+        cookie = response.cookies[settings.READ_REPLICA_STICKINESS_COOKIE_NAME]
+        self.assertEqual(cookie["max-age"], settings.READ_REPLICA_STICKINESS)
+
+    def test_reads_of_sticky_client_should_be_routed_to_primary_database(self):
+        request = self.factory.get("/")
+        request.COOKIES[settings.READ_REPLICA_STICKINESS_COOKIE_NAME] = "1"
+
+        response = ReadReplicaMiddleware(self.get_response)(request)
+
+        self.assertEqual(self.read_databases, [DEFAULT_DB_ALIAS])
+        self.assertNotIn(settings.READ_REPLICA_STICKINESS_COOKIE_NAME, response.cookies)
+
+
+class NonAtomicSafeRequestsTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.savepoints_count = None
+
+        @non_atomic_safe_requests
+        def view(request):  # pylint: disable=unused-argument
+            self.savepoints_count = len(connection.savepoint_ids)
+            return HttpResponse()
+
+        self.view = view
+
+    def test_view_should_be_excluded_from_atomic_requests(self):
+        self.assertIn(DEFAULT_DB_ALIAS, self.view._non_atomic_requests)  # pylint: disable=protected-access
+
+    def test_safe_request_should_not_be_executed_in_transaction(self):
+        savepoints_count = len(connection.savepoint_ids)
+
+        self.view(self.factory.get("/"))
+
+        self.assertEqual(self.savepoints_count, savepoints_count)
+
+    def test_unsafe_request_should_be_executed_in_transaction(self):
+        savepoints_count = len(connection.savepoint_ids)
+
+        self.view(self.factory.post("/"))
+
+        self.assertEqual(self.savepoints_count, savepoints_count + 1)
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from sheetstorm.management.commands.run_benchmarks import Command as RunBenchmarksCommand
+
+
+class FindRegressionsTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.baseline = {"small": {"home": {"queries": 5, "time": 0.1, "peak_memory": 1024 * 1024}}}
+
+    def _find_regressions(self, measurement, query_tolerance=0, time_tolerance=0.5, memory_tolerance=0.25):
+        return RunBenchmarksCommand().find_regressions(
+            self.baseline, {"small": {"home": measurement}}, query_tolerance, time_tolerance, memory_tolerance
+        )
+
+    def test_find_regressions_should_return_nothing_if_measurements_are_within_tolerance(self):
+        self.assertEqual(self._find_regressions({"queries": 5, "time": 0.14, "peak_memory": 1200 * 1024}), [])
+
+    def test_find_regressions_should_report_additional_query(self):
+        regressions = self._find_regressions({"queries": 6, "time": 0.1, "peak_memory": 1024 * 1024})
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("queries", regressions[0])
+
+    def test_find_regressions_should_accept_additional_queries_within_query_tolerance(self):
+        self.assertEqual(
+            self._find_regressions({"queries": 6, "time": 0.1, "peak_memory": 1024 * 1024}, query_tolerance=1), []
+        )
+
+    def test_find_regressions_should_report_time_and_memory_exceeding_tolerance(self):
+        regressions = self._find_regressions({"queries": 5, "time": 0.2, "peak_memory": 2048 * 1024})
+
+        self.assertEqual(len(regressions), 2)
+
+    def test_find_regressions_should_ignore_time_difference_below_noise_level(self):
+        self.baseline["small"]["home"]["time"] = 0.001
+
+        self.assertEqual(self._find_regressions({"queries": 5, "time": 0.005, "peak_memory": 1024 * 1024}), [])
+
+    def test_find_regressions_should_skip_endpoints_without_baseline(self):
+        self.assertEqual(
+            RunBenchmarksCommand().find_regressions(
+                self.baseline, {"medium": {"home": {"queries": 50, "time": 1, "peak_memory": 1}}}, 0, 0.5, 0.25
+            ),
+            [],
+        )
+
+
+class RunBenchmarksCommandTests(SimpleTestCase):
+    def test_command_should_fail_without_running_benchmarks_if_baseline_does_not_exist(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, "benchmark_baseline.json")
+
+            with mock.patch.object(RunBenchmarksCommand, "run_benchmarks") as run_benchmarks:
+                with self.assertRaises(CommandError):
+                    call_command("run_benchmarks", "--baseline", baseline_path)
+
+            run_benchmarks.assert_not_called()
+            self.assertFalse(os.path.exists(baseline_path))
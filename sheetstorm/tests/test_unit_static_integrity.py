@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.template import Context
+from django.template import Template
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from sheetstorm.storage import IntegrityManifestStaticFilesStorage
+from sheetstorm.storage import get_file_integrity
+from sheetstorm.templatetags.static_integrity import compute_static_file_integrity
+
+STYLE_PATH = "employees/style.css"
+
+
+def get_source_file_integrity(path: str) -> str:
+    with open(finders.find(path), "rb") as static_file:
+        return get_file_integrity(static_file)
+
+
+def render_integrity(path: str) -> str:
+    return Template("{% load static_integrity %}{% static_integrity path %}").render(Context({"path": path}))
+
+
+class IntegrityManifestStaticFilesStorageTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        self.static_root = static_root.name
+        settings_override = override_settings(
+            STATIC_ROOT=self.static_root, STATICFILES_STORAGE="sheetstorm.storage.IntegrityManifestStaticFilesStorage"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_collectstatic_should_store_integrity_of_collected_files_in_manifest(self):
+        with open(os.path.join(self.static_root, "staticfiles.json")) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.assertEqual(manifest["integrity"][STYLE_PATH], get_source_file_integrity(STYLE_PATH))
+        self.assertNotEqual(manifest["paths"][STYLE_PATH], STYLE_PATH)
+
+    def test_template_tag_should_read_integrity_from_manifest_without_reading_static_file(self):
+        with mock.patch("sheetstorm.storage.get_file_integrity") as get_integrity:
+            rendered_integrity = render_integrity(STYLE_PATH)
+
+        get_integrity.assert_not_called()
+        self.assertEqual(rendered_integrity, get_source_file_integrity(STYLE_PATH))
+        self.assertTrue(rendered_integrity.startswith("sha384-"))
+
+    def test_template_tag_should_fail_for_file_missing_in_manifest(self):
+        with self.assertRaises(ValueError):
+            render_integrity("employees/not-existing.css")
+
+    def test_integrity_should_be_loaded_with_manifest(self):
+        storage = IntegrityManifestStaticFilesStorage()
+
+        self.assertEqual(storage.integrity[STYLE_PATH], get_source_file_integrity(STYLE_PATH))
+
+
+class StaticIntegrityWithoutManifestTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        compute_static_file_integrity.cache_clear()
+        self.addCleanup(compute_static_file_integrity.cache_clear)
+
+    def test_integrity_should_be_computed_from_static_file_once(self):
+        with mock.patch(
+            "sheetstorm.templatetags.static_integrity.finders.find", wraps=finders.find
+        ) as find_static_file:
+            render_integrity(STYLE_PATH)
+            rendered_integrity = render_integrity(STYLE_PATH)
+
+        find_static_file.assert_called_once_with(STYLE_PATH)
+        self.assertEqual(rendered_integrity, get_source_file_integrity(STYLE_PATH))
+
+    @override_settings(DEBUG=True)
+    def test_integrity_should_not_be_cached_in_debug_mode(self):
+        with mock.patch(
+            "sheetstorm.templatetags.static_integrity.finders.find", wraps=finders.find
+        ) as find_static_file:
+            render_integrity(STYLE_PATH)
+            render_integrity(STYLE_PATH)
+
+        self.assertEqual(find_static_file.call_count, 2)
+
+    def test_missing_static_file_should_raise_error(self):
+        with self.assertRaises(ValueError):
+            render_integrity("employees/not-existing.css")
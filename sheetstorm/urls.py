@@ -19,6 +19,7 @@ from . import views
 urlpatterns = [
     url(r"^$", views.Index.as_view(), name="home"),
     url(r"^admin/", admin.site.urls),
+    url(r"^metrics/$", views.MetricsView.as_view(), name="metrics"),
     url(r"^employees/", include("employees.urls")),
     url(r"^managers/", include("managers.urls")),
     url(r"^users/", include("users.urls")),
@@ -1,8 +1,30 @@
+from typing import Any
+
 from django.contrib.auth.decorators import login_required
+from django.http import HttpRequest
+from django.http import HttpResponse
 from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.generic import TemplateView
 
+from sheetstorm.metrics import registry
+from users.models import CustomUser
+from utils.decorators import check_permissions
+
 
 @method_decorator(login_required, name="dispatch")
 class Index(TemplateView):
     template_name = "home.html"
+
+
+@method_decorator(login_required, name="dispatch")
+@method_decorator(check_permissions(allowed_user_types=[CustomUser.UserType.ADMIN.name]), name="dispatch")
+class MetricsView(View):
+    """
+    Exposes metrics of all processes in Prometheus text exposition format.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return HttpResponse(registry.render(), content_type=self.content_type)
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from enum import Enum
 
 from django.utils.translation import ugettext_lazy as _
@@ -20,3 +21,23 @@ class ErrorCode(Enum):
     CREATE_USER_EMAIL_DOMAIN = "header.user_email.domain"
     CREATE_USER_EMAIL_SIGN_MISSING = "header.user_email_sign.missing"
     CREATE_USER_PASSWORD_MISSING = "header.user_password.missing"
+
+
+class MissingReportsReminderConstants(Enum):
+    SUBJECT_TEMPLATE_NAME = "emails/missing_reports_reminder_subject.txt"
+    EMAIL_TEMPLATE_NAME = "emails/missing_reports_reminder_email.html"
+    BATCH_SIZE = 100
+    MINIMAL_WORKDAYS_WITHOUT_REPORT = 1
+
+
+class OutgoingEmailConstants(Enum):
+    STATUS_MAX_LENGTH = 16
+    FROM_EMAIL_MAX_LENGTH = 255
+    MAX_ATTEMPTS = 5
+    # Delay before the first retry, doubled with every next failed attempt.
+    RETRY_BASE_DELAY = timedelta(minutes=1)
+    SENT_EMAILS_LIFETIME = timedelta(days=7)
+    BATCH_SIZE = 50
+    # Claimed emails are not sent by other workers for this time, so it has to exceed time of sending single batch.
+    SENDING_TIMEOUT = timedelta(minutes=10)
+    WORKER_POLL_INTERVAL_SECONDS = 5
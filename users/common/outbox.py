@@ -0,0 +1,134 @@
+import logging
+from typing import List
+
+from django.core.mail import EmailMessage
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from sheetstorm.metrics import registry
+from users.common.constants import OutgoingEmailConstants
+from users.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+EMAILS_SENT = registry.counter("sheetstorm_emails_sent_total", "Number of emails sent from the outbox")
+EMAIL_FAILED_ATTEMPTS = registry.counter(
+    "sheetstorm_email_failed_attempts_total", "Number of failed attempts to send emails from the outbox"
+)
+
+
+def count_pending_emails() -> int:
+    return OutgoingEmail.objects.filter(status=OutgoingEmail.Status.PENDING.name).count()
+
+
+registry.gauge("sheetstorm_emails_pending", "Number of emails waiting in the outbox", count_pending_emails)
+
+
+def enqueue_email(message: EmailMessage) -> OutgoingEmail:
+    """
+    Stores given message in the outbox instead of sending it. Only `To` recipients and HTML alternative are kept.
+    Message is stored in the current transaction, so it is never sent if the transaction is rolled back.
+    """
+    html_bodies = [content for (content, mimetype) in getattr(message, "alternatives", []) if mimetype == "text/html"]
+    email = OutgoingEmail.objects.create(
+        subject=message.subject,
+        body=message.body,
+        html_body=html_bodies[0] if html_bodies else "",
+        from_email=message.from_email,
+        recipients="\n".join(message.to),
+    )
+    logger.debug(f"Email {email.pk} has been enqueued")
+    return email
+
+
+def build_email_message(email: OutgoingEmail) -> EmailMessage:
+    message = EmailMultiAlternatives(email.subject, email.body, email.from_email, email.recipients.splitlines())
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def register_sent_email(email: OutgoingEmail) -> None:
+    email.status = OutgoingEmail.Status.SENT.name
+    email.attempts += 1
+    email.sent_at = timezone.now()
+    email.error = ""
+    email.save(update_fields=["status", "attempts", "sent_at", "error"])
+    EMAILS_SENT.inc()
+
+
+def register_failed_attempt(email: OutgoingEmail, exception: Exception) -> None:
+    """
+    Schedules next attempt to send given email with exponential backoff or marks it as failed
+    when the maximal number of attempts is reached.
+    """
+    email.attempts += 1
+    email.error = str(exception)
+    if email.attempts >= OutgoingEmailConstants.MAX_ATTEMPTS.value:
+        email.status = OutgoingEmail.Status.FAILED.name
+        logger.error(f"Email {email.pk} could not be sent in {email.attempts} attempts: {exception}")
+    else:
+        email.next_attempt_at = timezone.now() + OutgoingEmailConstants.RETRY_BASE_DELAY.value * 2 ** (
+            email.attempts - 1
+        )
+        logger.warning(f"Email {email.pk} could not be sent, next attempt at {email.next_attempt_at}: {exception}")
+    email.save(update_fields=["status", "attempts", "error", "next_attempt_at"])
+    EMAIL_FAILED_ATTEMPTS.inc()
+
+
+def claim_ready_emails(batch_size: int) -> List[OutgoingEmail]:
+    """
+    Returns up to `batch_size` emails which are ready to be sent and postpones their next attempt by sending timeout,
+    so they are not sent by other workers. Emails not sent by stopped worker are sent again after the timeout.
+    Emails locked by other workers are skipped.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .ready_to_send()
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            next_attempt_at=timezone.now() + OutgoingEmailConstants.SENDING_TIMEOUT.value
+        )
+    return emails
+
+
+def send_ready_emails(batch_size: int) -> int:
+    """
+    Sends up to `batch_size` emails which are ready to be sent through single mail connection.
+    Status of each email is saved right after it is sent, so if the worker fails in the middle of a batch,
+    only the email being sent at that moment can be sent again. Returns number of processed emails.
+    """
+    emails = claim_ready_emails(batch_size)
+    if not emails:
+        return 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exception:  # pylint: disable=broad-except
+        logger.exception("Connection to the mail server could not be opened")
+        for email in emails:
+            register_failed_attempt(email, exception)
+        return len(emails)
+
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([build_email_message(email)])
+            except Exception as exception:  # pylint: disable=broad-except
+                register_failed_attempt(email, exception)
+            else:
+                register_sent_email(email)
+    finally:
+        connection.close()
+    logger.info(f"{len(emails)} emails from the outbox have been processed")
+    return len(emails)
+
+
+def delete_expired_emails() -> int:
+    deleted_emails_number, _ = OutgoingEmail.objects.expired().delete()
+    return deleted_emails_number
@@ -40,6 +40,7 @@ class CustomUserModelText:
     )
     DATE_JOINED = _("date joined")
     UPDATED_AT = _("updated at")
+    LAST_REPORT_DATE = _("last report date")
 
 
 class ValidationErrorText:
@@ -81,3 +82,9 @@ class AccountConfirmationText(NotCallableMixin, Enum):
 
 class UserNotificationsText(NotCallableMixin, Enum):
     NO_MORE_NOTIFICATIONS = _("No new notifications about employees in your projects.")
+
+
+class OutgoingEmailStatusText:
+    PENDING = _("Pending")
+    SENT = _("Sent")
+    FAILED = _("Failed")
@@ -2,20 +2,61 @@ import datetime
 import logging
 import random
 import string
-from typing import Optional
+from bisect import bisect_left
+from bisect import bisect_right
+from typing import Dict
+from typing import Iterable
+from typing import TypeVar
+
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+Key = TypeVar("Key")
+
 
 def generate_random_string_from_letters_and_digits(length):
     return "".join(random.choices(string.ascii_letters + string.digits, k=length))
 
 
-def count_workdays(start_date: datetime.date, days_number: int) -> Optional[int]:
-    return sum(
-        [
-            True
-            for days_delta in range(1, days_number)
-            if (start_date + datetime.timedelta(days=days_delta)).isoweekday() < 6
-        ]
-    )
+class WorkdaysCalendar:
+    """
+    Counts workdays between dates in constant time with respect to the length of the period. Weekdays are counted
+    with closed-form arithmetic on date ordinals and holidays are looked up with bisection in sorted table.
+    """
+
+    WORKDAYS_IN_WEEK = 5
+    DAYS_IN_WEEK = 7
+
+    def __init__(self, holidays: Iterable[datetime.date] = ()) -> None:
+        # Holidays falling on weekend are not workdays anyway, so they are left out to not be subtracted twice.
+        self.holidays = sorted({holiday for holiday in holidays if holiday.isoweekday() < 6})
+
+    @classmethod
+    def from_settings(cls) -> "WorkdaysCalendar":
+        return cls(datetime.date.fromisoformat(holiday) for holiday in settings.HOLIDAYS)
+
+    @classmethod
+    def _count_weekdays_before(cls, ordinal: int) -> int:
+        # Day with ordinal 1 (January 1st of year 1) is Monday, so every full week starts with five weekdays.
+        (full_weeks, remaining_days) = divmod(ordinal - 1, cls.DAYS_IN_WEEK)
+        return full_weeks * cls.WORKDAYS_IN_WEEK + min(remaining_days, cls.WORKDAYS_IN_WEEK)
+
+    def count_workdays_between(self, start_date: datetime.date, end_date: datetime.date) -> int:
+        """
+        Returns number of workdays after `start_date` and before `end_date`, both dates excluded.
+        """
+        if end_date.toordinal() - start_date.toordinal() < 2:
+            return 0
+        weekdays = self._count_weekdays_before(end_date.toordinal()) - self._count_weekdays_before(
+            start_date.toordinal() + 1
+        )
+        holidays = bisect_left(self.holidays, end_date) - bisect_right(self.holidays, start_date)
+        return weekdays - holidays
+
+    def count_workdays_to_date(self, start_dates: Dict[Key, datetime.date], end_date: datetime.date) -> Dict[Key, int]:
+        """
+        Batch version of `count_workdays_between`, which returns number of workdays between each of `start_dates`
+        and common `end_date` under the same keys.
+        """
+        return {key: self.count_workdays_between(start_date, end_date) for (key, start_date) in start_dates.items()}
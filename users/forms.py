@@ -1,15 +1,20 @@
 from typing import Any
 from typing import Dict
+from typing import Optional
 
 from captcha.fields import CaptchaField
 from captcha.fields import CaptchaTextInput
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
 from django.contrib.auth.forms import UserChangeForm
 from django.contrib.auth.forms import UserCreationForm
+from django.core.mail import EmailMultiAlternatives
 from django.forms import ModelForm
+from django.template import loader
 
 from users.common.constants import CaptchaConstants
 from users.common.constants import UserConstants
+from users.common.outbox import enqueue_email
 from users.models import CustomUser
 
 
@@ -73,3 +78,24 @@ class CustomUserSignUpForm(UserCreationForm):
     class Meta:
         model = CustomUser
         fields = ("email", "password1", "password2", "captcha")
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    def send_mail(
+        self,
+        subject_template_name: str,
+        email_template_name: str,
+        context: Dict[str, Any],
+        from_email: Optional[str],
+        to_email: str,
+        html_email_template_name: Optional[str] = None,
+    ) -> None:
+        """
+        Enqueues password reset email in the outbox instead of sending it during the request.
+        """
+        subject = "".join(loader.render_to_string(subject_template_name, context).splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        email_message = EmailMultiAlternatives(subject, body, from_email, [to_email])
+        if html_email_template_name is not None:
+            email_message.attach_alternative(loader.render_to_string(html_email_template_name, context), "text/html")
+        enqueue_email(email_message)
@@ -0,0 +1,18 @@
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Recompute date of the last report of all users from their reports."
+
+    @transaction.atomic
+    def handle(self, *args: Any, **options: Any) -> None:
+        updated_users_number = CustomUser.objects.update_last_report_date()
+        logger.info(f"Last report dates have been backfilled, {updated_users_number} users updated")
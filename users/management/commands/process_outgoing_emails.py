@@ -0,0 +1,51 @@
+import logging
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from users.common.constants import OutgoingEmailConstants
+from users.common.outbox import delete_expired_emails
+from users.common.outbox import send_ready_emails
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Send emails waiting in the outbox, retrying failed ones, and remove old sent emails."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send all emails which are ready to be sent and exit instead of waiting for new ones",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=OutgoingEmailConstants.WORKER_POLL_INTERVAL_SECONDS.value,
+            help="Number of seconds to wait before checking for new emails when the outbox is empty",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=OutgoingEmailConstants.BATCH_SIZE.value,
+            help="Number of emails sent through single mail connection",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size has to be positive")
+
+        logger.info("Email worker has been started")
+        while True:
+            deleted_emails_number = delete_expired_emails()
+            if deleted_emails_number > 0:
+                logger.info(f"Deleted {deleted_emails_number} old sent emails")
+
+            if send_ready_emails(options["batch_size"]) > 0:
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
@@ -0,0 +1,109 @@
+import datetime
+import logging
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+
+from django.contrib.sites.models import Site
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.template.loader import get_template
+
+from common.utils import send_emails_in_batches
+from users.common.constants import MissingReportsReminderConstants
+from users.common.utils import WorkdaysCalendar
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Send reminders to all users listed in notifications about missing reports of their managers. "
+        "Emails are sent in batches through single mail connection."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=MissingReportsReminderConstants.BATCH_SIZE.value,
+            help="Number of emails passed to mail backend at once",
+        )
+        parser.add_argument(
+            "--min-workdays",
+            type=int,
+            default=MissingReportsReminderConstants.MINIMAL_WORKDAYS_WITHOUT_REPORT.value,
+            help="Minimal number of workdays without report for which reminder is sent",
+        )
+        parser.add_argument(
+            "--domain", help="Domain used in links to the application. Defaults to domain of the current site"
+        )
+        parser.add_argument("--protocol", choices=["http", "https"], default="https", help="Protocol used in links")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Render reminders and list their recipients without sending them"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size has to be positive")
+
+        start = time.perf_counter()
+        workdays_without_report = self.get_workdays_without_report(options["min_workdays"])
+        messages = self.render_messages(
+            workdays_without_report, options["domain"] or Site.objects.get_current().domain, options["protocol"]
+        )
+        rendered = time.perf_counter()
+
+        if options["dry_run"]:
+            for message in messages:
+                self.stdout.write(f"{message.to[0]}: {message.subject}")
+            sent_messages_number = 0
+        else:
+            sent_messages_number = send_emails_in_batches(messages, options["batch_size"])
+        sent = time.perf_counter()
+
+        sending_time = sent - rendered
+        throughput = f" ({sent_messages_number / sending_time:.1f} emails/s)" if sending_time > 0 else ""
+        logger.info(
+            f"Missing reports reminders: {len(messages)} rendered in {rendered - start:.3f} s, "
+            f"{sent_messages_number} sent in {sending_time:.3f} s{throughput}"
+        )
+
+    @staticmethod
+    def get_workdays_without_report(min_workdays: int) -> Dict[CustomUser, int]:
+        today = datetime.date.today()
+        users = CustomUser.objects.with_notifications_enabled().only(
+            "email", "first_name", "last_name", "last_report_date"
+        )
+        workdays_without_report = WorkdaysCalendar.from_settings().count_workdays_to_date(
+            {user: user.last_report_date or today for user in users}, today
+        )
+        return {user: workdays for (user, workdays) in workdays_without_report.items() if workdays >= min_workdays}
+
+    @staticmethod
+    def render_messages(
+        workdays_without_report: Dict[CustomUser, int], domain: str, protocol: str
+    ) -> List[EmailMessage]:
+        # Templates are loaded once and only rendered for each user.
+        subject_template = get_template(MissingReportsReminderConstants.SUBJECT_TEMPLATE_NAME.value)
+        email_template = get_template(MissingReportsReminderConstants.EMAIL_TEMPLATE_NAME.value)
+        subject = "".join(subject_template.render().splitlines())
+        return [
+            EmailMessage(
+                subject,
+                email_template.render(
+                    {
+                        "user_name": user.first_name.strip() or user.email,
+                        "days_without_report": workdays,
+                        "last_report_date": user.last_report_date,
+                        "domain": domain,
+                        "protocol": protocol,
+                    }
+                ),
+                to=[user.email],
+            )
+            for (user, workdays) in workdays_without_report.items()
+        ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.0.7 on 2026-10-17 08:40
+
+from django.db import migrations, models
+
+
+def backfill_last_report_date(apps, schema_editor):
+    CustomUser = apps.get_model('users', 'CustomUser')
+    CustomUser.objects.update(
+        last_report_date=models.Subquery(
+            CustomUser.objects.filter(pk=models.OuterRef('pk'))
+            .values('pk')
+            .annotate(max_report_date=models.Max('report__date'))
+            .values('max_report_date')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_auto_20190822_1010'),
+        ('employees', '0006_report_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='last_report_date',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True, verbose_name='last report date'),
+        ),
+        migrations.RunPython(backfill_last_report_date, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,10 @@
 import logging
+from datetime import date
 from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Optional
 
 from django.contrib.auth.models import AbstractBaseUser
 from django.contrib.auth.models import BaseUserManager
@@ -7,18 +12,23 @@ from django.contrib.auth.models import PermissionsMixin
 from django.core.mail import send_mail
 from django.db import models
 from django.db.models import Max
+from django.db.models import OuterRef
 from django.db.models import Prefetch
 from django.db.models import Q
 from django.db.models import QuerySet
+from django.db.models import Subquery
 from django.db.models import Value
 from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
+from users.common.constants import OutgoingEmailConstants
 from users.common.constants import UserConstants
 from users.common.fields import ChoiceEnum
 from users.common.strings import CustomUserModelText
 from users.common.strings import CustomUserUserTypeText
+from users.common.strings import OutgoingEmailStatusText
 from users.common.strings import ValidationErrorText
 from users.validators import UserEmailValidation
 from users.validators import UserNameValidatior
@@ -33,6 +43,44 @@ class CustomUserQuerySet(models.QuerySet):
     def active(self) -> QuerySet:
         return self.filter(is_active=True)
 
+    def with_notifications_enabled(self, manager_id: Optional[int] = None) -> QuerySet:
+        """
+        Returns active users which are members of ongoing projects with enabled notifications about missing reports,
+        managed by given manager or by anyone if manager is not given.
+        """
+        manager_filter = (
+            {"projects__managers__pk": manager_id} if manager_id is not None else {"projects__managers__isnull": False}
+        )
+        return self.filter(
+            is_active=True,
+            projects__suspended=False,
+            projects__stop_date__isnull=True,
+            projects__is_notification_enabled=True,
+            **manager_filter,
+        ).distinct()
+
+    def update_last_report_date(self) -> int:
+        """
+        Recomputes date of the last report of selected users from their reports. Returns number of updated users.
+        """
+        return self.update(
+            last_report_date=Subquery(
+                CustomUser.objects.filter(pk=OuterRef("pk"))
+                .values("pk")
+                .annotate(max_report_date=Max("report__date"))
+                .values("max_report_date")
+            )
+        )
+
+    def advance_last_report_date(self, report_date: date) -> int:
+        """
+        Sets date of the last report of selected users to given date, unless they already have a later report.
+        Returns number of updated users.
+        """
+        return self.filter(Q(last_report_date__isnull=True) | Q(last_report_date__lt=report_date)).update(
+            last_report_date=report_date
+        )
+
 
 class CustomUserManager(BaseUserManager):
     def _create_user(
@@ -103,6 +151,12 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     )
     date_joined = models.DateTimeField(CustomUserModelText.DATE_JOINED, auto_now_add=True)
     updated_at = models.DateTimeField(CustomUserModelText.UPDATED_AT, auto_now=True)
+    # Denormalized date of the latest report, kept up to date by `Report` signals and recomputed after user is saved,
+    # so a value loaded before a report was changed is not kept. Changes made with bulk queryset operations bypass
+    # signals, run `backfill_last_report_date` command after them.
+    last_report_date = models.DateField(
+        CustomUserModelText.LAST_REPORT_DATE, null=True, blank=True, editable=False, db_index=True
+    )
     user_type = models.CharField(
         max_length=UserConstants.USER_TYPE_MAX_LENGTH.value, choices=UserType.choices(), default=UserType.EMPLOYEE.name
     )
@@ -112,12 +166,45 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     objects = CustomUserManager.from_queryset(CustomUserQuerySet)()
 
     USERNAME_FIELD = "email"
+    # Fields which changes are handled by post_save signals.
+    TRACKED_FIELDS = ("user_type", "is_active")
 
     class Meta:
         verbose_name = CustomUserModelText.VERBOSE_NAME_USER
         verbose_name_plural = CustomUserModelText.VERBOSE_NAME_PLURAL_USERS
         ordering = ("id",)
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._saved_tracked_field_values = {}  # type: Dict[str, Any]
+        self._remember_tracked_field_values(self.TRACKED_FIELDS)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        self._remember_tracked_field_values(self.TRACKED_FIELDS if update_fields is None else update_fields)
+
+    def refresh_from_db(self, using: Optional[str] = None, fields: Optional[Iterable[str]] = None) -> None:
+        super().refresh_from_db(using, fields)
+        self._remember_tracked_field_values(self.TRACKED_FIELDS if fields is None else fields)
+
+    def _remember_tracked_field_values(self, field_names: Iterable[str]) -> None:
+        for field_name in set(field_names) & set(self.TRACKED_FIELDS):
+            # Deferred fields are not loaded, so it is unknown whether they will be changed.
+            if field_name in self.__dict__:
+                self._saved_tracked_field_values[field_name] = self.__dict__[field_name]
+            else:
+                self._saved_tracked_field_values.pop(field_name, None)
+
+    def has_field_changed(self, field_name: str) -> bool:
+        """
+        Returns whether value of given tracked field differs from the one last loaded from or saved to the database.
+        """
+        assert field_name in self.TRACKED_FIELDS
+        if field_name not in self._saved_tracked_field_values:
+            return True
+        return self._saved_tracked_field_values[field_name] != getattr(self, field_name)
+
     def get_absolute_url(self) -> str:
         """
         Returns the absolute url with user's email.
@@ -156,7 +243,9 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         return self.user_type == CustomUser.UserType.EMPLOYEE.name
 
     def get_reports_created(self) -> QuerySet:
-        return self.report_set.select_related("task_activities").order_by("-date", "project__name", "-creation_date")
+        return self.report_set.select_related("project", "task_activities").order_by(
+            "-date", "project__name", "-creation_date"
+        )
 
     def get_project_ordered_by_last_report_creation_date(self) -> QuerySet:
         return self.projects.annotate(
@@ -166,11 +255,25 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         ).order_by("-last_report_creation_date")
 
 
+def is_tracked_field_changed_by_save(
+    user: CustomUser, field_name: str, created: bool, update_fields: Optional[FrozenSet[str]]
+) -> bool:
+    """
+    Returns whether save, which post_save signal is being handled, has stored new value of given tracked field.
+    Newly created users do not belong to any project yet, so their fields are never treated as changed.
+    """
+    if created or (update_fields is not None and field_name not in update_fields):
+        return False
+    return user.has_field_changed(field_name)
+
+
 @receiver(post_save, sender=CustomUser)
 def update_from_manager_to_employee(sender: "CustomUser", **kwargs: Any) -> None:
     user = kwargs["instance"]
-    logger.debug(f"Update user: {user.pk} from manager to employee")
     assert sender == CustomUser
+    if not is_tracked_field_changed_by_save(user, "user_type", kwargs["created"], kwargs["update_fields"]):
+        return
+    logger.debug(f"Update user: {user.pk} from manager to employee")
     if user.user_type == CustomUser.UserType.EMPLOYEE.name:
         user.manager_projects.clear()
         logger.debug(f"User: {user.pk} has been removed from all projects as a manager")
@@ -179,8 +282,64 @@ def update_from_manager_to_employee(sender: "CustomUser", **kwargs: Any) -> None
 @receiver(post_save, sender=CustomUser)
 def update_remove_inactive_user_from_projects(sender: "CustomUser", **kwargs: Any) -> None:
     user = kwargs["instance"]
-    logger.debug(f"Update user: {user.pk} from active to inactive")
     assert sender == CustomUser
+    if not is_tracked_field_changed_by_save(user, "is_active", kwargs["created"], kwargs["update_fields"]):
+        return
+    logger.debug(f"Update user: {user.pk} from active to inactive")
     if not user.is_active:
         user.projects.clear()
         logger.debug(f"User: {user.pk} has been removed from all projects")
+
+
+@receiver(post_save, sender=CustomUser)
+def recompute_last_report_date_after_save(sender: "CustomUser", **kwargs: Any) -> None:
+    user = kwargs["instance"]
+    assert sender == CustomUser
+    update_fields = kwargs["update_fields"]
+    if kwargs["created"] or (update_fields is not None and "last_report_date" not in update_fields):
+        return
+    CustomUser.objects.filter(pk=user.pk).update_last_report_date()
+    user.refresh_from_db(fields=["last_report_date"])
+
+
+class OutgoingEmailQuerySet(models.QuerySet):
+    def ready_to_send(self) -> QuerySet:
+        return self.filter(status=OutgoingEmail.Status.PENDING.name, next_attempt_at__lte=timezone.now())
+
+    def expired(self) -> QuerySet:
+        return self.filter(
+            status=OutgoingEmail.Status.SENT.name,
+            sent_at__lte=timezone.now() - OutgoingEmailConstants.SENT_EMAILS_LIFETIME.value,
+        )
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email stored in the outbox when being sent from request, so slow mail server doesn't delay the response.
+    Emails are sent by `process_outgoing_emails` command.
+    """
+
+    class Status(ChoiceEnum):
+        PENDING = OutgoingEmailStatusText.PENDING
+        SENT = OutgoingEmailStatusText.SENT
+        FAILED = OutgoingEmailStatusText.FAILED
+
+    objects = OutgoingEmailQuerySet.as_manager()
+
+    subject = models.TextField()
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=OutgoingEmailConstants.FROM_EMAIL_MAX_LENGTH.value)
+    # Newline separated addresses.
+    recipients = models.TextField()
+    status = models.CharField(
+        max_length=OutgoingEmailConstants.STATUS_MAX_LENGTH.value, choices=Status.choices(), default=Status.PENDING.name
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
@@ -0,0 +1,69 @@
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from freezegun import freeze_time
+
+from employees.factories import ReportFactory
+from managers.factories import ProjectFactory
+from users.factories import ManagerUserFactory
+from users.factories import UserFactory
+
+
+class SendMissingReportsRemindersTests(TestCase):
+    def setUp(self):
+        self.manager = ManagerUserFactory()
+        self.project = ProjectFactory()
+        self.project.managers.add(self.manager)
+        self.employees = [UserFactory(first_name=f"Employee{index}") for index in range(3)]
+        self.project.members.add(*self.employees)
+        with freeze_time("2019-07-08"):
+            for employee in self.employees:
+                ReportFactory(author=employee, project=self.project, date="2019-07-08")
+
+    def _call_command(self, *args):
+        with freeze_time("2019-07-15"):
+            call_command("send_missing_reports_reminders", *args, domain="example.com", stdout=StringIO())
+
+    def test_command_should_send_reminder_to_every_user_with_missing_reports(self):
+        self._call_command()
+
+        self.assertEqual(sorted(email.to[0] for email in mail.outbox), sorted(user.email for user in self.employees))
+        self.assertIn("4 working days", mail.outbox[0].body)
+        self.assertIn("https://example.com/", mail.outbox[0].body)
+
+    def test_command_should_send_all_batches_through_single_connection(self):
+        with mock.patch("common.utils.get_connection", wraps=mail.get_connection) as get_connection:
+            self._call_command("--batch-size", "2")
+
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), len(self.employees))
+
+    def test_command_should_not_send_reminders_in_dry_run(self):
+        output = StringIO()
+        with freeze_time("2019-07-15"):
+            call_command("send_missing_reports_reminders", "--dry-run", domain="example.com", stdout=output)
+
+        self.assertEqual(len(mail.outbox), 0)
+        for employee in self.employees:
+            self.assertIn(employee.email, output.getvalue())
+
+    def test_command_should_skip_users_with_less_missing_workdays_than_given_minimum(self):
+        with freeze_time("2019-07-15"):
+            ReportFactory(author=self.employees[0], project=self.project, date="2019-07-12")
+
+        self._call_command("--min-workdays", "2")
+
+        self.assertEqual(
+            sorted(email.to[0] for email in mail.outbox), sorted(user.email for user in self.employees[1:])
+        )
+
+    def test_command_should_not_send_reminders_for_projects_with_disabled_notifications(self):
+        self.project.is_notification_enabled = False
+        self.project.save()
+
+        self._call_command()
+
+        self.assertEqual(len(mail.outbox), 0)
@@ -1,3 +1,4 @@
+from django.contrib.auth.models import update_last_login
 from django.shortcuts import reverse
 from django.test import TestCase
 from django.utils import timezone
@@ -50,3 +51,66 @@ class TestCustomUserSignals(TestCase):
         self.user.refresh_from_db()
         self.assertEqual(self.user.user_type, CustomUser.UserType.EMPLOYEE.name)
         self.assertFalse(self.project in self.user.projects.all())
+
+
+class TestCustomUserTrackedFields(TestCase):
+    def setUp(self):
+        self.user = ManagerUserFactory()
+        self.project = Project.objects.create(name="TEST", start_date=timezone.now())
+        self.project.managers.add(self.user)
+        self.project.members.add(self.user)
+
+    def test_login_should_not_change_project_memberships(self):
+        with self.assertNumQueries(1):
+            update_last_login(None, self.user)
+
+        self.assertIn(self.project, self.user.manager_projects.all())
+        self.assertIn(self.project, self.user.projects.all())
+
+    def test_save_without_changes_of_tracked_fields_should_run_only_update_queries(self):
+        self.user.first_name = "Changed"
+
+        # Denormalized date of the last report is recomputed and reloaded after save.
+        with self.assertNumQueries(3):
+            self.user.save()
+
+    def test_changing_user_type_to_employee_should_remove_user_from_project_managers(self):
+        self.user.user_type = CustomUser.UserType.EMPLOYEE.name
+        self.user.save()
+
+        self.assertFalse(self.user.manager_projects.exists())
+        self.assertIn(self.project, self.user.projects.all())
+
+    def test_deactivating_user_should_remove_user_from_project_members(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertFalse(self.user.projects.exists())
+        self.assertIn(self.project, self.user.manager_projects.all())
+
+    def test_saving_other_fields_should_not_handle_unsaved_change_of_tracked_field(self):
+        self.user.is_active = False
+        self.user.save(update_fields=["first_name"])
+
+        self.assertIn(self.project, self.user.projects.all())
+
+    def test_has_field_changed_should_compare_with_value_loaded_from_database(self):
+        user = CustomUser.objects.get(pk=self.user.pk)
+        self.assertFalse(user.has_field_changed("user_type"))
+
+        user.user_type = CustomUser.UserType.EMPLOYEE.name
+
+        self.assertTrue(user.has_field_changed("user_type"))
+
+    def test_has_field_changed_should_use_values_loaded_by_refresh_from_db(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(user_type=CustomUser.UserType.EMPLOYEE.name)
+        self.user.refresh_from_db()
+
+        self.user.user_type = CustomUser.UserType.MANAGER.name
+
+        self.assertTrue(self.user.has_field_changed("user_type"))
+
+    def test_has_field_changed_should_treat_deferred_field_as_changed(self):
+        user = CustomUser.objects.only("email").get(pk=self.user.pk)
+
+        self.assertTrue(user.has_field_changed("is_active"))
@@ -0,0 +1,148 @@
+import datetime
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+
+from common.utils import send_email
+from sheetstorm.metrics import registry
+from users.common.constants import OutgoingEmailConstants
+from users.common.outbox import enqueue_email
+from users.common.outbox import register_sent_email
+from users.common.outbox import send_ready_emails
+from users.factories import UserFactory
+from users.models import OutgoingEmail
+
+
+class EnqueueEmailTests(TestCase):
+    def test_send_email_should_enqueue_email_instead_of_sending_it(self):
+        send_email("Subject", "Message", "user@example.com")
+
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual((email.subject, email.body, email.recipients), ("Subject", "Message", "user@example.com"))
+        self.assertEqual(email.status, OutgoingEmail.Status.PENDING.name)
+
+    def test_enqueue_email_should_keep_html_alternative(self):
+        message = EmailMultiAlternatives("Subject", "Message", to=["first@example.com", "second@example.com"])
+        message.attach_alternative("<p>Message</p>", "text/html")
+
+        email = enqueue_email(message)
+
+        self.assertEqual(email.html_body, "<p>Message</p>")
+        self.assertEqual(email.recipients.splitlines(), ["first@example.com", "second@example.com"])
+
+    def test_password_reset_should_enqueue_email(self):
+        user = UserFactory(is_active=True)
+
+        response = self.client.post(reverse("password_reset"), {"email": user.email})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.get().recipients, user.email)
+
+
+class SendReadyEmailsTests(TestCase):
+    def setUp(self):
+        self.email = enqueue_email(EmailMessage("Subject", "Message", to=["user@example.com"]))
+
+    def test_send_ready_emails_should_send_emails_through_single_connection(self):
+        enqueue_email(EmailMessage("Other subject", "Message", to=["other@example.com"]))
+
+        with mock.patch("users.common.outbox.get_connection", wraps=mail.get_connection) as get_connection:
+            processed_emails_number = send_ready_emails(batch_size=10)
+
+        self.assertEqual(processed_emails_number, 2)
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ["Other subject", "Subject"])
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.Status.SENT.name).exists())
+
+    def test_send_ready_emails_should_count_sent_emails_and_failed_attempts(self):
+        enqueue_email(EmailMessage("Other subject", "Message", to=["other@example.com"]))
+        samples_at_start = registry.collect()
+
+        send_ready_emails(batch_size=1)
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError):
+            send_ready_emails(batch_size=1)
+
+        samples = registry.collect()
+        for metric in ["sheetstorm_emails_sent_total", "sheetstorm_email_failed_attempts_total"]:
+            self.assertEqual(samples[(metric, "", ())] - samples_at_start.get((metric, "", ()), 0), 1)
+
+    def test_send_ready_emails_should_not_send_more_emails_than_batch_size(self):
+        enqueue_email(EmailMessage("Other subject", "Message", to=["other@example.com"]))
+
+        self.assertEqual(send_ready_emails(batch_size=1), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_emails_sent_before_worker_failure_should_not_be_sent_again(self):
+        other_email = enqueue_email(EmailMessage("Other subject", "Message", to=["other@example.com"]))
+
+        def fail_on_second_email(email):
+            if email == other_email:
+                raise DatabaseError
+            register_sent_email(email)
+
+        with mock.patch("users.common.outbox.register_sent_email", side_effect=fail_on_second_email):
+            with self.assertRaises(DatabaseError):
+                send_ready_emails(batch_size=10)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutgoingEmail.Status.SENT.name)
+        self.assertEqual(send_ready_emails(batch_size=10), 0)
+        with freeze_time(timezone.now() + OutgoingEmailConstants.SENDING_TIMEOUT.value):
+            self.assertEqual(send_ready_emails(batch_size=10), 1)
+        self.assertEqual([message.subject for message in mail.outbox], ["Subject", "Other subject", "Other subject"])
+
+    def test_failed_email_should_be_retried_with_exponential_backoff(self):
+        start = timezone.now()
+        with freeze_time(start):
+            with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError):
+                send_ready_emails(batch_size=10)
+                self.email.refresh_from_db()
+                self.assertEqual(self.email.next_attempt_at, timezone.now() + datetime.timedelta(minutes=1))
+                self.assertEqual(send_ready_emails(batch_size=10), 0)
+
+        with freeze_time(start + datetime.timedelta(minutes=1)):
+            with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError):
+                send_ready_emails(batch_size=10)
+                self.email.refresh_from_db()
+                self.assertEqual(self.email.next_attempt_at, timezone.now() + datetime.timedelta(minutes=2))
+
+        with freeze_time(start + datetime.timedelta(minutes=3)):
+            send_ready_emails(batch_size=10)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutgoingEmail.Status.SENT.name)
+        self.assertEqual(self.email.attempts, 3)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_email_should_be_marked_as_failed_after_maximal_number_of_attempts(self):
+        OutgoingEmail.objects.update(attempts=OutgoingEmailConstants.MAX_ATTEMPTS.value - 1)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open", side_effect=OSError("Connection refused")
+        ):
+            send_ready_emails(batch_size=10)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutgoingEmail.Status.FAILED.name)
+        self.assertEqual(self.email.error, "Connection refused")
+
+    def test_process_outgoing_emails_command_should_send_all_ready_emails_and_delete_old_sent_ones(self):
+        with freeze_time(timezone.now() - OutgoingEmailConstants.SENT_EMAILS_LIFETIME.value):
+            old_email = enqueue_email(EmailMessage("Old subject", "Message", to=["user@example.com"]))
+            send_ready_emails(batch_size=10)
+        enqueue_email(EmailMessage("Other subject", "Message", to=["other@example.com"]))
+
+        call_command("process_outgoing_emails", "--once", "--batch-size", "1")
+
+        self.assertFalse(OutgoingEmail.objects.filter(pk=old_email.pk).exists())
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.Status.SENT.name).count(), 2)
@@ -0,0 +1,62 @@
+import datetime
+
+from django.test import SimpleTestCase
+from django.test import override_settings
+from parameterized import parameterized
+
+from users.common.utils import WorkdaysCalendar
+
+
+def count_workdays_day_by_day(start_date, end_date, holidays=()):
+    return sum(
+        1
+        for days_delta in range(1, (end_date - start_date).days)
+        if (start_date + datetime.timedelta(days=days_delta)).isoweekday() < 6
+        and start_date + datetime.timedelta(days=days_delta) not in holidays
+    )
+
+
+class TestWorkdaysCalendar(SimpleTestCase):
+    def test_count_workdays_between_should_match_counting_day_by_day(self):
+        holidays = {datetime.date(2019, 1, 1), datetime.date(2019, 5, 1), datetime.date(2019, 5, 3)}
+        calendar = WorkdaysCalendar(holidays)
+        first_date = datetime.date(2018, 12, 24)
+        for start_offset in range(14):
+            start_date = first_date + datetime.timedelta(days=start_offset)
+            for period in range(0, 200, 3):
+                end_date = start_date + datetime.timedelta(days=period)
+                self.assertEqual(
+                    calendar.count_workdays_between(start_date, end_date),
+                    count_workdays_day_by_day(start_date, end_date, holidays),
+                )
+
+    @parameterized.expand(
+        [
+            (datetime.date(2019, 7, 8), datetime.date(2019, 7, 8), 0),
+            (datetime.date(2019, 7, 8), datetime.date(2019, 7, 9), 0),
+            (datetime.date(2019, 7, 8), datetime.date(2019, 7, 5), 0),
+            (datetime.date(2019, 7, 5), datetime.date(2019, 7, 8), 0),
+            (datetime.date(2019, 7, 8), datetime.date(2019, 7, 15), 4),
+        ]
+    )
+    def test_count_workdays_between_should_exclude_both_dates(self, start_date, end_date, expected_workdays):
+        self.assertEqual(WorkdaysCalendar().count_workdays_between(start_date, end_date), expected_workdays)
+
+    def test_holidays_on_weekend_should_not_be_subtracted(self):
+        calendar = WorkdaysCalendar([datetime.date(2019, 7, 13), datetime.date(2019, 7, 10)])
+        self.assertEqual(calendar.count_workdays_between(datetime.date(2019, 7, 8), datetime.date(2019, 7, 15)), 3)
+
+    def test_count_workdays_to_date_should_return_workdays_under_the_same_keys(self):
+        calendar = WorkdaysCalendar([datetime.date(2019, 7, 10)])
+        self.assertEqual(
+            calendar.count_workdays_to_date(
+                {"first": datetime.date(2019, 7, 8), "second": datetime.date(2019, 7, 11)}, datetime.date(2019, 7, 15)
+            ),
+            {"first": 3, "second": 1},
+        )
+
+    @override_settings(HOLIDAYS=["2019-07-10", "2019-07-11"])
+    def test_from_settings_should_parse_holidays(self):
+        self.assertEqual(
+            WorkdaysCalendar.from_settings().holidays, [datetime.date(2019, 7, 10), datetime.date(2019, 7, 11)]
+        )
@@ -336,6 +336,16 @@ class NotificationsTests(TestCase):
             response = self.client.get(self.url)
         self._check_response(response, 200, [self.employee.email, missing_reports])
 
+    @override_settings(HOLIDAYS=["2019-07-10", "2019-07-12"])
+    def test_manager_should_get_notification_about_missing_reports_without_holidays(self):
+        with freeze_time("2019-07-08"):
+            ReportFactory(author=self.employee, project=self.project, date="2019-07-08")
+
+        self.client.force_login(self.manager)
+        with freeze_time("2019-07-15"):
+            response = self.client.get(self.url)
+        self._check_response(response, 200, [self.employee.email, "<td>2</td>"])
+
     def test_manager_should_only_get_notifications_about_employees_from_his_projects(self):
         with freeze_time("2019-07-08"):
             ReportFactory(date="2019-07-08")
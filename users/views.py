@@ -16,9 +16,7 @@ from django.contrib.auth.views import PasswordResetDoneView
 from django.contrib.auth.views import PasswordResetView
 from django.contrib.sites.shortcuts import get_current_site
 from django.db.models import F
-from django.db.models import Max
 from django.db.models import QuerySet
-from django.db.models.functions import Coalesce
 from django.http import HttpRequest
 from django.http import HttpResponse
 from django.http.response import HttpResponseRedirectBase
@@ -40,10 +38,11 @@ from users.common.strings import AccountConfirmationText
 from users.common.strings import ConfirmationMessages
 from users.common.strings import SuccessInfoAfterRegistrationText
 from users.common.strings import UserNotificationsText
-from users.common.utils import count_workdays
+from users.common.utils import WorkdaysCalendar
 from users.forms import AdminUserChangeForm
 from users.forms import CustomUserCreationForm
 from users.forms import CustomUserSignUpForm
+from users.forms import OutboxPasswordResetForm
 from users.forms import SimpleUserChangeForm
 from users.models import CustomUser
 from users.tokens import account_activation_token
@@ -187,6 +186,7 @@ class CustomPasswordChangeView(PasswordChangeView):
 
 class CustomPasswordResetView(PasswordResetView):
 
+    form_class = OutboxPasswordResetForm
     email_template_name = "emails/password_reset_email.html"
     subject_template_name = "emails/password_reset_subject.txt"
     template_name = "accounts/password_reset_form.html"
@@ -245,27 +245,19 @@ class NotificationUserListView(ListView):
         return (
             super()
             .get_queryset()
-            .filter(
-                is_active=True,
-                projects__suspended=False,
-                projects__stop_date__isnull=True,
-                projects__managers__pk=self.request.user.pk,
-                projects__is_notification_enabled=True,
-            )
-            .annotate(last_report_date=Coalesce(Max("report__date"), datetime.date.today()))
-            .annotate(days_without_report=datetime.date.today() - F("last_report_date"))
-            .order_by("-last_report_date")
-            .distinct()
+            .with_notifications_enabled(manager_id=self.request.user.pk)
+            .only("email", "last_report_date")
+            .order_by(F("last_report_date").desc(nulls_first=True))
         )
 
     def get_context_data(self, *, _object_list: Any = None, **kwargs: Any) -> dict:
         context_data = super().get_context_data(**kwargs)
-        users_days_without_report_dict = {}
-        for user in context_data["object_list"]:
-            no_report_days = count_workdays(user.last_report_date, user.days_without_report)
-            if no_report_days > 0:
-                users_days_without_report_dict[user.email] = no_report_days
-
-        context_data["users_days_without_report"] = users_days_without_report_dict
+        today = datetime.date.today()
+        workdays_without_report = WorkdaysCalendar.from_settings().count_workdays_to_date(
+            {user.email: user.last_report_date or today for user in context_data["object_list"]}, today
+        )
+        context_data["users_days_without_report"] = {
+            email: no_report_days for (email, no_report_days) in workdays_without_report.items() if no_report_days > 0
+        }
         context_data["UI_text"] = UserNotificationsText
         return context_data
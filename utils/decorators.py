@@ -5,8 +5,12 @@ from typing import Optional
 
 from django.contrib.auth.views import redirect_to_login
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db import transaction
 from django.shortcuts import reverse
 
+from sheetstorm.db_routers import SAFE_METHODS
 from users.models import CustomUser
 
 
@@ -32,3 +36,20 @@ def check_permissions(allowed_user_types: List[str], redirect_path: Optional[str
         return _wrapped_view
 
     return decorator
+
+
+def non_atomic_safe_requests(view_func: Callable) -> Callable:
+    """
+    Decorator that excludes view from `ATOMIC_REQUESTS` for safe methods, so requests which only read data
+    do not open transaction on primary database and their reads can be routed to read replica.
+    Requests with other methods are still executed in transaction.
+    """
+
+    @wraps(view_func)
+    def _wrapped_view(request: WSGIRequest, *args: dict, **kwargs: dict) -> Callable:
+        if request.method in SAFE_METHODS or not connections[DEFAULT_DB_ALIAS].settings_dict["ATOMIC_REQUESTS"]:
+            return view_func(request, *args, **kwargs)
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            return view_func(request, *args, **kwargs)
+
+    return transaction.non_atomic_requests(using=DEFAULT_DB_ALIAS)(_wrapped_view)
@@ -45,14 +45,19 @@ class UserIsAuthorOfCurrentReportMixin:
 
 class ProjectsWorkPercentageMixin(ContextMixin):
     def get_context_data(self, **kwargs: Any) -> dict:
-        from users.models import CustomUser  # pylint: disable=import-outside-toplevel
-
         context_data = super().get_context_data(**kwargs)
+        context_data["projects_work_percentage"] = self._get_projects_work_hours_and_percentage(
+            self.get_work_hours_queryset()
+        )
+        return context_data
 
-        report_set = self.object.report_set.all() if self.model is CustomUser else self.get_queryset()
+    def get_work_hours_queryset(self) -> QuerySet:
+        """
+        Returns queryset of reports, or of their daily work hours sums, which summary is computed from.
+        """
+        from users.models import CustomUser  # pylint: disable=import-outside-toplevel
 
-        context_data["projects_work_percentage"] = self._get_projects_work_hours_and_percentage(report_set)
-        return context_data
+        return self.object.report_set.all() if self.model is CustomUser else self.get_queryset()
 
     def _get_projects_work_hours_and_percentage(self, report_set: QuerySet) -> Dict[str, Any]:
         """